@@ -0,0 +1,45 @@
+""" Benchmark ParameterSpace on 10+ dimensional input spaces.
+
+Run from the repository root:
+    python -m benchmarks.bench_parameter_space
+"""
+import timeit
+
+import numpy as np
+
+from strategy_factory.gen_initilisation_file.parameter_space import ParameterSpace
+
+BUDGETS = (100, 10_000, 1_000_000)
+DIMENSIONS = (10, 15, 20)
+REPEAT = 20
+
+
+def make_inputs(dims: int, seed: int = 0) -> dict:
+    """ Mix of int period-like and float inputs with random ranges (linear, as log axes are not emitted as a grid). """
+    rng = np.random.default_rng(seed)
+    inputs = {}
+    for i in range(dims):
+        if i % 2:
+            inputs[f"InpPeriod{i}"] = {"default": 14, "type": "int", "min": 2, "max": int(rng.integers(50, 500)),
+                                       "step": 1}
+        else:
+            inputs[f"InpLevel{i}"] = {"default": 0.5, "type": "float", "min": 0.0,
+                                      "max": float(rng.uniform(1, 10)), "step": 0.01}
+    return inputs
+
+
+def main():
+    print(f"{'dims':>5} {'budget':>10} {'passes':>10} {'fill %':>7} {'solve ms':>9} {'emit ms':>8}")
+    for dims in DIMENSIONS:
+        inputs = make_inputs(dims)
+        for budget in BUDGETS:
+            solved = ParameterSpace.from_inputs(inputs).solve_steps(budget)
+            solve = timeit.timeit(lambda: ParameterSpace.from_inputs(inputs).solve_steps(budget), number=REPEAT)
+            emit = timeit.timeit(solved.tester_inputs, number=REPEAT)
+            passes = solved.pass_count()
+            print(f"{dims:>5} {budget:>10} {passes:>10} {100 * passes / budget:>7.1f} "
+                  f"{1000 * solve / REPEAT:>9.2f} {1000 * emit / REPEAT:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+""" Benchmark re-aggregating finished stages with the process-pool post-processor, by number of worker processes.
+
+Synthetic stages mimic a genetic optimisation: one IS and one OOS report per indicator, with the usual result columns
+and a set of inputs. Every measurement starts from a fresh copy of the reports (no results store yet), so all reports
+are parsed. Reports are written to a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_post_processing
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from strategy_factory.post_processing.reaggregate import reaggregate_stage
+
+STAGES = 2
+INDICATORS = 100
+PASSES = 5_000
+RESULT_COLUMNS = ["Pass", "Result", "Profit", "Expected Payoff", "Profit Factor", "Recovery Factor", "Sharpe Ratio",
+                  "Custom", "Equity DD %", "Trades"]
+INPUTS = [f"InpParam{i}" for i in range(8)]
+
+
+def make_report(path: Path, passes: int, rng: np.random.Generator):
+    """ Write a converted report CSV with `passes` rows, including a few invalid MT5 values. """
+    table = pd.DataFrame(rng.normal(1000, 500, size=(passes, len(RESULT_COLUMNS))).round(2), columns=RESULT_COLUMNS)
+    table["Pass"] = range(passes)
+    table["Trades"] = rng.integers(20, 400, size=passes)
+    table = table.astype(object)
+    table.loc[rng.choice(passes, size=passes // 100, replace=False), "Sharpe Ratio"] = "-nan(ind)"
+    for name in INPUTS:
+        table[name] = rng.integers(1, 200, size=passes)
+    table.to_csv(path, index=False)
+
+
+def make_run(run_dir: Path):
+    rng = np.random.default_rng(0)
+    for stage in range(STAGES):
+        results_dir = run_dir / f"Stage{stage}" / "results"
+        results_dir.mkdir(parents=True)
+        for indicator in range(INDICATORS):
+            for phase in ("IS", "OOS"):
+                make_report(results_dir / f"indi{indicator}_{phase}.csv", PASSES, rng)
+
+
+def reaggregate(run_dir: Path, workers: int) -> float:
+    """ Re-aggregate every stage of a run, return the elapsed seconds. """
+    start = time.perf_counter()
+    results_dirs = sorted(run_dir.glob("*/results"))
+    if workers == 1:
+        for results_dir in results_dirs:
+            reaggregate_stage(results_dir)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            for results_dir in results_dirs:
+                reaggregate_stage(results_dir, executor)
+    return time.perf_counter() - start
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, *(2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus), cpus})
+    print(f"{STAGES} stages x {INDICATORS} indicators x 2 reports x {PASSES} passes, {cpus} CPU(s)")
+    print(f"{'workers':>8} {'seconds':>8} {'speed-up':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        make_run(tmp / "reports")
+
+        baseline = None
+        expected = None
+        for workers in worker_counts:
+            run_dir = tmp / f"run_{workers}"
+            shutil.copytree(tmp / "reports", run_dir)
+            elapsed = reaggregate(run_dir, workers)
+            baseline = baseline or elapsed
+
+            combined = [(path / "1_combined_results.csv").read_bytes() for path in sorted(run_dir.glob("*/results"))]
+            expected = expected or combined
+            print(f"{workers:>8} {elapsed:>8.2f} {baseline / elapsed:>8.2f}x"
+                  f"{'' if combined == expected else '  OUTPUT DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
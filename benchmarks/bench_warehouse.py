@@ -0,0 +1,76 @@
+""" Benchmark cross-project queries on the results warehouse.
+
+A synthetic warehouse holds years of runs: projects on a few symbols/periods, each with the combined results of every
+stage. The tables are filled directly (no report files), so only the query time is measured.
+
+Run from the repository root:
+    python -m benchmarks.bench_warehouse
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from strategy_factory.post_processing.results_warehouse import COMBINED_METRICS, PROJECT_FIELDS, ResultsWarehouse
+
+PROJECTS = 3_000
+STAGES = ["Trigger", "Conformation", "Trendline", "Volume", "Exit"]
+INDICATORS = 40
+SYMBOLS = ["EURUSD", "GBPUSD", "USDJPY", "XAUUSD"]
+PERIODS = ["H1", "H4", "D1"]
+REPEAT = 5
+
+
+def fill(warehouse: ResultsWarehouse, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 4 * 365, size=PROJECTS)
+    with warehouse._conn:
+        warehouse._conn.execute("BEGIN")
+        for i in range(PROJECTS):
+            run_name = f"run{i:05d}"
+            settings = {"pipeline": "trend_following", "main_chart_symbol": SYMBOLS[i % len(SYMBOLS)],
+                        "period": PERIODS[i % len(PERIODS)]}
+            warehouse._conn.execute(
+                f"INSERT INTO projects VALUES ({', '.join('?' * (len(PROJECT_FIELDS) + 2))})",
+                (run_name, *(settings.get(key) for key in PROJECT_FIELDS), None))
+
+            updated = (np.datetime64("2023-01-01") + days[i]).astype(str) + "T12:00:00"
+            metrics = rng.normal(1.2, 0.4, size=(len(STAGES) * INDICATORS, len(COMBINED_METRICS))).tolist()
+            warehouse._conn.executemany(
+                f"INSERT INTO combined VALUES (?, ?, ?, {', '.join('?' * len(COMBINED_METRICS))}, ?, ?)",
+                ((run_name, stage, f"indi{j}", *metrics[s * INDICATORS + j], None, updated)
+                 for s, stage in enumerate(STAGES) for j in range(INDICATORS)))
+    warehouse._analyse()
+
+
+def timed(func, *args, **kwargs) -> float:
+    """ Best of REPEAT calls, in milliseconds. """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = ResultsWarehouse(output_dir=Path(tmp))
+        fill(warehouse)
+        rows = PROJECTS * len(STAGES) * INDICATORS
+        print(f"{PROJECTS} projects, {rows} combined rows")
+
+        queries = {
+            "best Trigger by PF_OOS, EURUSD D1, 2026": lambda: warehouse.best_indicators(
+                "Trigger", "PF_OOS", symbol="EURUSD", period="D1", since="2026-01-01", until="2027-01-01"),
+            "best Exit by Res_OOS, all projects": lambda: warehouse.best_indicators("Exit", "Res_OOS"),
+            "combined rows of Volume, GBPUSD": lambda: warehouse.combined_results("Volume", symbol="GBPUSD"),
+        }
+        for name, query in queries.items():
+            print(f"{name:<45} {timed(query):>8.1f} ms")
+        warehouse.close()
+
+
+if __name__ == "__main__":
+    main()
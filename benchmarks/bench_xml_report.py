@@ -0,0 +1,110 @@
+""" Benchmark the streaming MT5 XML report converter against the previous buffering SAX converter.
+
+Synthetic reports mimic a genetic optimisation: one row per pass with the usual result columns and a set of inputs,
+followed by a second (ignored) table. Reports are written to a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_xml_report
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from xml.sax import ContentHandler, parse
+
+import numpy as np
+import pandas as pd
+
+from strategy_factory.post_processing.xml_to_csv import write_xml_to_csv
+
+PASSES = (10_000, 100_000, 250_000)
+RESULT_COLUMNS = ["Pass", "Result", "Profit", "Expected Payoff", "Profit Factor", "Recovery Factor", "Sharpe Ratio",
+                  "Custom", "Equity DD %", "Trades"]
+INPUTS = [f"InpParam{i}" for i in range(8)]
+
+
+class ExcelHandler(ContentHandler):
+    """ The previous converter's SAX handler: buffers every cell of every table as a string. """
+
+    def __init__(self):
+        self.tables = []
+        self.chars = []
+
+    def characters(self, content):
+        self.chars.append(content)
+
+    def startElement(self, name, attrs):
+        if name == "Table":
+            self.rows = []
+        elif name == "Row":
+            self.cells = []
+        elif name == "Data":
+            self.chars = []
+
+    def endElement(self, name):
+        if name == "Table":
+            self.tables.append(self.rows)
+        elif name == "Row":
+            self.rows.append(self.cells)
+        elif name == "Data":
+            self.cells.append("".join(self.chars))
+
+
+def legacy_xml_to_csv(xml_path: Path, output_csv_path: Path):
+    handler = ExcelHandler()
+    parse(str(xml_path), handler)
+    pd.DataFrame(handler.tables[0][1:], columns=handler.tables[0][0]).to_csv(output_csv_path, index=False)
+
+
+def make_report(path: Path, passes: int, seed: int = 0):
+    """ Write a SpreadsheetML report with `passes` rows, plus a small second table. """
+    rng = np.random.default_rng(seed)
+    header = RESULT_COLUMNS + INPUTS
+
+    def row(values, kind):
+        return "<Row>" + "".join(f'<Cell><Data ss:Type="{kind}">{v}</Data></Cell>' for v in values) + "</Row>\n"
+
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0"?>\n<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" '
+                'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">\n<Worksheet ss:Name="Tester"><Table>\n')
+        f.write(row(header, "String"))
+        results = rng.normal(1000, 500, size=(passes, len(RESULT_COLUMNS) - 2)).round(2)
+        params = rng.integers(1, 200, size=(passes, len(INPUTS)))
+        for i in range(passes):
+            f.write(row([i, *results[i], int(params[i, 0]), *params[i]], "Number"))
+        f.write("</Table></Worksheet>\n<Worksheet ss:Name=\"Summary\"><Table>\n")
+        f.write(row(["Key", "Value"], "String") * 10)
+        f.write("</Table></Worksheet>\n</Workbook>\n")
+
+
+def measure(func, *args) -> tuple[float, float]:
+    """ Return (seconds, peak traced MB) of a call. Timed on its own, as tracing slows the parsers unevenly. """
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    print(f"{'passes':>8} {'xml MB':>7} {'legacy s':>9} {'legacy MB':>10} {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for passes in PASSES:
+            xml_path = tmp / f"report_{passes}.xml"
+            make_report(xml_path, passes)
+            legacy = measure(legacy_xml_to_csv, xml_path, tmp / "legacy.csv")
+            stream = measure(write_xml_to_csv, xml_path, tmp / "stream.csv")
+
+            same = pd.read_csv(tmp / "legacy.csv").equals(pd.read_csv(tmp / "stream.csv"))
+            size = xml_path.stat().st_size / 2 ** 20
+            print(f"{passes:>8} {size:>7.1f} {legacy[0]:>9.2f} {legacy[1]:>10.1f} {stream[0]:>9.2f} {stream[1]:>10.1f}"
+                  f"{'' if same else '  OUTPUT DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
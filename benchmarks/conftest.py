@@ -0,0 +1,28 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from strategy_factory.testing import FakeReportSettings, install_fake_mt5, use_fake_mt5
+from strategy_factory.utils.pathing import LOCAL_PATHS_ENV
+
+PIPELINE_CONFIG = Path(__file__).parent.parent / "strategy_factory" / "pipelines" / "trend_following" / "config.yaml"
+
+# Benchmark against a fake MT5 (instant terminal runs, 2-terminal pool), unless a paths file is given explicitly
+if LOCAL_PATHS_ENV not in os.environ:
+    _fake_mt5_dir = tempfile.TemporaryDirectory(prefix="fake_mt5_bench_")
+    use_fake_mt5(install_fake_mt5(_fake_mt5_dir.name, FakeReportSettings(rows=500), pool_size=2))
+
+
+@pytest.fixture(scope="session")
+def project_config(tmp_path_factory):
+    """ The trend-following pipeline config, on the chart symbol only, without result cache or resource sampling. """
+    from strategy_factory.utils import load_config_from_yaml
+
+    data = yaml.safe_load(PIPELINE_CONFIG.read_text(encoding="utf-8"))
+    data.update(whitelist_file="CHART_SYMBOL_ONLY", use_result_cache=False, resource_sample_seconds=0)
+    config_path = tmp_path_factory.mktemp("config") / "config.yaml"
+    config_path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    return load_config_from_yaml(config_path)
@@ -0,0 +1,104 @@
+""" pytest-benchmark suite: end-to-end stage throughput and per-component costs, on the fake MT5 terminal.
+
+The stage runs the Trigger stage of the trend-following pipeline on a 2-terminal fake pool (see benchmarks/conftest.py),
+so the timings cover the pipeline's own overhead: rendering, compiling, .ini writing, terminal launches, report
+copy/conversion and aggregation.
+
+Run from the repository root:
+    pytest benchmarks --benchmark-only
+    pytest benchmarks --benchmark-only --benchmark-autosave --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+import itertools
+import shutil
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# stage_execution first: importing generate_ea on its own runs into the package's circular import
+from strategy_factory.stage_execution import StageRunner, get_stage_config  # noqa: E402
+from strategy_factory.gen_expert_advisor.generate_ea import GenerateEA  # noqa: E402
+from strategy_factory.gen_initilisation_file import create_ini  # noqa: E402
+from strategy_factory.pipelines.trend_following.stages import STAGES  # noqa: E402
+from strategy_factory.post_processing.result_summary import update_combined_results  # noqa: E402
+from strategy_factory.post_processing.xml_to_csv import write_xml_to_csv  # noqa: E402
+from strategy_factory.testing.fake_mt5 import RESULT_COLUMNS, synthetic_passes, write_report  # noqa: E402
+
+STAGE = "Trigger"
+INPUTS = {f"InpParam{i}": list(range(1, 201)) for i in range(8)}
+AGGREGATION_COPIES = 10  # Indicators per stage in the aggregation benchmark = copies x indicators of the stage
+
+_run_ids = itertools.count()
+
+
+def run_stage(project_config, stage, run_name: str) -> StageRunner:
+    """ Run a whole stage (IS and OOS of every indicator) under a new project name. """
+    runner = StageRunner(project_config=replace(project_config, run_name=run_name), stage_config=stage,
+                         auto_run=False)
+    runner.wait(runner.start())
+    return runner
+
+
+@pytest.fixture(scope="module")
+def stage():
+    return get_stage_config(STAGES, STAGE)
+
+
+@pytest.fixture(scope="module")
+def finished_stage(project_config, stage) -> StageRunner:
+    """ A stage run once, providing rendered EAs, .ini files and converted reports to the component benchmarks. """
+    return run_stage(project_config, stage, "bench_components")
+
+
+def test_stage_end_to_end(benchmark, project_config, stage):
+    runner = benchmark.pedantic(lambda: run_stage(project_config, stage, f"bench_e2e_{next(_run_ids)}"),
+                                rounds=3, iterations=1)
+
+    indicators = len(list(runner.results_dir.glob("*_OOS.csv")))
+    assert indicators and (runner.results_dir / "1_combined_results.csv").exists()
+    benchmark.extra_info["indicators"] = indicators
+    if benchmark.stats:  # None under --benchmark-disable
+        benchmark.extra_info["indicators_per_second"] = round(indicators / benchmark.stats.stats.mean, 3)
+
+
+def test_render(benchmark, finished_stage, stage):
+    generator = GenerateEA(finished_stage.project_config, stage, finished_stage.ea_output_dir)
+    yaml_path = sorted(generator._resolve_indicator_dir().glob("*.yaml"))[0]
+
+    assert benchmark(generator._generate_mq5, yaml_path).exists()
+
+
+def test_ini(benchmark, finished_stage, stage):
+    indicator = sorted(finished_stage.ea_output_dir.glob("*.ex5"))[0].stem
+
+    ini_path = benchmark(create_ini, indi_name=indicator, ea_output_dir=finished_stage.ea_output_dir,
+                         project_config=finished_stage.project_config, ini_files_dir=finished_stage.ini_dir,
+                         in_sample=True, stage_config=stage)
+    assert ini_path.exists()
+
+
+@pytest.mark.parametrize("passes", [1_000, 20_000])
+def test_xml_to_csv(benchmark, tmp_path, passes):
+    xml_path = write_report(tmp_path / "report.xml", RESULT_COLUMNS + list(INPUTS),
+                            synthetic_passes(INPUTS, passes, seed=0)["back"])
+    csv_path = tmp_path / "report.csv"
+
+    benchmark(write_xml_to_csv, xml_path, csv_path)
+    assert csv_path.exists()
+
+
+def test_aggregation(benchmark, finished_stage, tmp_path):
+    """ Cold aggregation: every IS/OOS report is parsed into a fresh results store and summarised. """
+    reports = sorted(finished_stage.results_dir.glob("*_IS.csv")) + sorted(finished_stage.results_dir.glob("*_OOS.csv"))
+
+    def fresh_results_dir():
+        results_dir = tmp_path / f"results_{next(_run_ids)}"
+        results_dir.mkdir()
+        for copy, report in itertools.product(range(AGGREGATION_COPIES), reports):
+            indicator, phase = report.stem.rsplit("_", 1)
+            shutil.copyfile(report, results_dir / f"{indicator}{copy}_{phase}.csv")
+        return (results_dir,), {}
+
+    combined = benchmark.pedantic(update_combined_results, setup=fresh_results_dir, rounds=5)
+    assert len(combined) == AGGREGATION_COPIES * len(reports) // 2
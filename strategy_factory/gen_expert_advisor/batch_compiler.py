@@ -0,0 +1,152 @@
+import logging
+import os
+import subprocess
+from collections.abc import Iterable, Sized
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+
+from strategy_factory.utils import load_paths
+
+from .compiler import (CompileResult, compile_ea, compile_cache_key, mql5_relative, restore_cached_ex5,
+                       read_compile_log, store_cached_ex5, store_failed_compile)
+
+logger = logging.getLogger(__name__)
+
+# MetaEditor is mostly single-threaded, but each instance is heavy on I/O; leave headroom for the terminals
+DEFAULT_COMPILE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+
+@dataclass
+class CompileReport:
+    """ Per-file outcome of compiling a batch of .mq5 sources.
+
+    param results: One CompileResult per source, in the order they were given
+    param elapsed: Wall-clock seconds spent on the batch
+    """
+    results: list[CompileResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def compiled(self) -> list[str]:
+        """ Names of the EAs that compiled successfully. """
+        return [r.name for r in self.results if r.success]
+
+    @property
+    def failed(self) -> list[CompileResult]:
+        """ Results of the EAs that failed to compile. """
+        return [r for r in self.results if not r.success]
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(r.from_cache for r in self.results)
+
+    def write_failure_report(self, report_path: Path) -> None:
+        """ Write the names and MetaEditor logs of all failed compiles to a text file.
+
+        param report_path: Destination text file (e.g. <expert_dir>/00_un_compiled.txt)
+        """
+        with open(report_path, "w") as f:
+            f.write("Indicators with missing .ex5:\n")
+            f.writelines(f"- {r.name}\n" for r in sorted(self.failed, key=lambda r: r.name))
+            for r in sorted(self.failed, key=lambda r: r.name):
+                if r.log:
+                    f.write(f"\n===== {r.name} =====\n{r.log.strip()}\n")
+
+
+def compile_batch(mq5_paths: Iterable[Path], max_workers: int = None, editor_path: Path = None,
+                  use_cache: bool = True, single_launch: bool = False) -> CompileReport:
+    """ Compile several .mq5 sources, either on a bounded pool of MetaEditor processes or in one MetaEditor launch.
+
+    Cached sources are restored without launching MetaEditor in both modes (see `compile_ea`). On the pool, each source
+    is queued as soon as the iterable yields it, so a generator of freshly rendered sources compiles while the rest are
+    still being rendered.
+
+    param mq5_paths: Sources to compile (any iterable, e.g. a generator streaming rendered files)
+    param max_workers: Maximum number of concurrent MetaEditor processes. Defaults to DEFAULT_COMPILE_WORKERS.
+    param editor_path: Optional MetaEditor executable. Defaults to MT5_META_EDITOR_EXE.
+    param use_cache: If False, always invoke MetaEditor and leave the compile cache untouched
+    param single_launch: If True, compile all sources that miss the cache with a single MetaEditor
+                         `/compile:<folder>` call per directory instead of one process per file
+    return: CompileReport with one result per source
+    """
+    start = perf_counter()
+    editor_path = editor_path or load_paths()["MT5_META_EDITOR_EXE"]
+
+    if single_launch:
+        results = _compile_by_folder(list(mq5_paths), editor_path, use_cache)
+    else:
+        max_workers = max(1, max_workers or DEFAULT_COMPILE_WORKERS)
+        if isinstance(mq5_paths, Sized):
+            max_workers = min(max_workers, len(mq5_paths) or 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="metaeditor") as executor:
+            futures = [executor.submit(compile_ea, p, use_cache=use_cache, editor_path=editor_path)
+                       for p in mq5_paths]
+            results = [f.result() for f in futures]
+
+    report = CompileReport(results=results, elapsed=perf_counter() - start)
+    logger.info(f"Compiled {len(report.compiled)}/{len(results)} EAs in {report.elapsed:.2f}s "
+                f"({report.cache_hits} from cache, {len(report.failed)} failed)")
+    return report
+
+
+def compile_directory(expert_dir: Path, **kwargs) -> CompileReport:
+    """ Compile every .mq5 source in a stage's experts directory.
+
+    param expert_dir: Directory containing the generated .mq5 files
+    param kwargs: Passed on to `compile_batch`
+    return: CompileReport with one result per source
+    """
+    return compile_batch(sorted(expert_dir.glob("*.mq5")), **kwargs)
+
+
+def _compile_by_folder(mq5_paths: list[Path], editor_path: Path, use_cache: bool) -> list[CompileResult]:
+    """ Compile the cache misses of each directory with one MetaEditor `/compile:<folder>` launch.
+
+    MetaEditor compiles every source in the folder, so the per-file outcome is read back from the .ex5 files that
+    exist afterwards. Failed sources share the folder's MetaEditor log.
+    """
+    results: dict[Path, CompileResult] = {}
+    cache_keys: dict[Path, str] = {}
+    pending_by_dir: dict[Path, list[Path]] = {}
+
+    for mq5_path in mq5_paths:
+        if not mq5_path.exists():
+            raise FileNotFoundError(f".mq5 file not found: {mq5_path}")
+
+        if use_cache:
+            cache_keys[mq5_path] = compile_cache_key(mq5_path, editor_path)
+            cached = restore_cached_ex5(cache_keys[mq5_path], mq5_path)
+            if cached:
+                results[mq5_path] = cached
+                continue
+
+        ex5_path = mq5_path.with_suffix(".ex5")
+        if ex5_path.exists():
+            ex5_path.unlink()
+        pending_by_dir.setdefault(mq5_path.parent, []).append(mq5_path)
+
+    for folder, pending in pending_by_dir.items():
+        working_dir, rel_folder = mql5_relative(folder)
+        command = [str(editor_path), f"/compile:{rel_folder.as_posix()}", "/log"]
+
+        logger.info(f"Compiling {len(pending)} EAs in one MetaEditor launch: {rel_folder}")
+        result = subprocess.run(command, cwd=working_dir, capture_output=True, text=True)
+        log_text = read_compile_log(folder, result)
+
+        for mq5_path in pending:
+            ex5_path = mq5_path.with_suffix(".ex5")
+            if ex5_path.exists():
+                if mq5_path in cache_keys:
+                    store_cached_ex5(cache_keys[mq5_path], ex5_path)
+                results[mq5_path] = CompileResult(name=mq5_path.stem, mq5_path=mq5_path, success=True)
+            else:
+                logger.error(f"Compilation failed for {mq5_path.name}")
+                if mq5_path in cache_keys:
+                    store_failed_compile(cache_keys[mq5_path], mq5_path, log_text)
+                results[mq5_path] = CompileResult(name=mq5_path.stem, mq5_path=mq5_path, success=False,
+                                                  log=log_text)
+
+    return [results[p] for p in mq5_paths]
+
@@ -1,33 +1,78 @@
+import os
+import shutil
 import subprocess
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from strategy_factory.utils import load_paths
+from strategy_factory.utils import annotate, load_paths, traced
+from strategy_factory.utils.hashing import hash_file, hash_json, hash_tree, tree_signature
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Include libraries (under MQL5/Include) whose contents are part of the compile cache key
+CACHED_INCLUDE_LIBS = ("MyLibs",)
 
-def compile_ea(ea_mq5_path: Path) -> None:
+# Memoised include-tree hashes, keyed by library path and refreshed whenever its file signature changes
+_include_hashes: dict[Path, tuple[tuple, str]] = {}
+_include_lock = threading.Lock()
+
+
+@dataclass
+class CompileResult:
+    """ Outcome of compiling a single .mq5 source.
+
+    param name: EA base name (file stem)
+    param mq5_path: Path to the compiled source
+    param success: True if the .ex5 exists after compiling
+    param from_cache: True if MetaEditor was not launched (cache hit or memoised failure)
+    param log: Captured MetaEditor output for failed compiles
+    """
+    name: str
+    mq5_path: Path
+    success: bool
+    from_cache: bool = False
+    log: str = ""
+
+
+@traced("compile")
+def compile_ea(ea_mq5_path: Path, use_cache: bool = True, editor_path: Path = None) -> CompileResult:
     """ Compile a .mq5 file to .ex5 using MetaEditor as a subprocess.
 
+    Compiled binaries are cached under EA_CACHE_DIR, keyed on the .mq5 source, the MQL include libraries it builds
+    against and the MetaEditor build. An unchanged source reuses the cached .ex5 without launching MetaEditor, and a
+    source that is known to fail is not retried until any file under MQL5/Include changes; its MetaEditor log is kept
+    next to the cache entry.
+
     param ea_mq5_path: Path to the .mq5 file to compile
+    param use_cache: If False, always invoke MetaEditor and leave the cache untouched
+    param editor_path: Optional MetaEditor executable. Defaults to MT5_META_EDITOR_EXE.
+    return: CompileResult for the source
     """
+    annotate(indicator=ea_mq5_path.stem)
+
     # Check that the .mq5 source file exists
     if not ea_mq5_path.exists():
         raise FileNotFoundError(f".mq5 file not found: {ea_mq5_path}")
 
     # Load necessary MT5 paths from your config/util
-    paths = load_paths()
-    editor_path = paths["MT5_META_EDITOR_EXE"]
+    editor_path = editor_path or load_paths()["MT5_META_EDITOR_EXE"]
     if not editor_path.exists():
         raise FileNotFoundError(f"MetaEditor not found at: {editor_path}")
 
     # Figure out the .mq5's path relative to MQL5 directory
-    rel_mq5_path = ea_mq5_path.relative_to(ea_mq5_path.parents[ea_mq5_path.parts.index("MQL5")])
-    working_dir = ea_mq5_path.parents[ea_mq5_path.parts.index("MQL5")]
+    working_dir, rel_mq5_path = mql5_relative(ea_mq5_path)
 
     # Define the .ex5 output file path
     ea_ex5_path = ea_mq5_path.with_suffix(".ex5")
 
+    cache_key = compile_cache_key(ea_mq5_path, editor_path) if use_cache else None
+    if cache_key:
+        cached = restore_cached_ex5(cache_key, ea_mq5_path)
+        if cached:
+            annotate(cached=True)
+            return cached
+
     # Delete any previous .ex5 output before compiling
     if ea_ex5_path.exists():
         ea_ex5_path.unlink()
@@ -37,6 +82,7 @@ def compile_ea(ea_mq5_path: Path) -> None:
     command = [
         str(editor_path),
         f"/compile:{rel_mq5_path.as_posix()}",
+        "/log",
     ]
 
     # Run MetaEditor as a subprocess
@@ -46,10 +92,155 @@ def compile_ea(ea_mq5_path: Path) -> None:
     # Check if .ex5 was generated successfully
     if ea_ex5_path.exists():
         logger.info(f"Compilation succeeded: {ea_ex5_path.name}")
+        if cache_key:
+            store_cached_ex5(cache_key, ea_ex5_path)
+        return CompileResult(name=ea_mq5_path.stem, mq5_path=ea_mq5_path, success=True)
+
+    logger.error(f"Compilation failed for {ea_mq5_path.name}")
+
+    # Log the stdout and stderr for debugging compilation problems
+    logger.debug(f"stdout:\n{result.stdout}")
+    logger.debug(f"stderr:\n{result.stderr}")
+    log_text = read_compile_log(ea_mq5_path, result)
+    if cache_key:
+        store_failed_compile(cache_key, ea_mq5_path, log_text)
+    return CompileResult(name=ea_mq5_path.stem, mq5_path=ea_mq5_path, success=False, log=log_text)
+
+
+def mql5_relative(path: Path) -> tuple[Path, Path]:
+    """ Return the MetaEditor working directory for a path under MQL5 and the path relative to it.
+
+    param path: Source file or folder under a terminal's MQL5 folder
+    return: Tuple of (working directory, path relative to it) for a `/compile:` argument
+    """
+    working_dir = path.parents[path.parts.index("MQL5")]
+    return working_dir, path.relative_to(working_dir)
+
+
+def compile_cache_key(ea_mq5_path: Path, editor_path: Path) -> str:
+    """ Build the cache key for compiling one .mq5 source.
+
+    param ea_mq5_path: Path to the .mq5 file
+    param editor_path: MetaEditor executable (its size/mtime identify the build)
+    return: Hex digest string
+    """
+    editor_stat = editor_path.stat()
+
+    return hash_json({
+        "source": hash_file(ea_mq5_path),
+        "includes": include_hashes(),
+        "editor": [editor_stat.st_size, editor_stat.st_mtime_ns],
+    })
+
+
+def include_hashes() -> dict[str, str]:
+    """ Return the content hash of every include library in CACHED_INCLUDE_LIBS, by library name. """
+    include_dir = load_paths()["MT5_INCLUDE_DIR"]
+    return {lib: _include_tree_hash(include_dir / lib) for lib in CACHED_INCLUDE_LIBS}
+
+
+def _include_tree_hash(lib_dir: Path) -> str:
+    """ Return the content hash of an include library, recomputing it only when files change. """
+    signature = tree_signature(lib_dir)
+    with _include_lock:
+        cached = _include_hashes.get(lib_dir)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        digest = hash_tree(lib_dir)
+        _include_hashes[lib_dir] = (signature, digest)
+        return digest
 
-    else:
-        logger.error(f"Compilation failed for {ea_mq5_path.name}")
 
-        # Log the stdout and stderr for debugging compilation problems
-        logger.debug(f"stdout:\n{result.stdout}")
-        logger.debug(f"stderr:\n{result.stderr}")
+def _cache_entry(cache_key: str) -> Path:
+    """ Return the cache path stem for a compile key (without suffix). """
+    return load_paths()["EA_CACHE_DIR"] / cache_key[:2] / cache_key
+
+
+def restore_cached_ex5(cache_key: str, ea_mq5_path: Path) -> CompileResult | None:
+    """ Reuse a cached compile result.
+
+    param cache_key: Compile key from `compile_cache_key`
+    param ea_mq5_path: Source the result is for; a cached .ex5 is copied next to it
+    return: CompileResult if the compile was satisfied from the cache (hit or known failure), None if MetaEditor
+            needs to run
+    """
+    entry = _cache_entry(cache_key)
+    cached_ex5 = entry.with_suffix(".ex5")
+    ea_ex5_path = ea_mq5_path.with_suffix(".ex5")
+
+    if cached_ex5.exists():
+        shutil.copyfile(cached_ex5, ea_ex5_path)
+        logger.info(f"Compile cache hit: {ea_ex5_path.name}")
+        return CompileResult(name=ea_mq5_path.stem, mq5_path=ea_mq5_path, success=True, from_cache=True)
+
+    # Only scan the include folder if the source failed before
+    failed_log = _failed_log(cache_key) if any(entry.parent.glob(f"{cache_key}.*.failed.log")) else None
+    if failed_log is not None and failed_log.exists():
+        if ea_ex5_path.exists():
+            ea_ex5_path.unlink()
+        logger.error(f"Compilation previously failed for {ea_mq5_path.name} with identical source; "
+                     f"not retrying. MetaEditor log: {failed_log}")
+        return CompileResult(name=ea_mq5_path.stem, mq5_path=ea_mq5_path, success=False, from_cache=True,
+                             log=failed_log.read_text(encoding="utf-8"))
+
+    return None
+
+
+def store_cached_ex5(cache_key: str, ea_ex5_path: Path) -> None:
+    """ Copy a freshly compiled .ex5 into the cache, via a temporary file so readers never see a partial copy.
+
+    param cache_key: Compile key from `compile_cache_key`
+    param ea_ex5_path: The compiled .ex5
+    """
+    cached_ex5 = _cache_entry(cache_key).with_suffix(".ex5")
+    cached_ex5.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = cached_ex5.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copyfile(ea_ex5_path, tmp)
+    os.replace(tmp, cached_ex5)
+
+
+def _failed_log(cache_key: str) -> Path:
+    """ Return the memoised-failure log of a compile key under the current state of MQL5/Include.
+
+    A failure can come from any include, not only the libraries in the key (e.g. the standard library), so the log
+    name carries a signature of the whole include folder: once any include changes, the failure is retried.
+    """
+    signature = hash_json(tree_signature(load_paths()["MT5_INCLUDE_DIR"]))
+    return _cache_entry(cache_key).with_name(f"{cache_key}.{signature[:16]}.failed.log")
+
+
+def store_failed_compile(cache_key: str, ea_mq5_path: Path, log_text: str) -> None:
+    """ Memoise a failed compile together with the captured MetaEditor output.
+
+    param cache_key: Compile key from `compile_cache_key`
+    param ea_mq5_path: Source that failed to compile
+    param log_text: MetaEditor output (see `read_compile_log`)
+    """
+    failed_log = _failed_log(cache_key)
+    failed_log.parent.mkdir(parents=True, exist_ok=True)
+    for stale in failed_log.parent.glob(f"{cache_key}.*.failed.log"):
+        stale.unlink(missing_ok=True)
+    failed_log.write_text(f"source: {ea_mq5_path}\n\n{log_text}", encoding="utf-8")
+    logger.info(f"Recorded compile failure log: {failed_log}")
+
+
+def read_compile_log(ea_mq5_path: Path, result: subprocess.CompletedProcess) -> str:
+    """ Collect MetaEditor's /log file (UTF-16 on Windows) plus any console output of the compile.
+
+    param ea_mq5_path: Compiled source, or folder for a `/compile:<folder>` launch; the log sits next to it as .log
+    param result: The finished MetaEditor process
+    return: Log text
+    """
+    parts = []
+    log_path = ea_mq5_path.with_suffix(".log")
+    if log_path.exists():
+        raw = log_path.read_bytes()
+        encoding = "utf-16" if raw[:2] in (b"\xff\xfe", b"\xfe\xff") else "utf-8"
+        parts.append(raw.decode(encoding, errors="replace"))
+    if result.stdout:
+        parts.append(f"stdout:\n{result.stdout}")
+    if result.stderr:
+        parts.append(f"stderr:\n{result.stderr}")
+    return "\n".join(parts)
@@ -1,14 +1,26 @@
+import inspect
 import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import pandas as pd
+
+from strategy_factory.renderer_tools import UpstreamContext
 from strategy_factory.stage_execution.stage_config import StageConfig
-from strategy_factory.utils import load_paths, ProjectConfig
+from strategy_factory.utils import annotate, load_paths, ProjectConfig, traced
+from strategy_factory.utils.sample_table import SAMPLE_IDX_INPUT, stage_sample_table, write_sample_table
 
 from .generator_tools import load_indicator_data, load_render_func
 from .compiler import compile_ea
+from .batch_compiler import CompileReport, compile_batch
 
 logger = logging.getLogger(__name__)
 
+# Rendering is light; a few threads keep the MetaEditor queue fed
+DEFAULT_RENDER_WORKERS = min(8, os.cpu_count() or 2)
+
 
 class GenerateEA:
     def __init__(self, project_config: ProjectConfig, stage_config: StageConfig, ea_output_dir: Path):
@@ -22,23 +34,46 @@ class GenerateEA:
         self.stage_config = stage_config
         self.ea_output_dir = ea_output_dir
         self.paths = load_paths()
+        self.upstream = UpstreamContext(project_config)
         self.ea_output_dir.mkdir(parents=True, exist_ok=True)
 
-    def generate_all(self) -> None:
+    @traced("generate_ea")
+    def generate_all(self, max_workers: int = None, render_workers: int = None) -> CompileReport | None:
         """ Generate and compile EAs for all indicator YAML files in the stage's indicator directory.
 
-        This method scans the indicator directory defined in the stage configuration and processes
-        each `.yaml` file it finds.
+        This method scans the indicator directory defined in the stage configuration and renders each `.yaml` file it
+        finds to an `.mq5` source on a thread pool. Every finished source is queued straight onto the bounded pool of
+        MetaEditor processes, so the first EAs compile while the rest are still being rendered.
 
-        return: None. Logs a warning if no YAML files are found.
+        param max_workers: Maximum number of concurrent MetaEditor processes. Defaults to DEFAULT_COMPILE_WORKERS.
+        param render_workers: Number of rendering threads. Defaults to DEFAULT_RENDER_WORKERS.
+        return: CompileReport with the per-EA compile outcome, or None if no YAML files are found.
         """
+        annotate(stage=self.stage_config.name)
         indicator_dir = self._resolve_indicator_dir()
-        yaml_files = list(indicator_dir.glob("*.yaml"))
+        yaml_files = sorted(indicator_dir.glob("*.yaml"))
         if not yaml_files:
             logger.warning("No indicator YAML files found in %s", indicator_dir)
-            return
-        for yaml_file in yaml_files:
-            self.generate_one(yaml_file)
+            return None
+
+        return compile_batch(self._render_all(yaml_files, render_workers), max_workers=max_workers)
+
+    def _render_all(self, yaml_files: list[Path], render_workers: int = None) -> Iterator[Path]:
+        """ Render the sources of several YAML files concurrently, yielding each .mq5 path as soon as it is written.
+
+        param yaml_files: Indicator YAML files to render
+        param render_workers: Number of rendering threads. Defaults to DEFAULT_RENDER_WORKERS.
+        return: Iterator over the generated `.mq5` paths, in completion order
+        """
+        workers = max(1, min(render_workers or DEFAULT_RENDER_WORKERS, len(yaml_files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render") as executor:
+            futures = {executor.submit(self._generate_mq5, yaml_file): yaml_file for yaml_file in yaml_files}
+            for future in as_completed(futures):
+                mq5_path = future.result()
+                if not mq5_path.exists():
+                    logger.warning("Failed to generate .mq5 file for %s", futures[future].name)
+                    continue
+                yield mq5_path
 
     def generate_one(self, yaml_path: Path) -> None:
         """ Generate and compile an EA for a single YAML configuration file.
@@ -59,12 +94,11 @@ class GenerateEA:
             logger.warning("Failed to generate .mq5 file for %s", yaml_path.name)
             return
 
-        compile_ea(mq5_path)
-        ex5_path = mq5_path.with_suffix(".ex5")
-        if not ex5_path.exists():
+        if not compile_ea(mq5_path).success:
             logger.warning("Compilation failed for .mq5 file: %s", mq5_path.name)
             return
 
+    @traced("render")
     def _generate_mq5(self, yaml_path: Path) -> Path:
         """ Render and write the MQ5 source file for a single indicator YAML configuration.
 
@@ -74,21 +108,66 @@ class GenerateEA:
         param yaml_path: Path to the YAML config file.
         return: Path to the generated `.mq5` source file.
         """
+        annotate(stage=self.stage_config.name, indicator=yaml_path.stem)
         indicator_name, indicator_data = load_indicator_data(yaml_path)
 
         render_func = load_render_func(self.stage_config.render_func)
+        render_kwargs = self._upstream_kwargs(render_func)
+
+        # Build the sample table once: the renderer embeds this table and the same one is written beside the EA
+        samples = None
+        if _accepts(render_func, "samples"):
+            samples = stage_sample_table(self.project_config, self.stage_config.name, indicator_data)
+            render_kwargs["samples"] = samples
+
         rendered_ea = render_func(
             project_config=self.project_config,
             stage_config=self.stage_config,
             indi_name=indicator_name,
             indi_data=indicator_data,
+            **render_kwargs,
         )
         output_file = self.ea_output_dir / f"{yaml_path.stem}.mq5"
+        self._write_sample_table(yaml_path.stem, samples, rendered_ea)
+
+        # Leave an unchanged source untouched so its timestamp (and compiled .ex5) stay valid
+        if output_file.exists() and output_file.read_text() == rendered_ea:
+            logger.debug("Rendered source unchanged: %s", output_file.name)
+            return output_file
+
         with open(output_file, "w") as f:
             f.write(rendered_ea)
 
         return output_file
 
+    def _upstream_kwargs(self, render_func) -> dict:
+        """ Share the run's upstream stage cache with render functions that accept it (an `upstream` parameter).
+
+        param render_func: The stage's render function
+        return: {"upstream": UpstreamContext} or an empty dict for render functions without the parameter
+        """
+        if _accepts(render_func, "upstream"):
+            return {"upstream": self.upstream}
+        return {}
+
+    def _write_sample_table(self, name: str, table: pd.DataFrame | None, rendered_ea: str) -> None:
+        """ Keep a copy of the sample table embedded by the renderer, so .ini files and reports can map
+        inp_sample_idx back to parameter values. A stale table is removed if the EA uses the regular grid.
+
+        param name: EA name (YAML stem)
+        param table: The sample table passed to the renderer, or None
+        param rendered_ea: The rendered MQ5 source
+        """
+        if table is not None and SAMPLE_IDX_INPUT not in rendered_ea:
+            logger.warning("Sampling is enabled for %s but its renderer embeds no sample table; using the grid",
+                           self.stage_config.name)
+            table = None
+        elif table is None and SAMPLE_IDX_INPUT in rendered_ea:
+            logger.warning("The %s renderer builds its own sample table; accept a `samples` parameter so a copy of "
+                           "it can be written", self.stage_config.name)
+
+        write_sample_table(table, self.ea_output_dir, name)
+
     def _resolve_indicator_dir(self) -> Path:
         """ Resolve the full filesystem path to the indicator directory for this stage.
 
@@ -102,3 +181,14 @@ class GenerateEA:
             raise ValueError(f"Stage {self.stage_config.name} must define indi_dir.")
 
         return self.paths["INDICATOR_DIR"] / self.stage_config.indi_dir
+
+
+def _accepts(render_func, name: str) -> bool:
+    """ Check whether a render function takes a keyword argument, by name or through **kwargs.
+
+    param render_func: The stage's render function
+    param name: Keyword argument name
+    return: True if `name` can be passed to the render function
+    """
+    params = inspect.signature(render_func).parameters
+    return name in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
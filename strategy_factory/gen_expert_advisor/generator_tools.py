@@ -1,9 +1,10 @@
 import logging
-import yaml
 import importlib
 from pathlib import Path
 from jinja2 import Template
 
+from strategy_factory.utils.indicator_catalog import get_indicator_catalog
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,9 +47,8 @@ def load_indicator_data(indicator_yaml_file: Path) -> tuple[str, dict]:
     return: A tuple (indicator_name, data), where indicator_name is a string and data is a dict of its configuration.
     raises: ValueError if the YAML file does not contain exactly one indicator.
     """
-    # Open the YAML file and parse its contents.
-    with open(indicator_yaml_file, "r") as f:
-        config = yaml.safe_load(f)
+    # Parsed once per file and served from the indicator catalogue afterwards.
+    config = get_indicator_catalog().document(indicator_yaml_file)
 
     # Ensure the loaded config is a dict with exactly one top-level key.
     if not isinstance(config, dict) or len(config) != 1:
@@ -1 +1,2 @@
 from .ini_generator import create_ini
+from .zoom_ranges import zoom_param_ranges
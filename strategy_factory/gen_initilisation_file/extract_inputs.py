@@ -1,7 +1,8 @@
 import logging
-import yaml
 from pathlib import Path
 
+from strategy_factory.utils.indicator_catalog import get_indicator_catalog
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,8 +27,7 @@ def extract_inputs_from_input_yaml(yaml_path: Path, expected_key: str) -> dict:
     if not yaml_path.exists():
         raise FileNotFoundError(f"YAML file not found: {yaml_path}")
 
-    with open(yaml_path, 'r') as f:
-        data = yaml.safe_load(f)
+    data = get_indicator_catalog().document(yaml_path)
 
     top_key = next(iter(data))
     if top_key.lower() != expected_key.lower():
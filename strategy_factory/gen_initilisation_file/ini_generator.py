@@ -1,18 +1,29 @@
+from __future__ import annotations
+
 import configparser
 import logging
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
+
+import pandas as pd
 
-from strategy_factory.utils import load_paths, ProjectConfig
-from strategy_factory.stage_execution.stage_config import StageConfig
+from strategy_factory.utils import load_paths, ProjectConfig, traced
+from strategy_factory.utils.sample_table import SAMPLE_IDX_INPUT, load_sample_table
 from .extract_inputs import extract_inputs_from_input_yaml
-from .scale_parameters import scale_parameters
+from .parameter_space import ParameterSpace
+
+if TYPE_CHECKING:
+    # stage_execution imports this package, so StageConfig is only needed for annotations
+    from strategy_factory.stage_execution.stage_config import StageConfig
 
 logger = logging.getLogger(__name__)
 
 
+@traced("ini")
 def create_ini(indi_name: str, ea_output_dir: Path, project_config: ProjectConfig, ini_files_dir: Path,
-               in_sample: bool, stage_config: StageConfig, optimised_params: Optional[Dict[str, str]] = None):
+               in_sample: bool, stage_config: StageConfig, optimised_params: Optional[Dict[str, str]] = None,
+               model: Optional[int] = None, max_iterations: Optional[int] = None,
+               param_ranges: Optional[Dict[str, dict]] = None):
     """ Generate a .ini file for a given indicator if the corresponding .yaml and .ex5 files exist.
 
     param indi_name: Name of the indicator.
@@ -22,6 +33,10 @@ def create_ini(indi_name: str, ea_output_dir: Path, project_config: ProjectConfi
     param in_sample: True if generating for in-sample testing, else False.
     param stage_config: Stage-specific configuration object.
     param optimised_params: Optional dictionary of parameter overrides.
+    param model: Optional MT5 tick model override (e.g. for a tiered run). Defaults to the stage's opt_settings model.
+    param max_iterations: Optional grid budget override (e.g. a successive-halving round). Defaults to the stage's
+                          opt_settings max_iterations.
+    param param_ranges: Optional {input_name: {"min": ..., "max": ...}} narrowing the YAML ranges (e.g. a zoom round).
     return: Path to the generated .ini file, or None if prerequisites are missing.
     """
     paths = load_paths()
@@ -43,13 +58,16 @@ def create_ini(indi_name: str, ea_output_dir: Path, project_config: ProjectConfi
         return None
 
     ini_file_path = _write_ini_file(project_config, ex5_path, ini_files_dir, inputs, in_sample, stage_config,
-                                    optimised_params)
+                                    optimised_params, model, max_iterations, param_ranges,
+                                    load_sample_table(ea_output_dir, indi_name))
     return ini_file_path
 
 
 def _write_ini_file(project_config: ProjectConfig, expert_path: Path, ini_dir: Path, inputs: dict,
                     in_sample: bool, stage_config: StageConfig,
-                    optimised_params: Optional[Dict[str, str]]) -> Path:
+                    optimised_params: Optional[Dict[str, str]], model: Optional[int] = None,
+                    max_iterations: Optional[int] = None, param_ranges: Optional[Dict[str, dict]] = None,
+                    sample_table: Optional[pd.DataFrame] = None) -> Path:
     """ Write a .ini file for MetaTrader 5 backtesting/optimisation.
 
     param project_config: Project configuration object.
@@ -59,6 +77,10 @@ def _write_ini_file(project_config: ProjectConfig, expert_path: Path, ini_dir: P
     param in_sample: True if generating for in-sample testing.
     param stage_config: Stage-specific configuration object.
     param optimised_params: Optional dictionary of parameter overrides.
+    param model: Optional MT5 tick model override.
+    param max_iterations: Optional grid budget override.
+    param param_ranges: Optional per-input min/max overrides.
+    param sample_table: Optional sample table embedded in the EA (see `stage_sample_table`).
     return: Path to the written .ini file.
     """
     cfg = configparser.ConfigParser()
@@ -70,8 +92,9 @@ def _write_ini_file(project_config: ProjectConfig, expert_path: Path, ini_dir: P
 
     expert_rel_path = get_rel_expert_path(expert_path, load_paths()["MT5_EXPERT_DIR"])
 
-    cfg["Tester"] = _build_tester_section(project_config, expert_rel_path, report_name, stage_config)
-    cfg["TesterInputs"] = _build_tester_inputs(project_config, inputs, in_sample, optimised_params, stage_config)
+    cfg["Tester"] = _build_tester_section(project_config, expert_rel_path, report_name, stage_config, model)
+    cfg["TesterInputs"] = _build_tester_inputs(project_config, inputs, in_sample, optimised_params, stage_config,
+                                               max_iterations, param_ranges, sample_table)
 
     ini_file_path = ini_dir / f"{indi_name}_{sample_type}.ini"
     ini_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -84,25 +107,28 @@ def _write_ini_file(project_config: ProjectConfig, expert_path: Path, ini_dir: P
 
 
 def _build_tester_section(project_config: ProjectConfig, expert_path: str,
-                          report_name: str, stage_config: StageConfig) -> dict:
+                          report_name: str, stage_config: StageConfig, model: Optional[int] = None) -> dict:
     """ Construct the [Tester] section for the .ini file.
 
     param project_config: Project configuration object.
     param expert_path: Relative path to the expert .ex5 file.
     param report_name: Name to be used for the optimisation report.
     param stage_config: Stage-specific configuration object.
+    param model: Optional MT5 tick model. Defaults to the stage's opt_settings model (1 = 1-minute OHLC).
     return: Dictionary for the [Tester] section.
     """
     opt_criterion, _, _, _, _ = _get_stage_config_criteria(project_config, stage_config.name)
+    if model is None:
+        model = getattr(project_config.opt_settings[stage_config.name], "model", 1)
 
     return {
         "Expert": expert_path,
         "Symbol": project_config.main_chart_symbol,
         "Period": project_config.period,
-        "Model": "1",
+        "Model": str(model),
         "FromDate": project_config.start_date,
         "ToDate": project_config.end_date,
-        "ForwardMode": "0",
+        **_forward_settings(project_config),
         "Deposit": project_config.deposit,
         "Currency": project_config.currency,
         "ProfitInPips": "0",
@@ -117,9 +143,26 @@ def _build_tester_section(project_config: ProjectConfig, expert_path: str,
     }
 
 
+def _forward_settings(project_config: ProjectConfig) -> dict:
+    """ Return the ForwardMode/ForwardDate entries of the [Tester] section.
+
+    With data_split 'forward' the terminal runs the optimisation up to ForwardDate and re-tests every pass on the rest
+    of the period in the same launch (ForwardMode 4 = custom date), writing a companion <Report>.forward.xml.
+
+    param project_config: Project configuration object.
+    return: Dictionary with the forward-testing keys.
+    """
+    if project_config.data_split == "forward":
+        return {"ForwardMode": "4", "ForwardDate": project_config.forward_date}
+
+    return {"ForwardMode": "0"}
+
+
 def _build_tester_inputs(project_config: ProjectConfig, inputs: dict, in_sample: bool,
                          optimised_params: Optional[Dict[str, str]],
-                         stage_config: StageConfig) -> dict:
+                         stage_config: StageConfig, max_iterations: Optional[int] = None,
+                         param_ranges: Optional[Dict[str, dict]] = None,
+                         sample_table: Optional[pd.DataFrame] = None) -> dict:
     """ Construct the [TesterInputs] section for the .ini file.
 
     Combines static inputs (e.g., SL/TP, risk, criteria) and dynamic strategy parameters,
@@ -130,9 +173,15 @@ def _build_tester_inputs(project_config: ProjectConfig, inputs: dict, in_sample:
     param in_sample: True if in-sample, else False.
     param optimised_params: Optional dictionary of parameter overrides.
     param stage_config: Stage-specific configuration object.
+    param max_iterations: Optional grid budget override. Defaults to the stage's max_iterations.
+    param param_ranges: Optional {input_name: {"min": ..., "max": ...}} applied to the YAML ranges before scaling.
+    param sample_table: Optional sample table embedded in the EA. Its inputs are replaced by inp_sample_idx, which is
+                        optimised over the first max_iterations rows in-sample and fixed to the optimised row OOS.
     return: Dictionary for the [TesterInputs] section.
     """
     _, criteria, min_trade, max_its, max_per_param = _get_stage_config_criteria(project_config, stage_config.name)
+    if max_iterations is not None:
+        max_its = max_iterations
 
     # ---------------------------------------------------------------------
     # STATIC TESTER INPUTS
@@ -154,28 +203,39 @@ def _build_tester_inputs(project_config: ProjectConfig, inputs: dict, in_sample:
     # - If out-of-sample (OOS), we must also force optimisation (Y) regardless of input flags.
     # - Otherwise, in-sample with at least one opt param; no need to force optimisation.
 
-    force_optimisation = not any(param.get("optimise", True) for param in inputs.values())
+    force_optimisation = sample_table is None and not any(param.get("optimise", True) for param in inputs.values())
 
     if force_optimisation or not in_sample:
         tester_inputs["inp_force_opt"] = "1||1||1||2||Y"
     else:
         tester_inputs["inp_force_opt"] = "1||1||1||2||N"
 
+    # ---------------------------------------------------------------------
+    # SAMPLE TABLE INDEX (REPLACES THE GRID OF THE SAMPLED INPUTS)
+    sampled = set()
+    if sample_table is not None:
+        sampled = {name.lower() for name in sample_table.columns}
+        tester_inputs[SAMPLE_IDX_INPUT] = _sample_idx_input(len(sample_table), max_its, in_sample, optimised_params)
+
     # ---------------------------------------------------------------------
     # DYNAMIC PARAMETERS (FROM YAML / OVERRIDES)
-    scaled_params = scale_parameters(inputs, max_its, max_per_param)
-    for name, param in scaled_params:
+    if param_ranges:
+        inputs = _apply_param_ranges(inputs, param_ranges)
+
+    grid_inputs = {name: param for name, param in inputs.items() if name.lower() not in sampled}
+    grid = ParameterSpace.from_inputs(grid_inputs).solve_steps(max_its, max_per_param).tester_inputs()
+    for name, param in inputs.items():
         name_lc = name.lower()
 
-        if optimised_params and name_lc in optimised_params:
+        if name_lc in sampled:
+            continue
+
+        elif optimised_params and name_lc in optimised_params:
             value = optimised_params[name_lc]
             tester_inputs[name] = f"{value}||0||0||1||N"
 
-        elif param.get("optimise", True) and in_sample:
-            min_val = param.get("min", param["default"])
-            max_val = param.get("max", param["default"])
-            step = param.get("step", 1)
-            tester_inputs[name] = f"{param['default']}||{min_val}||{step}||{max_val}||Y"
+        elif name in grid and in_sample:
+            tester_inputs[name] = grid[name]
 
         else:
             tester_inputs[name] = f"{param['default']}||0||0||1||N"
@@ -183,10 +243,40 @@ def _build_tester_inputs(project_config: ProjectConfig, inputs: dict, in_sample:
     return tester_inputs
 
 
+def _sample_idx_input(n_samples: int, max_its: int, in_sample: bool,
+                      optimised_params: Optional[Dict[str, str]]) -> str:
+    """ Return the inp_sample_idx entry: optimised over the first max_its rows IS, fixed to the optimised row OOS. """
+    if in_sample:
+        return f"0||0||1||{max(1, min(n_samples, max_its)) - 1}||Y"
+
+    value = int(float((optimised_params or {}).get(SAMPLE_IDX_INPUT, 0)))
+    return f"{value}||0||0||1||N"
+
+
+def _apply_param_ranges(inputs: dict, param_ranges: Dict[str, dict]) -> dict:
+    """ Narrow the min/max of the given inputs, keeping the YAML step and moving the default inside the new range.
+
+    param inputs: Dictionary of inputs loaded from YAML.
+    param param_ranges: {input_name: {"min": ..., "max": ...}}, matched case-insensitively.
+    return: A new inputs dictionary.
+    """
+    ranges = {name.lower(): bounds for name, bounds in param_ranges.items()}
+    narrowed = {}
+    for name, param in inputs.items():
+        bounds = ranges.get(name.lower())
+        if bounds:
+            param = {**param, **bounds}
+            default = min(max(param["default"], param["min"]), param["max"])
+            param["default"] = int(round(default)) if isinstance(param["default"], int) else default
+        narrowed[name] = param
+    return narrowed
+
+
 def _get_split_code(split_type: str, in_sample: bool) -> str:
     """ Return encoded string for inp_data_split_method.
 
-    param split_type: 'year', 'month', or 'none'.
+    param split_type: 'year', 'month', 'forward' or 'none'. With 'forward' the terminal splits the data, so the EA
+                      runs on the full period.
     param in_sample: Whether the run is in-sample or OOS.
     return: MT5-formatted input string.
     """
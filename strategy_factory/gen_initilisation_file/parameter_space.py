@@ -0,0 +1,208 @@
+import logging
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Tolerance for float steps that should land exactly on max
+_EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class ParameterSpace:
+    """ Array-backed min/step/max grid of the optimised inputs of an indicator, as walked by MT5.
+
+    MT5 tests start, start + step, ... up to the last value <= stop on every optimised input and runs one pass per
+    combination, so the pass count of a space is the exact product of its per-axis counts.
+
+    Axes marked `scale: log` in the YAML (e.g. periods) are spread geometrically by `values` and `grid`. MT5 can only
+    walk linear min/step/max grids, so an indicator with log axes is optimised over a table of its `grid` instead (see
+    `stage_sample_table`).
+
+    param names: Input names, in YAML order
+    param defaults: Default value of each input
+    param lo: Start of each axis
+    param hi: Stop of each axis
+    param step: Step of each axis (the YAML step is the finest step the space is scaled to)
+    param is_int: True for integer inputs
+    param log: True for log-spaced axes
+    """
+    names: tuple
+    defaults: tuple
+    lo: np.ndarray
+    hi: np.ndarray
+    step: np.ndarray
+    is_int: np.ndarray
+    log: np.ndarray
+
+    @classmethod
+    def from_inputs(cls, inputs: dict) -> "ParameterSpace":
+        """ Build the space of the optimised inputs of an indicator (see `extract_inputs_from_input_yaml`).
+
+        param inputs: Dict of {input_name: {default, min, max, step, optimise, type, scale}}
+        return: ParameterSpace with one axis per input with optimise: true (the default)
+        """
+        axes = {name: param for name, param in inputs.items() if param.get("optimise", True)}
+        lo = np.array([float(p.get("min", p["default"])) for p in axes.values()], dtype=float)
+        hi = np.array([float(p.get("max", p["default"])) for p in axes.values()], dtype=float)
+        step = np.array([float(p.get("step", 1)) for p in axes.values()], dtype=float)
+
+        return cls(
+            names=tuple(axes),
+            defaults=tuple(p["default"] for p in axes.values()),
+            lo=lo,
+            hi=np.maximum(hi, lo),
+            step=np.where(step > 0, step, 1.0),
+            is_int=np.array([p.get("type", "float") == "int" for p in axes.values()], dtype=bool),
+            log=np.array([p.get("scale") == "log" for p in axes.values()], dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def span(self) -> np.ndarray:
+        return self.hi - self.lo
+
+    def counts(self, step: np.ndarray = None) -> np.ndarray:
+        """ Number of values MT5 tests on each axis for the given (or the current) steps. """
+        step = self.step if step is None else step
+        return np.floor(self.span / step + _EPS).astype(np.int64) + 1
+
+    def pass_count(self, step: np.ndarray = None) -> int:
+        """ Exact number of MT5 passes of the full grid (an arbitrary-precision int, so large spaces don't overflow). """
+        return math.prod(int(c) for c in self.counts(step))
+
+    def with_steps(self, step: np.ndarray) -> "ParameterSpace":
+        """ Return a copy of the space with new steps; axes scaled down to a single value collapse onto the default. """
+        step = np.asarray(step, dtype=float)
+        single = self.counts(step) <= 1
+        if not single.any():
+            return replace(self, step=step)
+
+        default = np.clip(np.array(self.defaults, dtype=float), self.lo, self.hi)
+        return replace(self, lo=np.where(single, default, self.lo), hi=np.where(single, default, self.hi),
+                       step=np.where(single, self.step, step))
+
+    def steps_for_counts(self, counts: np.ndarray) -> np.ndarray:
+        """ Steps giving the largest number of values per axis that does not exceed the requested counts. """
+        counts = np.maximum(np.asarray(counts, dtype=float), 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw = np.where(counts > 1, self.span / (counts - 1), self.span + self.step)
+        raw = np.where(self.span > 0, raw, self.step)
+
+        # Integer steps: the floored step gives the most values, unless that overshoots the count
+        floor = np.maximum(1, np.floor(raw + _EPS))
+        int_step = np.where(self.counts(floor) <= counts, floor, np.ceil(raw - _EPS))
+        return np.where(self.is_int, int_step, raw)
+
+    def _finer_steps(self, counts: np.ndarray) -> np.ndarray:
+        """ The coarsest steps that give more values than the current counts on each axis. """
+        raw = self.span / np.maximum(counts, 1)
+        return np.where(self.is_int, np.maximum(1, np.floor(raw + _EPS)), raw)
+
+    def solve_steps(self, budget: int, per_param: bool = False, allow_refine: bool = False) -> "ParameterSpace":
+        """ Scale the steps so the grid holds as many passes as possible without exceeding the budget.
+
+        Axes keep the same relative resolution: every axis is thinned by the same factor first, then single axes are
+        refined greedily (least resolved first) while the exact pass count stays within the budget.
+
+        param budget: Max passes (of the full grid, or of each axis if per_param)
+        param per_param: Apply the budget to each axis individually
+        param allow_refine: Allow steps finer than the YAML step (otherwise a grid under budget is left as is)
+        return: The scaled ParameterSpace
+        """
+        budget = max(1, int(budget))
+        native = self.counts()
+        if not len(self) or (not allow_refine and (per_param and (native <= budget).all()
+                                                   or not per_param and self.pass_count() <= budget)):
+            return self
+
+        cap = np.full(len(self), np.inf) if allow_refine else native.astype(float)
+
+        if per_param:
+            return self.with_steps(self.steps_for_counts(np.minimum(cap, budget)))
+
+        factor = (np.prod(native.astype(float)) / budget) ** (1 / len(self))
+        target = np.clip(np.floor(native / factor), 1, cap)
+        step = self.steps_for_counts(target)
+        while self.pass_count(step) > budget:
+            # Int rounding can still overshoot: drop a value from the most resolved axis
+            counts = self.counts(step)
+            axis = int(np.argmax(np.where(counts > 1, counts / native, -1)))
+            step = step.copy()
+            step[axis] = self.steps_for_counts(np.where(np.arange(len(self)) == axis, counts - 1, counts))[axis]
+
+        improved = True
+        while improved:
+            improved = False
+            counts = self.counts(step)
+            finer = self._finer_steps(counts)
+            for axis in np.argsort(counts / native, kind="stable"):
+                candidate = step.copy()
+                candidate[axis] = finer[axis]
+                new_count = self.counts(candidate)[axis]
+                if counts[axis] < new_count <= cap[axis] and self.pass_count(candidate) <= budget:
+                    step, improved = candidate, True
+                    break
+
+        return self.with_steps(step)
+
+    def values(self, name: str) -> np.ndarray:
+        """ Values of one axis: its linear grid, or for a log axis the same number of geometrically spaced values. """
+        i = self.names.index(name)
+        count = int(self.counts()[i])
+        if self.log[i] and self.lo[i] > 0 and count > 1:
+            values = np.geomspace(self.lo[i], self.hi[i], count)
+        else:
+            values = self.lo[i] + np.arange(count) * self.step[i]
+        return np.unique(np.round(values)) if self.is_int[i] else values
+
+    def grid(self) -> np.ndarray:
+        """ Every combination of the axis `values`, one row per pass, with log axes spread geometrically.
+
+        return: Array of shape (passes, axes); at most `pass_count()` rows (int log axes can lose duplicate values)
+        """
+        if not len(self):
+            return np.empty((1, 0))
+        mesh = np.meshgrid(*(self.values(name) for name in self.names), indexing="ij")
+        return np.stack([axis.ravel() for axis in mesh], axis=1)
+
+    def tester_inputs(self) -> dict[str, str]:
+        """ Emit the [TesterInputs] entries (default||min||step||max||Y) of every axis.
+
+        A log axis can only be emitted as a linear grid with the same number of values; that happens only for an EA
+        without a sample table (whose renderer does not support one), and is logged.
+        """
+        if self.log.any():
+            logger.warning(f"No sample table for log-spaced inputs, walking them linearly: "
+                           f"{[name for name, log in zip(self.names, self.log) if log]}")
+        entries = {}
+        counts = self.counts()
+        for i, name in enumerate(self.names):
+            lo, step, hi = (self._fmt(v, self.is_int[i]) for v in (self.lo[i], self.step[i], self.hi[i]))
+            if counts[i] <= 1:
+                entries[name] = f"{lo}||0||0||1||N"
+            else:
+                entries[name] = f"{self.defaults[i]}||{lo}||{step}||{hi}||Y"
+        return entries
+
+    def to_params(self) -> dict[str, dict]:
+        """ Return the axes as {name: {default, min, max, step, optimise, type}} input definitions. """
+        return {
+            name: {
+                "default": self.defaults[i],
+                "min": float(self.lo[i]),
+                "max": float(self.hi[i]),
+                "step": int(self.step[i]) if self.is_int[i] else float(self.step[i]),
+                "optimise": True,
+                "type": "int" if self.is_int[i] else "float",
+            }
+            for i, name in enumerate(self.names)
+        }
+
+    @staticmethod
+    def _fmt(value: float, is_int: bool) -> str:
+        return str(int(round(value))) if is_int else repr(round(float(value), 10))
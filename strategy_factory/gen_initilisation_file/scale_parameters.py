@@ -1,79 +1,25 @@
 import logging
 
+from .parameter_space import ParameterSpace
+
 logger = logging.getLogger(__name__)
 
 
-def scale_parameters(param_dict: dict, max_total_iterations: int, per_param: bool = False, even_spacing: bool = True,
+def scale_parameters(param_dict: dict, max_total_iterations: int, per_param: bool = False,
                      allow_step_reduction: bool = False):
     """ Scale input parameter ranges to keep total combinations under a max limit.
 
+    Thin wrapper around `ParameterSpace.solve_steps`, which counts the MT5 passes exactly after int rounding.
+
     param param_dict: Dict of {param_name: {default, min, max, step, optimise, type}}
     param max_total_iterations: Max combinations (total or per parameter, depending on per_param)
     param per_param: If True, applies the limit to each param individually, else to the full grid
-    param even_spacing: If True, always space parameter values evenly (like linspace); else, use legal steps as much as possible
+    param allow_step_reduction: If True, also refine steps below the YAML step to use the full budget
     return: List of (param_name, scaled_param_dict)
     """
-    from functools import reduce
-    from operator import mul
-
-    optimisable = []
-    for name, param in param_dict.items():
-        if not param.get("optimise", True):
-            continue
-        start = float(param.get("min", param["default"]))
-        end = float(param.get("max", param["default"]))
-        step = float(param.get("step", 1))
-        dtype = param.get("type", "float")
-        count = max(1, int(round((end - start) / step)) + 1)
-        optimisable.append(
-            {
-                "name": name,
-                "start": start,
-                "end": end,
-                "step": step,
-                "default": param["default"],
-                "count": count,
-                "type": dtype
-            }
-        )
-
-    if per_param:
-        for p in optimisable:
-            if p["count"] > max_total_iterations or allow_step_reduction:
-                N = min(p["count"], int(max_total_iterations)) if not allow_step_reduction else int(
-                    max_total_iterations)
-                span = p["end"] - p["start"]
-
-                if even_spacing:
-                    raw_step = span / (N - 1) if N > 1 else span
-                    p["step"] = max(1, int(round(raw_step))) if p["type"] == "int" else raw_step
-                else:
-                    raw_step = span / (N - 1) if N > 1 else span
-                    p["step"] = max(1, int(round(raw_step))) if p["type"] == "int" else raw_step
-    else:
-        total = reduce(mul, (p["count"] for p in optimisable), 1)
-        if total > max_total_iterations or allow_step_reduction:
-            scale_factor = (total / max_total_iterations) ** (1 / len(optimisable))
-            for p in optimisable:
-                new_count = p["count"] / scale_factor if scale_factor != 0 else 1
-                span = p["end"] - p["start"]
-                raw_step = span / new_count if new_count > 1 else span
-                p["step"] = max(1, int(round(raw_step))) if p["type"] == "int" else raw_step
-
-    result = []
-    for name, param in param_dict.items():
-        if param.get("optimise", True):
-            match = next(p for p in optimisable if p["name"] == name)
-            param = {
-                "default": param["default"],
-                "min": match["start"],
-                "max": match["end"],
-                "step": match["step"],
-                "optimise": True,
-                "type": match["type"]
-            }
-        result.append((name, param))
-    return result
+    space = ParameterSpace.from_inputs(param_dict).solve_steps(max_total_iterations, per_param, allow_step_reduction)
+    scaled = space.to_params()
+    return [(name, scaled.get(name, param)) for name, param in param_dict.items()]
 
 
 def print_param_grid(param):
@@ -104,20 +50,14 @@ if __name__ == "__main__":
         "inp_force_opt": {"default": 1, "min": 1, "max": 2, "step": 1, "optimise": True, "type": "int"}
     }
 
-    print("=== Per param, at most 5 values, even spacing, respecting type ===")
-    result = scale_parameters(ini_lines, max_total_iterations=5, per_param=True, even_spacing=True)
-    for name, param in result:
-        print(name, param)
-        print_param_grid(param)
-
-    print("\n=== Per param, at most 5 values, original step multiples ===")
-    result = scale_parameters(ini_lines, max_total_iterations=5, per_param=True, even_spacing=False)
+    print("=== Per param, at most 5 values, respecting type ===")
+    result = scale_parameters(ini_lines, max_total_iterations=5, per_param=True)
     for name, param in result:
         print(name, param)
         print_param_grid(param)
 
-    print("\n=== Cap full grid (product) at 10 total combinations, even spacing ===")
-    result = scale_parameters(ini_lines, max_total_iterations=10, per_param=False, even_spacing=True)
+    print("\n=== Cap full grid (product) at 10 total combinations ===")
+    result = scale_parameters(ini_lines, max_total_iterations=10, per_param=False)
     for name, param in result:
         print(name, param)
         print_param_grid(param)
@@ -0,0 +1,80 @@
+import configparser
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def read_optimised_ranges(ini_path: Path) -> dict[str, tuple[float, float, float]]:
+    """ Read the grid of every indicator input from a .ini file's [TesterInputs] section.
+
+    An optimised input (flag Y) gives its grid. A fixed numeric input (flag N), e.g. an axis that the grid budget
+    collapsed to a single value, is returned pinned to its value with a zero step.
+
+    param ini_path: Path to the UTF-16 .ini file
+    return: Dict of {input_name: (min, step, max)}
+    """
+    cfg = configparser.ConfigParser()
+    cfg.optionxform = str
+    cfg.read(ini_path, encoding="utf-16")
+
+    ranges = {}
+    for name, value in cfg["TesterInputs"].items():
+        fields = value.split("||")
+        if len(fields) != 5 or name.startswith("inp_"):
+            continue
+        if fields[4] == "Y":
+            ranges[name] = (float(fields[1]), float(fields[2]), float(fields[3]))
+            continue
+        try:
+            pinned = float(fields[0])
+        except ValueError:
+            continue  # Strings and other non-numeric inputs keep their YAML default
+        ranges[name] = (pinned, 0.0, pinned)
+    return ranges
+
+
+def zoom_param_ranges(ini_path: Path, is_csv: Path, top_n: int = 5) -> dict[str, dict]:
+    """ Narrow the grid of an IS pass around its best passes for the next zoom round.
+
+    The new box of each optimised input spans the values of the top_n passes, padded by one step of the previous grid
+    on each side and clamped to the previous range. The step is left to `ParameterSpace.solve_steps`, which spreads the
+    stage's grid budget over the smaller box, so every round refines the grid down to the YAML step. An input the
+    previous pass held fixed stays pinned to its value, so a later round cannot widen it back to its YAML range.
+
+    param ini_path: The .ini file of the pass that was run
+    param is_csv: The converted report of that pass (<indi>_IS.csv)
+    param top_n: Number of best passes that define the new box
+    return: Dict of {input_name: {"min": ..., "max": ...}} for `create_ini(param_ranges=...)`, empty if no optimised
+            input could be zoomed
+    """
+    ranges = read_optimised_ranges(ini_path)
+    df = pd.read_csv(is_csv)
+    if df.empty or not ranges:
+        return {}
+
+    if "Result" in df.columns:
+        df = df.sort_values("Result", ascending=False)
+    top = df.head(top_n)
+    columns = {c.lower(): c for c in top.columns}
+
+    zoomed, pinned = {}, {}
+    for name, (lo, step, hi) in ranges.items():
+        if step == 0:
+            pinned[name] = {"min": lo, "max": hi}
+            continue
+
+        column = columns.get(name.lower())
+        if column is None:
+            logger.warning(f"[zoom] {name} not found in {is_csv.name}; keeping its range")
+            continue
+
+        values = pd.to_numeric(top[column], errors="coerce").dropna()
+        if values.empty:
+            continue
+
+        zoomed[name] = {"min": max(lo, float(values.min()) - step), "max": min(hi, float(values.max()) + step)}
+
+    return {**zoomed, **pinned} if zoomed else {}
@@ -2,13 +2,11 @@ from strategy_factory.stage_execution.stage_config import StageConfig
 from strategy_factory.utils import ProjectConfig
 
 from strategy_factory.renderer_tools import build_input_lines
-from strategy_factory.renderer_tools import load_results_data
-from strategy_factory.stage_execution.stage_config import get_stage_config
-from strategy_factory.utils import load_all_pipeline_stages
+from strategy_factory.renderer_tools import UpstreamContext
 
 
 def render_conformation(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str,
-                        indi_data: dict) -> str:
+                        indi_data: dict, upstream: UpstreamContext = None) -> str:
     """Render MQL5 code for the Conformation stage using the provided indicator config.
 
     Parameters:
@@ -16,11 +14,12 @@ def render_conformation(project_config: ProjectConfig, stage_config: StageConfig
     - stage_config: Configuration object for the current pipeline stage.
     - indi_name: Name of the indicator being used as the confirmation filter.
     - indi_data: Parsed YAML data for the indicator, including inputs and logic.
+    - upstream: Per-run cache of the upstream stage results (created if None).
 
     Returns:
     - A rendered MQL5 source code string for use in EA generation.
     """
-    stages = load_all_pipeline_stages(project_config.pipeline)
+    upstream = upstream or UpstreamContext(project_config)
 
     # Load confirmation indicator data
     conf_logic_inputs = indi_data.get("logic_inputs", {})
@@ -30,8 +29,7 @@ def render_conformation(project_config: ProjectConfig, stage_config: StageConfig
     conf_buffers = indi_data.get("buffers") or []
 
     # Load trigger stage result (fixed)
-    trigger_stage = get_stage_config(stages, "Trigger")
-    trigger_name, trigger_data = load_results_data(project_config.run_name, trigger_stage)
+    trigger_name, trigger_data = upstream.results("Trigger")
 
     trigger_logic_inputs = trigger_data.get("logic_inputs", {})
     trigger_logic_inputs_vars = list(trigger_logic_inputs.keys())
@@ -1,13 +1,15 @@
+import pandas as pd
+
 from strategy_factory.stage_execution.stage_config import StageConfig
 from strategy_factory.utils import ProjectConfig
 
-from strategy_factory.renderer_tools import build_input_lines
-from strategy_factory.renderer_tools import load_results_data
-from strategy_factory.stage_execution.stage_config import get_stage_config
-from strategy_factory.utils import load_all_pipeline_stages
+from strategy_factory.renderer_tools import build_input_lines, build_sample_lines
+from strategy_factory.renderer_tools import UpstreamContext
+from strategy_factory.utils.sample_table import stage_sample_table
 
 
-def render_trendline(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict) -> str:
+def render_trendline(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict,
+                     upstream: UpstreamContext = None, samples: pd.DataFrame = None) -> str:
     """Render function for the trendline stage.
 
     Parameters:
@@ -15,26 +17,31 @@ def render_trendline(project_config: ProjectConfig, stage_config: StageConfig, i
     - stage_config: StageConfig instance for the current pipeline stage.
     - indi_name: Name of the trendline indicator.
     - indi_data: Dictionary parsed from YAML config.
+    - upstream: Per-run cache of the upstream stage results (created if None).
+    - samples: Sample table to embed (built from the stage config if None).
 
     Returns:
     - Rendered MQL5 code as string.
     """
-    stages = load_all_pipeline_stages(project_config.pipeline)
+    upstream = upstream or UpstreamContext(project_config)
 
     # Load confirmation stage result
-    conformation_stage = get_stage_config(stages, "Conformation")
-    conf_name, conf_data = load_results_data(project_config.run_name, conformation_stage)
+    conf_name, conf_data = upstream.results("Conformation")
     conf_logic_inputs = conf_data.get("logic_inputs", {})
     conf_logic_inputs_vars = list(conf_logic_inputs.keys())
     conf_logic_inputs_defaults = [conf_logic_inputs[k]["default"] for k in conf_logic_inputs_vars]
 
     # Load trigger stage result
-    trigger_stage = get_stage_config(stages, "Trigger")
-    trigger_name, trigger_data = load_results_data(project_config.run_name, trigger_stage)
+    trigger_name, trigger_data = upstream.results("Trigger")
     trigger_logic_inputs = trigger_data.get("logic_inputs", {})
     trigger_logic_inputs_vars = list(trigger_logic_inputs.keys())
     trigger_logic_inputs_defaults = [trigger_logic_inputs[k]["default"] for k in trigger_logic_inputs_vars]
 
+    # Optional sample table: the optimiser walks inp_sample_idx instead of a min/step/max grid
+    if samples is None:
+        samples = stage_sample_table(project_config, stage_config.name, indi_data)
+    sampled_inputs = list(samples.columns) if samples is not None else []
+
     # Extract trendline buffer index
     tl_buff_index = indi_data.get("trendline_buffer_index", {}).get("index")
 
@@ -43,7 +50,8 @@ def render_trendline(project_config: ProjectConfig, stage_config: StageConfig, i
 
         # Trendline indicator
         tl_name=indi_name,
-        tl_input_lines=build_input_lines(indi_data),
+        tl_input_lines=build_input_lines(indi_data, sampled_inputs),
+        sample_lines=build_sample_lines(samples),
         tl_custom=indi_data.get("custom"),
         tl_function=indi_data.get("function"),
         tl_path=indi_data.get("indicator_path"),
@@ -1,13 +1,17 @@
 import logging
 
-from strategy_factory.renderer_tools import build_input_lines
+import pandas as pd
+
+from strategy_factory.renderer_tools import build_input_lines, build_sample_lines
 from strategy_factory.stage_execution.stage_config import StageConfig
 from strategy_factory.utils import ProjectConfig
+from strategy_factory.utils.sample_table import stage_sample_table
 
 logger = logging.getLogger(__name__)
 
 
-def render_trigger(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict) -> str:
+def render_trigger(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict,
+                   samples: pd.DataFrame = None) -> str:
     """Render MQL5 code for the Trigger stage using the provided indicator config.
 
     Parameters:
@@ -15,6 +19,7 @@ def render_trigger(project_config: ProjectConfig, stage_config: StageConfig, ind
     - stage_config: Configuration object for the current pipeline stage.
     - indi_name: Name of the indicator being used as the trigger.
     - indi_data: Parsed YAML data for the indicator, including inputs and logic.
+    - samples: Sample table to embed (built from the stage config if None).
 
     Returns:
     - A rendered MQL5 source code string for use in EA generation.
@@ -23,13 +28,20 @@ def render_trigger(project_config: ProjectConfig, stage_config: StageConfig, ind
     trigger_logic_inputs_vars = list(trigger_logic_inputs.keys())
     trigger_logic_inputs_defaults = [trigger_logic_inputs[k]["default"] for k in trigger_logic_inputs_vars]
 
+    # Optional sample table: the optimiser walks inp_sample_idx instead of a min/step/max grid
+    if samples is None:
+        samples = stage_sample_table(project_config, stage_config.name, indi_data)
+    sampled_inputs = list(samples.columns) if samples is not None else []
+
     # Render the EA template, passing all required context variables to the template
     rendered_ea = stage_config.ea_template.render(
         symbols_array=project_config.whitelist,  # Pass whitelist for symbol iteration in EA
 
         # Trigger settings (to be optimised):
         trigger_indicator_name=indi_name,  # The name of the indicator being optimised
-        trigger_input_lines=build_input_lines(indi_data),  # MQL5 input variable declarations
+        trigger_input_lines=build_input_lines(indi_data, sampled_inputs),  # MQL5 input variable declarations
+        sample_lines=build_sample_lines(samples),  # Embedded sample table and apply_sample()
+        sampled_inputs=sampled_inputs,  # Inputs declared as globals, set from the sample table
         trigger_logic_inputs_vars=trigger_logic_inputs_vars,
         trigger_logic_inputs_defaults=trigger_logic_inputs_defaults,
         trigger_custom=indi_data.get("custom"),  # States if indi is mt5 inbuilt or custom
@@ -2,12 +2,11 @@ from strategy_factory.stage_execution.stage_config import StageConfig
 from strategy_factory.utils import ProjectConfig
 
 from strategy_factory.renderer_tools import build_input_lines
-from strategy_factory.renderer_tools import load_results_data
-from strategy_factory.stage_execution.stage_config import get_stage_config
-from strategy_factory.utils import load_all_pipeline_stages
+from strategy_factory.renderer_tools import UpstreamContext
 
 
-def render_volume(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict) -> str:
+def render_volume(project_config: ProjectConfig, stage_config: StageConfig, indi_name: str, indi_data: dict,
+                  upstream: UpstreamContext = None) -> str:
     """Render function for the volume stage.
 
     Parameters:
@@ -15,11 +14,12 @@ def render_volume(project_config: ProjectConfig, stage_config: StageConfig, indi
     - stage_config: StageConfig instance for the current pipeline stage.
     - indi_name: Name of the volume indicator.
     - indi_data: Dictionary parsed from YAML config.
+    - upstream: Per-run cache of the upstream stage results (created if None).
 
     Returns:
     - Rendered MQL5 code as string.
     """
-    stages = load_all_pipeline_stages(project_config.pipeline)
+    upstream = upstream or UpstreamContext(project_config)
 
     volume_logic_inputs = indi_data.get("logic_inputs") or {}
     volume_logic_inputs_vars = list(volume_logic_inputs.keys())
@@ -28,20 +28,17 @@ def render_volume(project_config: ProjectConfig, stage_config: StageConfig, indi
     volume_buffers = indi_data.get("buffers") or []
 
     # Load other stages
-    trendline_stage = get_stage_config(stages, "Trendline")
-    tl_name, tl_data = load_results_data(project_config.run_name, trendline_stage)
+    tl_name, tl_data = upstream.results("Trendline")
     tl_logic_inputs = tl_data.get("logic_inputs", {})
     tl_logic_inputs_vars = list(tl_logic_inputs.keys())
     tl_logic_inputs_defaults = [tl_logic_inputs[k]["default"] for k in tl_logic_inputs_vars]
 
-    conformation_stage = get_stage_config(stages, "Conformation")
-    conf_name, conf_data = load_results_data(project_config.run_name, conformation_stage)
+    conf_name, conf_data = upstream.results("Conformation")
     conf_logic_inputs = conf_data.get("logic_inputs", {})
     conf_logic_inputs_vars = list(conf_logic_inputs.keys())
     conf_logic_inputs_defaults = [conf_logic_inputs[k]["default"] for k in conf_logic_inputs_vars]
 
-    trigger_stage = get_stage_config(stages, "Trigger")
-    trigger_name, trigger_data = load_results_data(project_config.run_name, trigger_stage)
+    trigger_name, trigger_data = upstream.results("Trigger")
     trigger_logic_inputs = trigger_data.get("logic_inputs", {})
     trigger_logic_inputs_vars = list(trigger_logic_inputs.keys())
     trigger_logic_inputs_defaults = [trigger_logic_inputs[k]["default"] for k in trigger_logic_inputs_vars]
@@ -1,5 +1,8 @@
 from .extract_optimisation_result import OptimisationResult, extract_optimisation_result
-from .result_summary import update_combined_results
+from .result_summary import update_combined_results, summarise_in_sample
 from .extract_top_parameters import extract_top_parameters
-from .copy_mt5_report import copy_mt5_report
+from .copy_mt5_report import copy_mt5_report, convert_mt5_report, convert_forward_report
+from .results_store import ResultsStore
 from .make_stage_result_file import create_stage_result_yaml
+from .reaggregate import reaggregate_stages
+from .results_warehouse import ResultsWarehouse
@@ -3,28 +3,33 @@ import shutil
 from pathlib import Path
 import logging
 
-from .xml_to_csv import write_xml_to_csv
-from strategy_factory.utils import load_paths
+import pandas as pd
+
+from .xml_to_csv import write_forward_xml_to_csv, write_xml_to_csv
+from strategy_factory.utils import load_paths, traced
 
 logger = logging.getLogger(__name__)
 
 
-def copy_mt5_report(ini_path: Path, dest_dir: Path):
+@traced("report_copy")
+def copy_mt5_report(ini_path: Path, dest_dir: Path, mt5_root: Path = None, convert: bool = True) -> Path:
     """ Copies the MT5-generated report (XML) to the results directory, generates a CSV version of it, and deletes
-    the copied XML.
+    the copied XML. The forward-test companion (<Report>.forward.xml) is copied as well when the run had one.
 
     param ini_path: Path to the .ini file used for the MT5 run
     param dest_dir: Destination directory for reports
+    param mt5_root: Data folder of the terminal that ran the test. Defaults to the main MT5_ROOT.
+    param convert: If False, only copy the XML and leave the conversion to `convert_mt5_report`
+    return: Path to the copied XML report (removed again once converted)
     """
     config = configparser.ConfigParser()
     config.optionxform = str  # Preserve key casing
     config.read(ini_path, encoding="utf-16")
 
-    paths = load_paths()
+    mt5_root = mt5_root or load_paths()["MT5_ROOT"]
     report_name = config["Tester"]["Report"]
-    src_xml = paths["MT5_ROOT"] / f"{report_name}.xml"
+    src_xml = mt5_root / f"{report_name}.xml"
     dest_xml = dest_dir / f"{report_name}.xml"
-    dest_csv = dest_dir / f"{report_name}.csv"
 
     if not src_xml.exists():
         logger.error(f"Report not found: {src_xml}")
@@ -34,9 +39,52 @@ def copy_mt5_report(ini_path: Path, dest_dir: Path):
     shutil.copy(src_xml, dest_xml)
     logger.info(f"Copied MT5 XML report to: {dest_xml}")
 
+    src_forward = mt5_root / f"{report_name}.forward.xml"
+    if src_forward.exists():
+        shutil.copy(src_forward, dest_dir / src_forward.name)
+        logger.info(f"Copied MT5 forward report to: {dest_dir / src_forward.name}")
+
+    if convert:
+        convert_mt5_report(dest_xml)
+
+    return dest_xml
+
+
+@traced("convert")
+def convert_mt5_report(xml_path: Path, sample_table: pd.DataFrame = None) -> bool:
+    """ Convert a copied MT5 XML report to a CSV next to it and delete the XML.
+
+    param xml_path: Path to the XML report in the results directory
+    param sample_table: Optional sample table of the EA, used to map inp_sample_idx back to parameter values
+    return: True if the CSV was written
+    """
+    dest_csv = xml_path.with_suffix(".csv")
     try:
-        write_xml_to_csv(dest_xml, dest_csv)
-        dest_xml.unlink()  # delete the xml version of the results
+        write_xml_to_csv(xml_path, dest_csv, sample_table)
+        xml_path.unlink()  # delete the xml version of the results
         logger.info(f"Converted and deleted XML report. CSV saved at: {dest_csv}")
+        return dest_csv.exists()
     except Exception as e:
         logger.warning(f"Failed to convert report to CSV: {e}")
+        return False
+
+
+@traced("convert")
+def convert_forward_report(forward_xml: Path, is_csv: Path, oos_csv: Path, sample_table: pd.DataFrame = None) -> bool:
+    """ Convert a copied forward-test report into an OOS report CSV and delete the XML.
+
+    param forward_xml: Path to the <Report>.forward.xml in the results directory
+    param is_csv: Converted IS report of the same run (selects the pass)
+    param oos_csv: Destination OOS CSV (e.g. results/<indi>_OOS.csv)
+    param sample_table: Optional sample table of the EA, used to map inp_sample_idx back to parameter values
+    return: True if the CSV was written
+    """
+    try:
+        if not write_forward_xml_to_csv(forward_xml, is_csv, oos_csv, sample_table):
+            return False
+        forward_xml.unlink()
+        logger.info(f"Converted and deleted forward report. CSV saved at: {oos_csv}")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to convert forward report to CSV: {e}")
+        return False
@@ -1,8 +1,9 @@
-import pandas as pd
 from pathlib import Path
 from typing import Dict
 from dataclasses import dataclass
 
+from .results_store import ResultsStore
+
 
 @dataclass
 class OptimisationResult:
@@ -11,7 +12,7 @@ class OptimisationResult:
 
 
 def extract_optimisation_result(results_dir: Path, indicator_name: str) -> OptimisationResult:
-    """ Extracts optimised parameters from an exported MT5 CSV file.
+    """ Extracts the optimised parameters of the best IS pass (by Result) from the run's results store.
 
     param results_dir: Path to the results directory
     param indicator_name: Name of the indicator (used to locate the CSV)
@@ -21,7 +22,8 @@ def extract_optimisation_result(results_dir: Path, indicator_name: str) -> Optim
     if not csv_file.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_file}")
 
-    df = pd.read_csv(csv_file)
+    with ResultsStore(results_dir) as store:
+        df = store.best(indicator_name, "IS")
 
     ignore_cols = {
         'Pass', 'Result', 'Profit', 'Profit Factor', 'Custom', 'Expected Payoff', 'Recovery Factor', 'Sharpe Ratio',
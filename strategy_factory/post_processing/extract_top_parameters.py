@@ -3,6 +3,8 @@ import logging
 import pandas as pd
 from pathlib import Path
 
+from .results_store import ResultsStore
+
 logger = logging.getLogger(__name__)
 
 # Metrics to exclude when extracting parameter columns
@@ -15,6 +17,7 @@ METRIC_COLUMNS = {
 def extract_top_parameters(results_dir: Path, top_n: int = 5, sort_by: str = "Res_OOS",
                            csv_file: str = "1_top_parameter_sets.csv", yaml_file: str = "1_top_parameter_sets.yaml"):
     """Extract best IS parameters for the top-N indicators based on the combined results CSV.
+    The best IS pass of each indicator is read from the run's results store.
     Writes both a flat CSV (for humans) and structured YAML (for automation).
 
     param results_dir: Directory containing combined results and IS CSVs
@@ -38,13 +41,15 @@ def extract_top_parameters(results_dir: Path, top_n: int = 5, sort_by: str = "Re
     extracted_rows = []
     extracted_yaml = {}
 
-    for name in top_indicators:
-        is_csv = results_dir / f"{name}_IS.csv"
-        if not is_csv.exists():
-            logger.warning(f"Missing IS CSV: {is_csv}")
-            continue
+    best_passes = {}
+    with ResultsStore(results_dir) as store:
+        for name in top_indicators:
+            try:
+                best_passes[name] = store.best(name, "IS")
+            except FileNotFoundError:
+                logger.warning(f"Missing IS CSV: {results_dir / f'{name}_IS.csv'}")
 
-        df_is = pd.read_csv(is_csv).sort_values("Result", ascending=False)
+    for name, df_is in best_passes.items():
         if df_is.empty:
             continue
 
@@ -1,10 +1,12 @@
 from pathlib import Path
 import numpy as np
-import pandas as pd
 import yaml
 import logging
 
 from strategy_factory.stage_execution.stage_config import StageConfig, get_stage_config
+from strategy_factory.utils.indicator_catalog import get_indicator_catalog
+
+from .results_store import ResultsStore
 
 logger = logging.getLogger(__name__)
 
@@ -31,14 +33,7 @@ def find_indicator_yaml(indicators_dir: Path, indicator: str) -> Path:
     return: Path to the matching YAML file
     raises: FileNotFoundError if not found
     """
-    indicator_lc = indicator.lower()
-    for y in indicators_dir.glob("*.yaml"):
-        with open(y, "r") as f:
-            data = yaml.safe_load(f)
-        top_key = next(iter(data)).lower()
-        if top_key == indicator_lc:
-            return y
-    raise FileNotFoundError(f"No YAML found for indicator '{indicator}' in {indicators_dir}")
+    return get_indicator_catalog().find(indicators_dir, indicator)
 
 
 def extract_minimal_defaults(indicator_yaml: Path) -> tuple[str, dict]:
@@ -47,8 +42,7 @@ def extract_minimal_defaults(indicator_yaml: Path) -> tuple[str, dict]:
     param indicator_yaml: Path to the indicator YAML file
     return: (indicator_name, dict of input defaults)
     """
-    with open(indicator_yaml, "r") as f:
-        indi_data = yaml.safe_load(f)
+    indi_data = get_indicator_catalog().document(indicator_yaml)
     indicator_name = next(iter(indi_data))
     indi_section = indi_data[indicator_name]
     inputs = indi_section.get("indicator_inputs", {})
@@ -71,13 +65,14 @@ def extract_indicator_optimised_results(run_dir: Path, stage, indicator: str):
     if not results_file.exists():
         raise FileNotFoundError(f"Parameter-level results file not found: {results_file}")
 
-    df = pd.read_csv(results_file)
+    # Best pass by Result, read from the run's results store
+    with ResultsStore(results_file.parent) as store:
+        df = store.best(indicator, "IS")
 
     if df.empty:
         raise ValueError(f"No data in: {results_file}")
 
-    # Sort by Result, take the top row
-    best = df.sort_values("Result", ascending=False).iloc[0]
+    best = df.iloc[0]
 
     # List of known output/stat columns to exclude
     non_param_cols = {
@@ -0,0 +1,59 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from strategy_factory.utils import load_paths
+
+from .extract_top_parameters import extract_top_parameters
+from .result_summary import update_combined_results
+
+logger = logging.getLogger(__name__)
+
+
+def reaggregate_stages(run_name: str, stages: list[str] = None, max_workers: int = None) -> dict[str, pd.DataFrame]:
+    """ Rebuild the combined results and top parameter sets of finished stages, processing their reports on all cores.
+
+    New or changed IS/OOS reports of every stage are parsed in a process pool and loaded into the run's results store,
+    and the summary rows of their indicators are built in the same pool. Then each stage's 1_combined_results.csv and
+    1_top_parameter_sets.* are written as at the end of a stage run.
+    Workers are spawned (not forked), so it is safe to call from a process with running threads.
+
+    param run_name: Name of the run (folder under OUTPUT_DIR)
+    param stages: Stage names to re-aggregate. None re-aggregates every stage with a results directory.
+    param max_workers: Worker processes (default: one per CPU). With a single worker everything runs in-process.
+    return: Dict of stage name -> combined results table
+    """
+    run_dir = load_paths()["OUTPUT_DIR"] / run_name
+    if stages is None:
+        results_dirs = sorted(path for path in run_dir.glob("*/results") if path.is_dir())
+    else:
+        results_dirs = [run_dir / stage / "results" for stage in stages]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        return {results_dir.parent.name: reaggregate_stage(results_dir) for results_dir in results_dirs}
+
+    tables = {}
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        for results_dir in results_dirs:
+            tables[results_dir.parent.name] = reaggregate_stage(results_dir, executor)
+    return tables
+
+
+def reaggregate_stage(results_dir: Path, executor: Executor = None) -> pd.DataFrame:
+    """ Rebuild the combined results and top parameter sets of one stage.
+
+    param results_dir: The stage's results directory (outputs/<run>/<Stage>/results)
+    param executor: Optional process pool to parse and summarise the reports in parallel
+    return: The combined results table
+    """
+    stage_name = results_dir.parent.name
+    combined = update_combined_results(results_dir, stage_name=stage_name, executor=executor)
+    if not combined.empty:
+        extract_top_parameters(results_dir=results_dir, top_n=5, sort_by="Res_OOS")
+    logger.info(f"Re-aggregated stage {stage_name}: {len(combined)} indicator(s)")
+    return combined
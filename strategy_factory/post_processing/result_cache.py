@@ -0,0 +1,104 @@
+import configparser
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from strategy_factory.gen_expert_advisor.compiler import include_hashes
+from strategy_factory.utils import load_paths
+from strategy_factory.utils.hashing import hash_file, hash_json
+
+logger = logging.getLogger(__name__)
+
+# [Tester] keys that only name files or control the terminal, and never change the test outcome
+RUN_SPECIFIC_TESTER_KEYS = {"Expert", "Report", "ReplaceReport", "ShutdownTerminal", "Visual"}
+
+
+def compute_result_key(ini_path: Path, mq5_path: Path, whitelist: list[str], terminal_exe: Path = None) -> str:
+    """ Build the content-addressed cache key for one MT5 tester run.
+
+    The key covers everything that determines the report: the rendered EA source and the MQL include libraries it is
+    compiled against (as in the compile cache), the [Tester] settings (minus run-specific file names) and the full
+    [TesterInputs] section of the .ini, the symbol whitelist and the terminal build. Two runs with the same key
+    produce the same report, whichever project or stage they belong to.
+
+    param ini_path: Path to the .ini file written for the run
+    param mq5_path: Path to the rendered .mq5 source of the EA under test
+    param whitelist: Symbols the EA trades
+    param terminal_exe: Terminal executable (its size/mtime identify the build). Defaults to MT5_TERM_EXE; pool
+                        instances are copies of it, so the key does not depend on which of them runs the test.
+    return: Hex digest string
+    """
+    config = configparser.ConfigParser()
+    config.optionxform = str  # Preserve key casing
+    config.read(ini_path, encoding="utf-16")
+
+    tester = {k: v for k, v in config["Tester"].items() if k not in RUN_SPECIFIC_TESTER_KEYS}
+    tester_inputs = dict(config["TesterInputs"])
+    terminal_stat = (terminal_exe or load_paths()["MT5_TERM_EXE"]).stat()
+
+    return hash_json({
+        "source": hash_file(mq5_path),
+        "includes": include_hashes(),
+        "tester": tester,
+        "tester_inputs": tester_inputs,
+        "whitelist": list(whitelist),
+        "terminal": [terminal_stat.st_size, terminal_stat.st_mtime_ns],
+    })
+
+
+def _cache_path(key: str, cache_dir: Path = None) -> Path:
+    """ Return the location of a cached report, sharded by the first two characters of the key. """
+    cache_dir = cache_dir or load_paths()["RESULT_CACHE_DIR"]
+    return cache_dir / key[:2] / f"{key}.csv"
+
+
+def restore_cached_report(key: str, dest_csv: Path, cache_dir: Path = None) -> bool:
+    """ Copy a cached report to its destination if one exists for the key.
+
+    param key: Key from `compute_result_key`
+    param dest_csv: Where the report CSV should be written (e.g. results/<indi>_IS.csv)
+    param cache_dir: Optional cache root. Defaults to RESULT_CACHE_DIR.
+    return: True on a cache hit, False otherwise
+    """
+    cached = _cache_path(key, cache_dir)
+    if not cached.exists():
+        return False
+
+    # Copy via a temporary file: other indicators' results are aggregated from the same folder while jobs run
+    dest_csv.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest_csv.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copyfile(cached, tmp)
+    os.replace(tmp, dest_csv)
+    logger.info(f"Result cache hit for {dest_csv.name} ({key[:12]})")
+    return True
+
+
+def store_cached_report(key: str, report_csv: Path, cache_dir: Path = None, **metadata) -> None:
+    """ Store a converted report in the shared cache under its key.
+
+    The copy is written to a temporary file and moved into place, so concurrent writers and interrupted runs never
+    leave a partial entry behind.
+
+    param key: Key from `compute_result_key`
+    param report_csv: Converted report CSV to store
+    param cache_dir: Optional cache root. Defaults to RESULT_CACHE_DIR.
+    param metadata: Optional provenance (run name, stage, ...) saved next to the entry for humans
+    """
+    if not report_csv.exists():
+        logger.warning(f"Cannot cache missing report: {report_csv}")
+        return
+
+    cached = _cache_path(key, cache_dir)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp = cached.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copyfile(report_csv, tmp)
+    os.replace(tmp, cached)
+
+    info = {"report": report_csv.name, "stored": datetime.now().isoformat(timespec="seconds"), **metadata}
+    cached.with_suffix(".json").write_text(json.dumps(info, indent=2), encoding="utf-8")
+    logger.debug(f"Stored {report_csv.name} in result cache ({key[:12]})")
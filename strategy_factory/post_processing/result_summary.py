@@ -1,8 +1,14 @@
 import logging
-import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import Executor, as_completed
 from pathlib import Path
 
+from strategy_factory.utils import traced
+
+from .results_store import PHASES, ResultsStore
+from .tier_manifest import add_tier_column
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -11,6 +17,7 @@ OOS_SUFFIX = "_OOS.csv"
 SUMMARY_FILE = "1_combined_results.csv"
 STAGE_SUMMARY_TEMPLATE = "1_combined_results_{stage}.csv"
 FAILED_LIST_FILE = "failed_postprocess.txt"
+ROUND_SUMMARY_TEMPLATE = "1_combined_results_round_{round}.csv"
 
 # Metric columns to extract and summarize
 METRICS = {
@@ -20,22 +27,32 @@ METRICS = {
 }
 
 
-def update_combined_results(results_dir: Path, stage_name: str = None, print_summary: bool = False):
+@traced("aggregate")
+def update_combined_results(results_dir: Path, stage_name: str = None, print_summary: bool = False,
+                            indicators: list[str] = None, executor: Executor = None):
     """ Aggregate IS/OOS results from CSVs and write combined summaries.
 
     param results_dir: Directory containing *_IS.csv and *_OOS.csv result files
     param stage_name: Optional filter to generate stage-specific summary (e.g., 'C1')
     param print_summary: If True, prints the full combined DataFrame to console
+    param indicators: Only re-summarise these indicators (e.g. the one that just finished) and merge them into the
+                      existing summary. None rescans the whole results directory.
+    param executor: Optional process pool to parse and summarise new or changed reports in parallel
+                    (see `reaggregate_stages`)
+    return: The combined results table (empty if no valid results were found)
     """
-    combined, failed = collect_results(results_dir)
+    combined, failed = collect_results(results_dir, indicators, executor)
 
     if combined.empty:
         logger.warning("No valid results found.")
-        return
+        return combined
 
     # Sort by best out-of-sample result
     combined = combined.sort_values("Res_OOS", ascending=False).reset_index(drop=True)
 
+    # Record which fidelity tier produced each row (tiered stages only)
+    combined = add_tier_column(results_dir, combined)
+
     # Save full summary CSV
     combined.to_csv(results_dir / SUMMARY_FILE, index=False)
     logger.info("Saved combined results.")
@@ -57,52 +74,102 @@ def update_combined_results(results_dir: Path, stage_name: str = None, print_sum
     if print_summary:
         print(combined)
 
+    return combined
+
+
+def collect_results(results_dir: Path, indicators: list[str] = None,
+                    executor: Executor = None) -> tuple[pd.DataFrame, list[str]]:
+    """ Pair the best IS and OOS pass of every indicator and extract summary metrics.
 
-def collect_results(results_dir: Path) -> tuple[pd.DataFrame, list[str]]:
-    """ Parse *_IS.csv and *_OOS.csv pairs and extract summary metrics.
+    Summary rows are kept in the run's results store (see `ResultsStore`) together with the SHA-256 of the IS/OOS
+    reports they were built from. Only an indicator whose reports are new or changed is summarised again, so
+    updating the table after each finished indicator does not re-read the reports of the others.
 
     param results_dir: Path to the results directory
+    param indicators: Only check these indicators' reports (a stat() each). None checks every report of the directory.
+    param executor: Optional process pool to parse and summarise new or changed reports in parallel
     return: Tuple of (DataFrame with results, List of indicator names that failed)
     """
-    rows = []
-    failed = []
+    with ResultsStore(results_dir) as store:
+        store.sync(indicators, executor)
+        if indicators is None:
+            indicators = sorted(set(store.indicators("IS")) | set(store.summarised()))
+
+        stale = {}
+        for name in indicators:
+            sources = _stale_sources(store, name)
+            if sources is not None:
+                stale[name] = sources
+
+        # Rows are built in the executor's workers (if any), each reading the store, and written here
+        if executor is not None and len(stale) > 1:
+            futures = {executor.submit(_summary_row, results_dir, name, sources): name
+                       for name, sources in stale.items()}
+            built = ((futures[future], future.result()) for future in as_completed(futures))
+        else:
+            built = ((name, _summary_row(results_dir, name, sources, store)) for name, sources in stale.items())
+
+        for name, row in built:
+            store.put_summary(name, stale[name], row)
+
+        rows, failed = store.summary()
+    return pd.DataFrame(rows), failed
 
-    for file in os.listdir(results_dir):
-        if not file.endswith(IS_SUFFIX):
-            continue
 
-        name = file.replace(IS_SUFFIX, "")
+def _stale_sources(store: ResultsStore, name: str) -> str | None:
+    """ Return the report signature of an indicator whose summary row is out of date, or None if it is current.
 
-        try:
-            df_in = load_csv_as_df(results_dir / f"{name}{IS_SUFFIX}")
-            df_out = load_csv_as_df(results_dir / f"{name}{OOS_SUFFIX}")
+    An indicator without an IS report has its summary row dropped and is not summarised again.
+    """
+    is_hash, oos_hash = (store.report_hash(name, phase) for phase in PHASES)
+    if is_hash is None:
+        store.drop_summary(name)
+        return None
 
-            # Sort explicitly by Result (in case MT5 didn't)
-            df_in = df_in.sort_values("Result", ascending=False)
-            df_out = df_out.sort_values("Result", ascending=False)
+    sources = f"{is_hash}:{oos_hash}"
+    entry = store.summary_entry(name)
+    return None if entry is not None and entry[0] == sources else sources
 
-            row = build_combined_row(name, df_in, df_out)
-            if row:
-                rows.append(row)
-            else:
-                failed.append(name)
 
-        except Exception as e:
-            logger.warning(f"Failed to process {name}: {e}")
-            failed.append(name)
+def _summary_row(results_dir: Path, name: str, sources: str, store: ResultsStore = None) -> dict | None:
+    """ Build the summary row of one indicator from its stored best IS/OOS passes.
 
-    return pd.DataFrame(rows), failed
+    Module-level, so `collect_results` can run it in worker processes; a worker opens its own store connection.
+
+    param results_dir: Path to the results directory
+    param name: Indicator name
+    param sources: Report signature from `_stale_sources` ("<IS sha256>:<OOS sha256 or None>")
+    param store: Open store of the results directory (None opens one)
+    return: Summary row, or None if the indicator failed post-processing
+    """
+    if sources.endswith(":None"):
+        logger.warning(f"Failed to process {name}: Missing file: {results_dir / f'{name}{OOS_SUFFIX}'}")
+        return None
+    if store is None:
+        with ResultsStore(results_dir) as store:
+            return _summary_row(results_dir, name, sources, store)
+    return build_combined_row(name, store.best(name, "IS"), store.best(name, "OOS"))
 
 
-def load_csv_as_df(csv_path: Path) -> pd.DataFrame:
-    """ Load a CSV file into a DataFrame.
+def summarise_in_sample(results_dir: Path, indicators: list[str]) -> pd.DataFrame:
+    """ Extract the best IS metrics of each indicator (used to rank IS-only rounds, which have no OOS reports).
 
-    param csv_path: Path to a .csv file
-    return: Parsed DataFrame
+    param results_dir: Directory containing the *_IS.csv result files
+    param indicators: Indicators to summarise
+    return: DataFrame with Indicator, Res_IS, PF_IS and Trades_IS, sorted by Res_IS. Indicators without a valid
+            IS report are left out.
     """
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Missing file: {csv_path}")
-    return pd.read_csv(csv_path)
+    with ResultsStore(results_dir) as store:
+        best_in = store.best_per_indicator("IS", indicators)
+    for name in set(indicators) - set(best_in["Indicator"]):
+        logger.warning(f"Failed to process {name}: Missing file: {results_dir / f'{name}{IS_SUFFIX}'}")
+
+    if best_in.empty:
+        return pd.DataFrame(columns=["Indicator", *(f"{key}_IS" for key in METRICS)])
+
+    table = pd.DataFrame({"Indicator": best_in["Indicator"],
+                          **{f"{key}_IS": safe_floats(best_in[col]) for key, col in METRICS.items()}})
+    return table.sort_values("Res_IS", ascending=False).reset_index(drop=True)
 
 
 def build_combined_row(indicator: str, df_in: pd.DataFrame, df_out: pd.DataFrame) -> dict | None:
@@ -114,11 +181,14 @@ def build_combined_row(indicator: str, df_in: pd.DataFrame, df_out: pd.DataFrame
     return: Dictionary of summary metrics or None if invalid
     """
     try:
-        values = {}
+        columns = list(METRICS.values())
+        metrics_in = safe_floats(df_in[columns].iloc[0]).tolist()
+        metrics_out = safe_floats(df_out[columns].iloc[0]).tolist()
 
-        for key, col in METRICS.items():
-            values[f"{key}_IS"] = safe_float(df_in[col].iloc[0])
-            values[f"{key}_OOS"] = safe_float(df_out[col].iloc[0])
+        values = {}
+        for i, key in enumerate(METRICS):
+            values[f"{key}_IS"] = metrics_in[i]
+            values[f"{key}_OOS"] = metrics_out[i]
 
         # Skip any result with missing or invalid metrics
         if any(pd.isna(v) for v in values.values()):
@@ -139,18 +209,14 @@ def build_combined_row(indicator: str, df_in: pd.DataFrame, df_out: pd.DataFrame
         return None
 
 
-def safe_float(val: str) -> float:
-    """ Convert a value to float, treating invalid values as 0.0.
+def safe_floats(values) -> np.ndarray:
+    """ Convert values to floats, treating invalid values (blank, non-numeric, nan, inf, -nan(ind)) as 0.0.
 
-    param val: Value from CSV (str, float, or int)
-    return: Float-safe representation
+    param values: Sequence, Series or array of values from CSV
+    return: Float array
     """
-    try:
-        v = str(val).strip().lower()
-        return 0.0 if v in {"", "nan", "inf", "-inf", "-nan(ind)"} else float(v)
-
-    except Exception:
-        return 0.0
+    floats = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+    return np.where(np.isfinite(floats), floats, 0.0)
 
 
 def percent_diff(a: float, b: float) -> float:
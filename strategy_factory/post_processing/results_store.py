@@ -0,0 +1,398 @@
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Executor, as_completed
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+RESULTS_STORE_FILE = "results.sqlite"
+PHASES = ("IS", "OOS")
+
+# Report columns stored as typed columns, everything else is an input and goes into the params JSON
+METRIC_FIELDS = {
+    "Pass": "pass",
+    "Result": "result",
+    "Profit": "profit",
+    "Expected Payoff": "expected_payoff",
+    "Profit Factor": "profit_factor",
+    "Recovery Factor": "recovery_factor",
+    "Sharpe Ratio": "sharpe_ratio",
+    "Custom": "custom",
+    "Equity DD %": "equity_dd",
+    "Trades": "trades",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    sha256      TEXT NOT NULL,
+    columns     TEXT NOT NULL,
+    PRIMARY KEY (stage, indicator, phase)
+);
+CREATE TABLE IF NOT EXISTS passes (
+    stage           TEXT NOT NULL,
+    indicator       TEXT NOT NULL,
+    phase           TEXT NOT NULL,
+    seq             INTEGER NOT NULL,
+    pass            INTEGER,
+    result          REAL,
+    profit          REAL,
+    expected_payoff REAL,
+    profit_factor   REAL,
+    recovery_factor REAL,
+    sharpe_ratio    REAL,
+    custom          REAL,
+    equity_dd       REAL,
+    trades          INTEGER,
+    params          TEXT NOT NULL,
+    PRIMARY KEY (stage, indicator, phase, seq)
+);
+CREATE INDEX IF NOT EXISTS passes_best ON passes (stage, indicator, phase, result DESC, seq);
+CREATE INDEX IF NOT EXISTS passes_stage_top ON passes (stage, phase, result DESC);
+CREATE TABLE IF NOT EXISTS summary (
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    sources     TEXT NOT NULL,
+    row         TEXT,
+    PRIMARY KEY (stage, indicator)
+);
+"""
+
+# Open connections per store file, shared by the ResultsStore instances of a process: [connection, lock, users]
+_connections: dict[Path, list] = {}
+_connections_lock = threading.Lock()
+
+
+class ResultsStore:
+    """ SQLite index of the converted IS/OOS reports of one stage, shared by all stages of a run.
+
+    Every <indi>_IS.csv / <indi>_OOS.csv of the stage's results directory is loaded once into a `passes` table with
+    typed metric columns (the inputs are kept as JSON), indexed by stage, indicator, phase and Result. The best pass of
+    an indicator, the best pass of every indicator and the top-N passes of a stage are single indexed reads instead of
+    a read and sort of every CSV.
+
+    The CSVs stay the report files that the result cache, the run journal and the zoom/halving archives work with; the
+    store follows them. Each query first syncs the stage: a report whose file changed (mtime/size, then SHA-256) is
+    reloaded, and one whose file was moved away (e.g. an archived halving round) is dropped.
+
+    The `summary` table is the manifest of the combined results table: one summary row per indicator, stored with the
+    hashes of the IS/OOS reports it was built from (see `update_combined_results`).
+
+    The database lives in the run directory (outputs/<run>/results.sqlite) for the standard <Stage>/results layout,
+    otherwise in the results directory itself. Thread-safe. Instances on the same file share one connection, which is
+    closed when the last of them is closed (`close()` or a `with` block).
+
+    param results_dir: The stage's results directory (outputs/<run>/<Stage>/results)
+    """
+
+    def __init__(self, results_dir: Path):
+        self.results_dir = Path(results_dir)
+        self.stage = self.results_dir.parent.name
+        base = self.results_dir.parents[1] if self.results_dir.name == "results" else self.results_dir
+        self.path = base / RESULTS_STORE_FILE
+        self._conn, self._lock = _connect(self.path)
+        self._closed = False
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Release this instance's use of the store file's connection; the last user closes it. """
+        if not self._closed:
+            self._closed = True
+            _disconnect(self.path)
+
+    def best(self, indicator: str, phase: str = "IS", n: int = 1) -> pd.DataFrame:
+        """ Return the best n passes (by Result) of one report, with the report's columns.
+
+        param indicator: Indicator name
+        param phase: 'IS' or 'OOS'
+        param n: Number of passes
+        return: DataFrame sorted by Result, descending
+        raises: FileNotFoundError if the report does not exist
+        """
+        self.sync([indicator])
+        with self._lock:
+            columns = self._columns(indicator, phase)
+            rows = self._conn.execute(
+                "SELECT * FROM passes WHERE stage = ? AND indicator = ? AND phase = ? "
+                "ORDER BY result DESC, seq LIMIT ?", (self.stage, indicator, phase, n)).fetchall()
+        if columns is None:
+            raise FileNotFoundError(f"Missing file: {self.results_dir / f'{indicator}_{phase}.csv'}")
+        return _to_frame(rows, columns)
+
+    def best_per_indicator(self, phase: str = "IS", indicators: list[str] = None) -> pd.DataFrame:
+        """ Return the best pass of every report of a phase, one row per indicator.
+
+        param phase: 'IS' or 'OOS'
+        param indicators: Optional subset of indicators
+        return: DataFrame with an 'Indicator' column followed by the metric columns
+        """
+        self.sync()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT p.* FROM reports r
+                JOIN passes p ON p.stage = r.stage AND p.indicator = r.indicator AND p.phase = r.phase
+                 AND p.seq = (SELECT seq FROM passes
+                              WHERE stage = r.stage AND indicator = r.indicator AND phase = r.phase
+                              ORDER BY result DESC, seq LIMIT 1)
+                WHERE r.stage = ? AND r.phase = ?
+                ORDER BY r.indicator
+                """, (self.stage, phase)).fetchall()
+
+        table = _to_frame(rows, ["Indicator", *METRIC_FIELDS], keep_params=False)
+        if indicators is not None:
+            table = table[table["Indicator"].isin(indicators)].reset_index(drop=True)
+        return table
+
+    def top(self, phase: str = "IS", n: int = 10) -> pd.DataFrame:
+        """ Return the top n passes of the whole stage by Result, across indicators.
+
+        param phase: 'IS' or 'OOS'
+        param n: Number of passes
+        return: DataFrame with an 'Indicator' column followed by the metric columns
+        """
+        self.sync()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM passes WHERE stage = ? AND phase = ? ORDER BY result DESC LIMIT ?",
+                (self.stage, phase, n)).fetchall()
+        return _to_frame(rows, ["Indicator", *METRIC_FIELDS], keep_params=False)
+
+    def indicators(self, phase: str = "IS") -> list[str]:
+        """ Names of the indicators with a report of the given phase. """
+        self.sync()
+        with self._lock:
+            rows = self._conn.execute("SELECT indicator FROM reports WHERE stage = ? AND phase = ? ORDER BY indicator",
+                                      (self.stage, phase)).fetchall()
+        return [r[0] for r in rows]
+
+    def sync(self, indicators: list[str] = None, executor: Executor = None) -> None:
+        """ Load new or changed report CSVs of the results directory and drop reports whose file is gone.
+
+        param indicators: Only sync the reports of these indicators, a stat() per report instead of a directory scan
+        param executor: Optional process pool to parse the changed reports in parallel
+        """
+        if indicators is None:
+            candidates = list(self.results_dir.iterdir()) if self.results_dir.is_dir() else []
+        else:
+            candidates = [self.results_dir / f"{indicator}_{phase}.csv" for indicator in indicators for phase in PHASES]
+
+        on_disk = {}
+        for csv_path in candidates:
+            key = _report_key(csv_path)
+            if key is None:
+                continue
+            try:
+                stat = csv_path.stat()
+            except FileNotFoundError:
+                continue
+            on_disk[key] = (csv_path, (stat.st_mtime_ns, stat.st_size))
+
+        with self._lock:
+            stored = {(indicator, phase): (mtime_ns, size, sha256) for indicator, phase, mtime_ns, size, sha256 in
+                      self._conn.execute("SELECT indicator, phase, mtime_ns, size, sha256 FROM reports WHERE stage = ?",
+                                         (self.stage,))
+                      if indicators is None or indicator in indicators}
+
+            for key in stored.keys() - on_disk.keys():
+                self._delete(*key)
+                self.drop_summary(key[0])
+
+        # Reports are parsed in the executor's workers (if any) and written here, as the connection is per process
+        changed = {key: csv_path for key, (csv_path, stat) in on_disk.items() if stored.get(key, ())[:2] != stat}
+        known = {key: stored[key][2] for key in changed if key in stored}
+        if executor is not None and len(changed) > 1:
+            futures = {executor.submit(_read_report, changed[key], known.get(key)): key for key in changed}
+            reports = ((futures[future], future.result) for future in as_completed(futures))
+        else:
+            reports = ((key, partial(_read_report, changed[key], known.get(key))) for key in changed)
+
+        for key, read in reports:
+            try:
+                self._store(*key, changed[key], read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable report {changed[key].name}: {e}")
+                with self._lock:
+                    self._delete(*key)
+
+    def report_hash(self, indicator: str, phase: str) -> str | None:
+        """ SHA-256 of a stored report, or None if the indicator has no report of this phase. Does not sync. """
+        with self._lock:
+            row = self._conn.execute("SELECT sha256 FROM reports WHERE stage = ? AND indicator = ? AND phase = ?",
+                                     (self.stage, indicator, phase)).fetchone()
+        return row[0] if row else None
+
+    def summary_entry(self, indicator: str) -> tuple[str, dict | None] | None:
+        """ Return (sources, row) of an indicator's summary row, or None if it has not been summarised. """
+        with self._lock:
+            entry = self._conn.execute("SELECT sources, row FROM summary WHERE stage = ? AND indicator = ?",
+                                       (self.stage, indicator)).fetchone()
+        if entry is None:
+            return None
+        return entry[0], json.loads(entry[1]) if entry[1] is not None else None
+
+    def put_summary(self, indicator: str, sources: str, row: dict | None) -> None:
+        """ Store the summary row of an indicator.
+
+        param indicator: Indicator name
+        param sources: Signature of the reports the row was built from
+        param row: Summary row, or None if the indicator failed post-processing
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO summary VALUES (?, ?, ?, ?)",
+                               (self.stage, indicator, sources, json.dumps(row) if row is not None else None))
+
+    def drop_summary(self, indicator: str) -> None:
+        """ Remove the summary row of an indicator. """
+        with self._lock:
+            self._conn.execute("DELETE FROM summary WHERE stage = ? AND indicator = ?", (self.stage, indicator))
+
+    def summary(self) -> tuple[list[dict], list[str]]:
+        """ Return the stored summary rows of the stage and the names of the indicators that failed. Does not sync. """
+        with self._lock:
+            entries = self._conn.execute("SELECT indicator, row FROM summary WHERE stage = ? ORDER BY indicator",
+                                         (self.stage,)).fetchall()
+        rows = [json.loads(row) for _, row in entries if row is not None]
+        return rows, [indicator for indicator, row in entries if row is None]
+
+    def summarised(self) -> list[str]:
+        """ Names of the indicators with a summary row (including failed ones). """
+        with self._lock:
+            rows = self._conn.execute("SELECT indicator FROM summary WHERE stage = ? ORDER BY indicator",
+                                      (self.stage,)).fetchall()
+        return [r[0] for r in rows]
+
+    def ingest(self, csv_path: Path) -> None:
+        """ Load (or reload) one report CSV into the store. A file whose contents did not change is not re-parsed.
+
+        param csv_path: Converted report (<indi>_IS.csv or <indi>_OOS.csv) in this stage's results directory
+        """
+        key = _report_key(csv_path)
+        if key is None:
+            raise ValueError(f"Not an IS/OOS report: {csv_path.name}")
+        self._store(*key, csv_path, _read_report(csv_path, self.report_hash(*key)))
+
+    def _store(self, indicator: str, phase: str, csv_path: Path, report: tuple) -> None:
+        """ Write a report read by `_read_report` to the store. """
+        mtime_ns, size, sha256, columns, rows = report
+        with self._lock, self._conn:
+            if columns is None:
+                self._conn.execute("UPDATE reports SET source = ?, mtime_ns = ?, size = ? "
+                                   "WHERE stage = ? AND indicator = ? AND phase = ?",
+                                   (str(csv_path), mtime_ns, size, self.stage, indicator, phase))
+                return
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._delete(indicator, phase)
+            self._conn.execute("INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (self.stage, indicator, phase, str(csv_path), mtime_ns, size, sha256,
+                                json.dumps(columns)))
+            self._conn.executemany(
+                f"INSERT INTO passes VALUES (?, ?, ?, ?, {', '.join('?' * len(METRIC_FIELDS))}, ?)",
+                ((self.stage, indicator, phase, *row) for row in rows))
+        logger.debug(f"Stored {len(rows)} passes of {csv_path.name} in {self.path.name}")
+
+    def _delete(self, indicator: str, phase: str) -> None:
+        """ Remove a report and its passes. Call with the lock held. """
+        for table in ("reports", "passes"):
+            self._conn.execute(f"DELETE FROM {table} WHERE stage = ? AND indicator = ? AND phase = ?",
+                               (self.stage, indicator, phase))
+
+    def _columns(self, indicator: str, phase: str) -> list[str] | None:
+        row = self._conn.execute("SELECT columns FROM reports WHERE stage = ? AND indicator = ? AND phase = ?",
+                                 (self.stage, indicator, phase)).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def _connect(path: Path) -> tuple[sqlite3.Connection, threading.RLock]:
+    """ Return the process-wide connection (and its lock) of a store file, creating the schema on first use.
+
+    Every call must be paired with a `_disconnect` of the same path.
+    """
+    with _connections_lock:
+        if path not in _connections:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _connections[path] = [conn, threading.RLock(), 0]
+        entry = _connections[path]
+        entry[2] += 1
+        return entry[0], entry[1]
+
+
+def _disconnect(path: Path) -> None:
+    """ Drop one user of a store file's connection, closing and evicting it when none is left. """
+    with _connections_lock:
+        entry = _connections[path]
+        entry[2] -= 1
+        if entry[2] == 0:
+            del _connections[path]
+            with entry[1]:
+                entry[0].close()
+
+
+def _read_report(csv_path: Path, known_sha256: str = None) -> tuple:
+    """ Read a report CSV into `passes` rows. Module-level, so `sync` can run it in worker processes.
+
+    param csv_path: Report CSV
+    param known_sha256: SHA-256 of the stored copy of the report; an unchanged file is not parsed
+    return: (mtime_ns, size, sha256, columns, rows), with columns and rows None if the contents did not change
+    """
+    stat = csv_path.stat()
+    raw = csv_path.read_bytes()
+    sha256 = hashlib.sha256(raw).hexdigest()
+    if sha256 == known_sha256:
+        return stat.st_mtime_ns, stat.st_size, sha256, None, None
+
+    df = pd.read_csv(io.BytesIO(raw))
+    metrics = [_metric_values(df, col) for col in METRIC_FIELDS]
+    param_cols = [c for c in df.columns if c not in METRIC_FIELDS]
+    params = (df[param_cols].to_json(orient="records", lines=True, double_precision=15).splitlines()
+              if param_cols else ["{}"] * len(df))
+    return stat.st_mtime_ns, stat.st_size, sha256, list(df.columns), list(zip(range(len(df)), *metrics, params))
+
+
+def _report_key(csv_path: Path) -> tuple[str, str] | None:
+    """ Return (indicator, phase) of a report file name, or None for other files. """
+    for phase in PHASES:
+        suffix = f"_{phase}.csv"
+        if csv_path.name.endswith(suffix) and len(csv_path.name) > len(suffix):
+            return csv_path.name[:-len(suffix)], phase
+    return None
+
+
+def _metric_values(df: pd.DataFrame, column: str) -> list:
+    """ Return a metric column as Python numbers for sqlite3; missing or invalid values (e.g. '-nan(ind)') are None. """
+    if column not in df.columns:
+        return [None] * len(df)
+    values = pd.to_numeric(df[column], errors="coerce")
+    return [None if v != v else v for v in values.tolist()]  # NaN != NaN
+
+
+def _to_frame(rows: list[tuple], columns: list[str], keep_params: bool = True) -> pd.DataFrame:
+    """ Rebuild report rows from `passes` rows (stage, indicator, phase, seq, metrics..., params). """
+    records = []
+    for row in rows:
+        record = {"Indicator": row[1], **dict(zip(METRIC_FIELDS, row[4:-1]))}
+        if keep_params:
+            record.update(json.loads(row[-1]))
+        records.append(record)
+    return pd.DataFrame(records, columns=columns)
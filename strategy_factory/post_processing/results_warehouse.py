@@ -0,0 +1,358 @@
+import json
+import logging
+import os
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+from strategy_factory.utils import load_paths
+
+from .result_summary import SUMMARY_FILE
+from .results_store import METRIC_FIELDS, RESULTS_STORE_FILE, ResultsStore
+
+logger = logging.getLogger(__name__)
+
+WAREHOUSE_FILE = "results_warehouse.sqlite"
+CONFIG_FILE = "config.yaml"
+
+# Columns of 1_combined_results.csv, stored under the same names
+COMBINED_METRICS = ["Res_IS", "Res_OOS", "PF_IS", "PF_OOS", "Trades_IS", "Trades_OOS", "Res_dif", "Res_mean", "PF_dif",
+                    "Trades_dif"]
+
+# Project config keys stored as columns of the projects table (the whole config is kept as JSON too)
+PROJECT_FIELDS = {
+    "pipeline": "pipeline",
+    "main_chart_symbol": "symbol",
+    "period": "period",
+    "start_date": "start_date",
+    "end_date": "end_date",
+    "data_split": "data_split",
+    "deposit": "deposit",
+    "currency": "currency",
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sources (
+    path        TEXT PRIMARY KEY,
+    run_name    TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    run_name    TEXT PRIMARY KEY,
+    {", ".join(f"{column} TEXT" for column in PROJECT_FIELDS.values())},
+    config      TEXT
+);
+CREATE TABLE IF NOT EXISTS combined (
+    run_name    TEXT NOT NULL,
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    {", ".join(f"{column} REAL" for column in COMBINED_METRICS)},
+    tier        TEXT,
+    updated     TEXT NOT NULL,
+    PRIMARY KEY (run_name, stage, indicator)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    run_name    TEXT NOT NULL,
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    sha256      TEXT NOT NULL,
+    columns     TEXT NOT NULL,
+    PRIMARY KEY (run_name, stage, indicator, phase)
+);
+CREATE TABLE IF NOT EXISTS passes (
+    run_name    TEXT NOT NULL,
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    {", ".join(METRIC_FIELDS.values())},
+    params      TEXT NOT NULL,
+    PRIMARY KEY (run_name, stage, indicator, phase, seq)
+);
+CREATE INDEX IF NOT EXISTS projects_market ON projects (symbol, period);
+CREATE INDEX IF NOT EXISTS combined_stage ON combined (stage, indicator);
+CREATE INDEX IF NOT EXISTS passes_best ON passes (run_name, stage, indicator, phase, result DESC);
+"""
+
+_PASS_COLUMNS = ", ".join(["stage", "indicator", "phase", "seq", *METRIC_FIELDS.values(), "params"])
+
+
+class ResultsWarehouse:
+    """ One SQLite database of the results of every project under OUTPUT_DIR, for queries across projects.
+
+    `refresh()` incrementally ingests each project's config.yaml, the 1_combined_results.csv of every stage and the
+    IS/OOS reports (via the project's results store). Files are tracked by mtime/size and reports by SHA-256, so a
+    refresh only re-reads what changed, and projects or stages removed from OUTPUT_DIR are dropped.
+
+    The query methods read the database only; call `refresh()` first to pick up new runs.
+
+    param output_dir: Folder holding the project output folders (default: OUTPUT_DIR)
+    param path: Database file (default: <output_dir>/results_warehouse.sqlite)
+    """
+
+    def __init__(self, output_dir: Path = None, path: Path = None):
+        self.output_dir = Path(output_dir) if output_dir else load_paths()["OUTPUT_DIR"]
+        self.path = Path(path) if path else self.output_dir / WAREHOUSE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def refresh(self) -> None:
+        """ Ingest new or changed projects, stage summaries and reports, and drop those that were removed. """
+        runs = []
+        for run_dir in sorted(p for p in self.output_dir.iterdir() if p.is_dir()):
+            results_dirs = sorted(p for p in run_dir.glob("*/results") if p.is_dir())
+            if not results_dirs and not (run_dir / CONFIG_FILE).exists():
+                continue
+
+            runs.append(run_dir.name)
+            self._refresh_project(run_dir)
+            self._refresh_combined(run_dir.name, results_dirs)
+            self._refresh_reports(run_dir, results_dirs)
+
+        stale = [r[0] for r in self._conn.execute("SELECT run_name FROM projects")]
+        for run_name in set(stale) - set(runs):
+            self._drop_run(run_name)
+
+        self._analyse()
+        logger.info(f"Results warehouse refreshed: {len(runs)} project(s) in {self.path.name}")
+
+    def query(self, sql: str, params: tuple | dict = ()) -> pd.DataFrame:
+        """ Run a read query against the warehouse tables (projects, combined, reports, passes).
+
+        param sql: SQL SELECT statement
+        param params: Query parameters
+        return: Result as a DataFrame
+        """
+        cursor = self._conn.execute(sql, params)
+        return pd.DataFrame(cursor.fetchall(), columns=[d[0] for d in cursor.description])
+
+    def combined_results(self, stage: str = None, symbol: str = None, period: str = None, since=None,
+                         until=None) -> pd.DataFrame:
+        """ Return the combined IS/OOS results rows of every project, with the project's market settings.
+
+        param stage: Optional stage name (e.g. 'Trigger')
+        param symbol: Optional main chart symbol (e.g. 'EURUSD')
+        param period: Optional chart period (e.g. 'D1')
+        param since: Optional date/datetime (or ISO string): only stage summaries updated at or after it
+        param until: Optional date/datetime (or ISO string): only stage summaries updated before it
+        return: DataFrame with run_name, stage, indicator, the combined metrics, tier, updated, symbol and period
+        """
+        where, params = _filters(stage, symbol, period, since, until)
+        return self.query(
+            f"SELECT c.*, p.symbol, p.period FROM combined c LEFT JOIN projects p USING (run_name) {where} "
+            f"ORDER BY c.run_name, c.stage, c.Res_OOS DESC", params)
+
+    def best_indicators(self, stage: str, metric: str = "PF_OOS", symbol: str = None, period: str = None,
+                        since=None, until=None, top: int = 10) -> pd.DataFrame:
+        """ Rank the indicators of a stage by a combined-results metric, averaged across projects.
+
+        param stage: Stage name (e.g. 'Trigger')
+        param metric: Combined results column (e.g. 'PF_OOS', 'Res_OOS')
+        param symbol: Optional main chart symbol (e.g. 'EURUSD')
+        param period: Optional chart period (e.g. 'D1')
+        param since: Optional date/datetime (or ISO string): only stage summaries updated at or after it
+        param until: Optional date/datetime (or ISO string): only stage summaries updated before it
+        param top: Number of indicators
+        return: DataFrame with indicator, projects, mean, best and worst of the metric, sorted by the mean
+        raises ValueError: If the metric is not a combined results column
+        """
+        if metric not in COMBINED_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {COMBINED_METRICS}")
+
+        where, params = _filters(stage, symbol, period, since, until)
+        return self.query(
+            f"SELECT c.indicator, COUNT(*) AS projects, AVG(c.{metric}) AS mean, MAX(c.{metric}) AS best, "
+            f"MIN(c.{metric}) AS worst FROM combined c LEFT JOIN projects p USING (run_name) {where} "
+            f"GROUP BY c.indicator ORDER BY mean DESC LIMIT ?", (*params, top))
+
+    def passes(self, run_name: str, stage: str, indicator: str, phase: str = "IS", n: int = 10) -> pd.DataFrame:
+        """ Return the best n passes (by Result) of one report, with its inputs.
+
+        param run_name: Project name
+        param stage: Stage name
+        param indicator: Indicator name
+        param phase: 'IS' or 'OOS'
+        param n: Number of passes
+        return: DataFrame with the report's metric and input columns
+        """
+        rows = self._conn.execute(
+            f"SELECT {', '.join(METRIC_FIELDS.values())}, params FROM passes "
+            f"WHERE run_name = ? AND stage = ? AND indicator = ? AND phase = ? ORDER BY result DESC, seq LIMIT ?",
+            (run_name, stage, indicator, phase, n)).fetchall()
+        records = [{**dict(zip(METRIC_FIELDS, row[:-1])), **json.loads(row[-1])} for row in rows]
+        return pd.DataFrame(records)
+
+    def _refresh_project(self, run_dir: Path) -> None:
+        """ (Re)load a project's config.yaml; a project without one is still listed, with empty settings. """
+        config_path = run_dir / CONFIG_FILE
+        stat = self._changed(config_path)
+        self._conn.execute("INSERT OR IGNORE INTO projects (run_name) VALUES (?)", (run_dir.name,))
+        if stat is None:
+            return
+
+        try:
+            with open(config_path, "r") as f:
+                config = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            logger.warning(f"Skipping unreadable project config {config_path}: {e}")
+            return
+
+        values = [_text(config.get(key)) for key in PROJECT_FIELDS]
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO projects VALUES ({', '.join('?' * (len(PROJECT_FIELDS) + 2))})",
+                (run_dir.name, *values, json.dumps(config, default=str)))
+            self._mark(run_dir.name, config_path, stat)
+
+    def _refresh_combined(self, run_name: str, results_dirs: list[Path]) -> None:
+        """ (Re)load the 1_combined_results.csv of each stage, dropping stages that no longer have one. """
+        stages = []
+        for results_dir in results_dirs:
+            summary_path = results_dir / SUMMARY_FILE
+            if not summary_path.exists():
+                continue
+            stage = results_dir.parent.name
+            stages.append(stage)
+
+            stat = self._changed(summary_path)
+            if stat is None:
+                continue
+            try:
+                table = pd.read_csv(summary_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable combined results {summary_path}: {e}")
+                continue
+
+            updated = datetime.fromtimestamp(stat.st_mtime_ns / 1e9).isoformat(timespec="seconds")
+            columns = [_numbers(table, column) for column in COMBINED_METRICS]
+            tiers = table["Tier"].tolist() if "Tier" in table.columns else [None] * len(table)
+            rows = zip(table["Indicator"].astype(str), *columns, tiers)
+
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.execute("DELETE FROM combined WHERE run_name = ? AND stage = ?", (run_name, stage))
+                self._conn.executemany(
+                    f"INSERT INTO combined VALUES (?, ?, ?, {', '.join('?' * len(COMBINED_METRICS))}, ?, ?)",
+                    ((run_name, stage, *row, updated) for row in rows))
+                self._mark(run_name, summary_path, stat)
+
+        placeholders = ", ".join("?" * len(stages))
+        self._conn.execute(f"DELETE FROM combined WHERE run_name = ? AND stage NOT IN ({placeholders})",
+                           (run_name, *stages))
+
+    def _refresh_reports(self, run_dir: Path, results_dirs: list[Path]) -> None:
+        """ Copy new or changed reports from the project's results store, dropping reports it no longer has. """
+        for results_dir in results_dirs:
+            with ResultsStore(results_dir) as store:
+                store.sync()
+
+        run_store = run_dir / RESULTS_STORE_FILE
+        if not run_store.exists():
+            self._drop_reports(run_dir.name)
+            return
+
+        run_name = run_dir.name
+        self._conn.execute("ATTACH DATABASE ? AS run", (str(run_store),))
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                stale = self._conn.execute(
+                    "SELECT stage, indicator, phase FROM reports w WHERE run_name = ? AND NOT EXISTS ("
+                    " SELECT 1 FROM run.reports r WHERE r.stage = w.stage AND r.indicator = w.indicator"
+                    " AND r.phase = w.phase AND r.sha256 = w.sha256)", (run_name,)).fetchall()
+                for key in stale:
+                    for table in ("reports", "passes"):
+                        self._conn.execute(f"DELETE FROM {table} WHERE run_name = ? AND stage = ? AND indicator = ? "
+                                           f"AND phase = ?", (run_name, *key))
+
+                new = self._conn.execute(
+                    "SELECT stage, indicator, phase, sha256, columns FROM run.reports r WHERE NOT EXISTS ("
+                    " SELECT 1 FROM reports w WHERE w.run_name = ? AND w.stage = r.stage AND w.indicator = r.indicator"
+                    " AND w.phase = r.phase)", (run_name,)).fetchall()
+                for stage, indicator, phase, sha256, columns in new:
+                    self._conn.execute("INSERT INTO reports VALUES (?, ?, ?, ?, ?, ?)",
+                                       (run_name, stage, indicator, phase, sha256, columns))
+                    self._conn.execute(
+                        f"INSERT INTO passes (run_name, {_PASS_COLUMNS}) SELECT ?, {_PASS_COLUMNS} FROM run.passes "
+                        f"WHERE stage = ? AND indicator = ? AND phase = ?", (run_name, stage, indicator, phase))
+        finally:
+            self._conn.execute("DETACH DATABASE run")
+
+        if stale or new:
+            logger.debug(f"Warehouse: {run_name}: {len(new)} report(s) loaded, {len(stale)} dropped")
+
+    def _changed(self, path: Path) -> os.stat_result | None:
+        """ Return the stat of a file if it is new or changed since it was ingested, else None. """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        row = self._conn.execute("SELECT mtime_ns, size FROM sources WHERE path = ?", (str(path),)).fetchone()
+        return None if row == (stat.st_mtime_ns, stat.st_size) else stat
+
+    def _mark(self, run_name: str, path: Path, stat: os.stat_result) -> None:
+        """ Record a file as ingested. Call inside the transaction that ingested it. """
+        self._conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                           (str(path), run_name, stat.st_mtime_ns, stat.st_size))
+
+    def _analyse(self) -> None:
+        """ Refresh the query planner statistics, so filters on project settings start from the projects index.
+
+        The passes table is left out: it is only read by its primary key, and analysing it would scan every pass.
+        """
+        self._conn.execute("ANALYZE projects")
+        self._conn.execute("ANALYZE combined")
+
+    def _drop_reports(self, run_name: str) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for table in ("reports", "passes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_name = ?", (run_name,))
+
+    def _drop_run(self, run_name: str) -> None:
+        """ Remove a project that is no longer in OUTPUT_DIR. """
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            for table in ("sources", "projects", "combined", "reports", "passes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_name = ?", (run_name,))
+        logger.debug(f"Warehouse: dropped removed project {run_name}")
+
+
+def _filters(stage: str, symbol: str, period: str, since, until) -> tuple[str, tuple]:
+    """ Build the WHERE clause of the combined-results queries. """
+    clauses, params = [], []
+    for clause, value in (("c.stage = ?", stage), ("p.symbol = ?", symbol), ("p.period = ?", period),
+                          ("c.updated >= ?", _timestamp(since)), ("c.updated < ?", _timestamp(until))):
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), tuple(params)
+
+
+def _timestamp(value) -> str | None:
+    """ ISO form of a date/datetime filter, comparable with the stored `updated` timestamps. """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _numbers(table: pd.DataFrame, column: str) -> list:
+    """ Return a column as Python floats for sqlite3; a missing column or invalid value is None. """
+    if column not in table.columns:
+        return [None] * len(table)
+    return [None if v != v else v for v in pd.to_numeric(table[column], errors="coerce").tolist()]  # NaN != NaN
+
+
+def _text(value) -> str | None:
+    return None if value is None else str(value)
@@ -0,0 +1,32 @@
+import logging
+
+import pandas as pd
+
+from strategy_factory.utils.sample_table import SAMPLE_IDX_INPUT
+
+logger = logging.getLogger(__name__)
+
+
+def add_sample_columns(report: pd.DataFrame, sample_table: pd.DataFrame | None) -> pd.DataFrame:
+    """ Map the inp_sample_idx column of an MT5 report back to the parameter values of the sample table.
+
+    The sampled inputs are inserted right after inp_sample_idx, so the report reads like one from a regular grid
+    optimisation (and `extract_optimisation_result` picks up real parameter values).
+
+    param report: Report table (one row per pass)
+    param sample_table: Sample table embedded in the EA, indexed by inp_sample_idx, or None
+    return: The report with the sampled inputs added (unchanged without a table or an index column)
+    """
+    if sample_table is None or SAMPLE_IDX_INPUT not in report.columns:
+        return report
+
+    index = pd.to_numeric(report[SAMPLE_IDX_INPUT], errors="coerce")
+    values = sample_table.reindex(index)
+    if values.isna().all(axis=None):
+        logger.warning(f"No {SAMPLE_IDX_INPUT} of the report is in the sample table")
+
+    report = report.drop(columns=[c for c in sample_table.columns if c in report.columns])
+    position = report.columns.get_loc(SAMPLE_IDX_INPUT) + 1
+    for offset, name in enumerate(sample_table.columns):
+        report.insert(position + offset, name, values[name].to_numpy())
+    return report
@@ -0,0 +1,107 @@
+import logging
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import yaml
+
+logger = logging.getLogger(__name__)
+
+TIERS_FILE = "1_tiers.yaml"
+SCREEN_TIER = "screen"
+FINAL_TIER = "final"
+
+
+def load_tier_manifest(results_dir: Path) -> dict | None:
+    """ Load the tier manifest of a tiered stage.
+
+    param results_dir: Stage results directory
+    return: Manifest dict (screen_model, final_model, final_top_k, screened, finalists, tiers), or None for a
+            single-tier stage
+    """
+    manifest_path = results_dir / TIERS_FILE
+    if not manifest_path.exists():
+        return None
+
+    with open(manifest_path, "r") as f:
+        return yaml.safe_load(f) or None
+
+
+def write_tier_manifest(results_dir: Path, manifest: dict) -> None:
+    """ Write the tier manifest of a tiered stage.
+
+    param results_dir: Stage results directory
+    param manifest: Dict with screen_model, final_model, final_top_k, screened (the ranked indicators), finalists
+                    and tiers ({indicator: tier})
+    """
+    with open(results_dir / TIERS_FILE, "w") as f:
+        yaml.safe_dump(manifest, f, sort_keys=False)
+
+
+def select_finalists(combined: pd.DataFrame, top_k: int, sort_by: str = "Res_OOS") -> list[str]:
+    """ Pick the indicators promoted from the screening tier to the final tier.
+
+    param combined: Combined IS/OOS results table (see `update_combined_results`)
+    param top_k: Number of indicators to promote
+    param sort_by: Column to rank on
+    return: Indicator names, best first
+    """
+    if combined.empty or sort_by not in combined.columns:
+        return []
+    return combined.sort_values(sort_by, ascending=False).head(top_k)["Indicator"].tolist()
+
+
+def promote_finalists(results_dir: Path, combined: pd.DataFrame | None, screen_model: int, final_model: int,
+                      top_k: int) -> list[str]:
+    """ Select the top-K screened indicators, archive their screening reports and write the tier manifest.
+
+    The manifest of an interrupted run is reused only if it was written for the same models, the same top_k and the
+    same screened indicators, so a resumed stage promotes the same finalists while a changed config or screening
+    result selects them again.
+
+    param results_dir: Stage results directory
+    param combined: Combined results table of the screening tier
+    param screen_model: Tester model of the screening tier
+    param final_model: Tester model of the final tier
+    param top_k: Number of indicators to promote
+    return: Indicator names to re-run at final fidelity, best first
+    """
+    screened = sorted(combined["Indicator"]) if combined is not None and "Indicator" in combined.columns else []
+    selection = {"screen_model": screen_model, "final_model": final_model, "final_top_k": top_k, "screened": screened}
+
+    manifest = load_tier_manifest(results_dir)
+    if manifest and all(manifest.get(key) == value for key, value in selection.items()):
+        return manifest.get("finalists") or []
+
+    finalists = select_finalists(combined, top_k) if combined is not None else []
+    logger.info(f"Promoting {len(finalists)} indicator(s) to the final tier (Model={final_model}): "
+                f"{', '.join(finalists)}")
+
+    # Keep the screening reports of the finalists; the final tier overwrites <indi>_IS/OOS.csv
+    screen_dir = results_dir / SCREEN_TIER
+    screen_dir.mkdir(exist_ok=True)
+    for indicator in finalists:
+        for phase in ("IS", "OOS"):
+            report = results_dir / f"{indicator}_{phase}.csv"
+            if report.exists():
+                shutil.copyfile(report, screen_dir / report.name)
+
+    write_tier_manifest(results_dir, {**selection, "finalists": finalists, "tiers": {}})
+    return finalists
+
+
+def add_tier_column(results_dir: Path, combined: pd.DataFrame) -> pd.DataFrame:
+    """ Add a Tier column recording which tier produced each row, if the stage is tiered.
+
+    param results_dir: Stage results directory
+    param combined: Combined IS/OOS results table
+    return: The table with a Tier column (unchanged for single-tier stages)
+    """
+    manifest = load_tier_manifest(results_dir)
+    if not manifest:
+        return combined
+
+    tiers = manifest.get("tiers") or {}
+    combined = combined.copy()
+    combined["Tier"] = combined["Indicator"].map(tiers).fillna(SCREEN_TIER)
+    return combined
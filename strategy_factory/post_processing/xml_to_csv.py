@@ -1,50 +1,201 @@
-from xml.sax import parse, ContentHandler
+import csv
+import math
+import os
+import threading
+from collections.abc import Iterator
 from pathlib import Path
+from xml.parsers import expat
 import pandas as pd
 import logging
 
+from .sample_index import add_sample_columns
+
 logger = logging.getLogger(__name__)
 
 
-def write_xml_to_csv(xml_path: Path, output_csv_path: Path):
-    """ Parse XML and write its full table to a CSV file.
+def write_xml_to_csv(xml_path: Path, output_csv_path: Path, sample_table: pd.DataFrame = None):
+    """ Parse XML and write its first table to a CSV file.
+
+    Rows are written as they are parsed (see `iter_report_rows`), so memory use does not grow with the number of passes.
+    Number cells are written as plain ints/floats (see `parse_number`), so the CSV columns read back as numeric.
 
     param xml_path: Path to the MT5 XML result file
     param output_csv_path: Path where the CSV should be saved
+    param sample_table: Optional sample table of the EA, used to map inp_sample_idx back to parameter values
     """
-    handler = ExcelHandler()
-    parse(str(xml_path), handler)
+    if sample_table is not None:
+        # Sampled runs have at most one pass per table row, so the report is small enough to map in memory
+        rows = None
+        report = read_xml_report(xml_path)
+        header = None if report is None else list(report.columns)
+    else:
+        rows = (typed_row(row, types) for row, types in iter_report_rows(xml_path))
+        header = next(rows, None)
 
-    if not handler.tables:
+    if header is None:
         logger.info(f"[WARNING] No data found in XML: {xml_path.name}")
         return
 
-    df = pd.DataFrame(handler.tables[0][1:], columns=handler.tables[0][0])
     output_csv_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_csv_path, index=False)
+
+    # Write next to the destination and move into place, so a crash never leaves a half-written CSV behind
+    tmp_path = output_csv_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    if rows is None:
+        add_sample_columns(report, sample_table).to_csv(tmp_path, index=False)
+    else:
+        with open(tmp_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    os.replace(tmp_path, output_csv_path)
     logging.info(f"[INFO] Saved XML data to CSV: {output_csv_path.name}")
 
 
-class ExcelHandler(ContentHandler):
-    def __init__(self):
-        self.tables = []
-        self.chars = []
+def write_forward_xml_to_csv(forward_xml_path: Path, is_csv_path: Path, output_csv_path: Path,
+                             sample_table: pd.DataFrame = None) -> bool:
+    """ Convert an MT5 forward-test report (<Report>.forward.xml) into the shape of an OOS report CSV.
+
+    The forward report holds one row per optimisation pass with 'Forward Result' and 'Back Result' columns. The row of
+    the best IS pass (highest Result, first in file order on ties, as in `ResultsStore.best`) becomes the OOS result,
+    with 'Forward Result' as 'Result'.
+
+    param forward_xml_path: Path to the forward XML report
+    param is_csv_path: Path to the converted IS report of the same run
+    param output_csv_path: Path where the OOS-shaped CSV should be saved
+    param sample_table: Optional sample table of the EA, used to map inp_sample_idx back to parameter values
+    return: True if the CSV was written
+    """
+    forward = read_xml_report(forward_xml_path)
+    if forward is None:
+        logger.info(f"[WARNING] No data found in XML: {forward_xml_path.name}")
+        return False
+
+    is_report = pd.read_csv(is_csv_path, dtype=str)
+    is_result = pd.to_numeric(is_report["Result"], errors="coerce").sort_values(ascending=False, kind="stable")
+    best_pass = str(is_report.loc[is_result.index[0], "Pass"])
+
+    row = forward[forward["Pass"].astype(str) == best_pass]
+    if row.empty:
+        logger.warning(f"Pass {best_pass} not found in forward report: {forward_xml_path.name}")
+        return False
+
+    row = row.drop(columns=["Back Result"], errors="ignore").rename(columns={"Forward Result": "Result"})
+    row = add_sample_columns(row, sample_table)
+
+    output_csv_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_csv_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    row.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, output_csv_path)
+    logging.info(f"[INFO] Saved forward XML data to CSV: {output_csv_path.name}")
+    return True
+
+
+def read_xml_report(xml_path: Path) -> pd.DataFrame | None:
+    """ Read the first table of an MT5 XML report into a DataFrame with typed columns.
+
+    Columns whose cells are ss:Type="Number" are parsed as int or float columns, the rest stay strings.
+
+    param xml_path: Path to the MT5 XML report
+    return: DataFrame with one row per pass, or None if the report has no table
+    """
+    rows = iter_report_rows(xml_path)
+    header, _ = next(rows, (None, None))
+    if header is None:
+        return None
+
+    values, types = [], []
+    for row, row_types in rows:
+        values.append(typed_row(row, row_types))
+        types = types or row_types
+    df = pd.DataFrame(values, columns=header)
+    for i, kind in enumerate(types[:len(header)]):
+        if kind == "Number":
+            df.isetitem(i, pd.to_numeric(df.iloc[:, i], errors="coerce"))
+    return df
+
+
+def typed_row(row: list[str], types: list[str]) -> list:
+    """ Convert the Number cells of a report row (see `iter_report_rows`) with `parse_number`; other cells are kept. """
+    return [parse_number(text) if kind == "Number" else text for text, kind in zip(row, types)] + row[len(types):]
+
+
+def parse_number(text: str) -> int | float | str:
+    """ Parse the text of an ss:Type="Number" cell as MT5 writes it.
+
+    Thousands separators (spaces, non-breaking spaces or commas next to a decimal point) are dropped and a lone decimal
+    comma is read as a point. Values that are not finite numbers (e.g. '-nan(ind)', 'inf', '1.#INF') become ''.
+
+    param text: Cell text
+    return: int, float, or '' for a missing or invalid value
+    """
+    number = _plain_number(text)
+    if number is None:
+        # Locale formatting is rare, so it is only normalised once the plain parse failed
+        value = "".join(text.split())
+        number = _plain_number(value.replace(",", "") if "." in value else value.replace(",", "."))
+    return "" if number is None else number
+
+
+def _plain_number(text: str) -> int | float | None:
+    """ int or float of a plain number, or None if it is not one or not finite. """
+    if text.isdecimal() or text[:1] == "-" and text[1:].isdecimal():
+        return int(text)
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def iter_report_rows(xml_path: Path, chunk_size: int = 1 << 20) -> Iterator[tuple[list[str], list[str]]]:
+    """ Stream the rows of the first table of an MT5 XML report as they are parsed.
 
-    def characters(self, content):
-        self.chars.append(content)
+    The file is fed to expat in chunks and the rows of each chunk are yielded before the next one is read, so memory
+    use does not grow with the size of the report. Parsing stops at the end of the first table.
 
-    def startElement(self, name, attrs):
-        if name == "Table":
-            self.rows = []
+    param xml_path: Path to the MT5 XML report
+    param chunk_size: Bytes read per chunk
+    return: Iterator over (cell texts, ss:Type of each cell) per row, the header row first
+    """
+    rows, row, types, text = [], [], [], []
+    data_type = [None]
+    table_done = []
+
+    def start(name, attrs):
+        if name == "Data":
+            data_type[0] = attrs.get("ss:Type")
+            text.clear()
+        elif name == "Cell" and "ss:Index" in attrs:
+            # Skipped (empty) cells
+            missing = int(attrs["ss:Index"]) - 1 - len(row)
+            row.extend([""] * missing)
+            types.extend([None] * missing)
         elif name == "Row":
-            self.cells = []
-        elif name == "Data":
-            self.chars = []
+            row.clear()
+            types.clear()
 
-    def endElement(self, name):
-        if name == "Table":
-            self.tables.append(self.rows)
+    def end(name):
+        if table_done:
+            return
+        if name == "Data":
+            row.append("".join(text))
+            types.append(data_type[0])
         elif name == "Row":
-            self.rows.append(self.cells)
-        elif name == "Data":
-            self.cells.append("".join(self.chars))
+            rows.append((row.copy(), types.copy()))
+        elif name == "Table":
+            table_done.append(True)
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = text.append
+
+    with open(xml_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            parser.Parse(chunk, not chunk)
+            yield from rows
+            rows.clear()
+            if table_done or not chunk:
+                return
@@ -1,2 +1,4 @@
 from .build_input_lines import build_input_lines
 from .load_results_data import load_results_data
+from .build_sample_lines import build_sample_lines
+from .upstream_context import UpstreamContext
@@ -1,25 +1,27 @@
-
-def build_input_lines(data: dict) -> list[str]:
+def build_input_lines(data: dict, sampled: list[str] = None) -> list[str]:
     """ Generate MQL5 `input` variable declarations from YAML input section.
 
     param data: Parsed indicator data dictionary
+    param sampled: Inputs taken from a sample table; these are declared as plain globals set by `apply_sample()`
     return: List of input declaration strings
     """
+    sampled = set(sampled or [])
     input_lines = []
     # For each input, create a proper MQL5 declaration line
     for var_name, props in data.get("indicator_inputs", {}).items():
         val = props["default"]
         typ = props["type"]
+        prefix = "" if var_name in sampled else "input "
 
         # Choose type-specific formatting
         if isinstance(val, int):
-            line = f"input int {var_name} = {val};"
+            line = f"{prefix}int {var_name} = {val};"
 
         elif isinstance(val, float):
-            line = f"input double {var_name} = {val};"
+            line = f"{prefix}double {var_name} = {val};"
 
         else:
-            line = f"input {typ} {var_name} = {val};"
+            line = f"{prefix}{typ} {var_name} = {val};"
 
         input_lines.append(line)
 
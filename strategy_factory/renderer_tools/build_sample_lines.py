@@ -0,0 +1,32 @@
+import pandas as pd
+
+from strategy_factory.utils.sample_table import SAMPLE_IDX_INPUT
+
+
+def build_sample_lines(table: pd.DataFrame | None) -> list[str]:
+    """ Generate the MQL5 code that embeds a sample table in an EA.
+
+    The table becomes one array per input, indexed by the optimisation input `inp_sample_idx`. `apply_sample()` copies
+    the selected row into the (non-input) globals, and must be called at the start of OnInit.
+
+    param table: Sample table (see `stage_sample_table`), or None
+    return: List of MQL5 lines, empty if there is no table
+    """
+    if table is None or table.empty:
+        return []
+
+    lines = [
+        f"input int {SAMPLE_IDX_INPUT} = 0;",
+        f"const int sample_count = {len(table)};",
+    ]
+    for name in table.columns:
+        mql_type = "int" if pd.api.types.is_integer_dtype(table[name]) else "double"
+        values = ", ".join(repr(v) for v in table[name].tolist())
+        lines.append(f"{mql_type} sample_{name}[] = {{{values}}};")
+
+    lines.append("void apply_sample() {")
+    lines.append(f"    if ({SAMPLE_IDX_INPUT} < 0 || {SAMPLE_IDX_INPUT} >= sample_count) return;")
+    for name in table.columns:
+        lines.append(f"    {name} = sample_{name}[{SAMPLE_IDX_INPUT}];")
+    lines.append("}")
+    return lines
@@ -1,13 +1,23 @@
 import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
 from strategy_factory.utils.pathing import load_paths
+from strategy_factory.utils.indicator_catalog import get_indicator_catalog
 import yaml
 
-from strategy_factory.stage_execution.stage_config import StageConfig
+if TYPE_CHECKING:
+    # Type-only import: stage_execution imports GenerateEA, which uses renderer_tools
+    from strategy_factory.stage_execution.stage_config import StageConfig
 
 logger = logging.getLogger(__name__)
 
 
-def load_results_data(run_name: str, stage: StageConfig) -> tuple[str, dict]:
+def results_yaml_path(run_name: str, stage: "StageConfig") -> Path:
+    """ Return the path of a stage's results YAML (OUTPUT_DIR/<run>/<Stage>/the_<stage>.yaml). """
+    return load_paths()["OUTPUT_DIR"] / run_name / stage.name / f"the_{stage.name.lower()}.yaml"
+
+
+def load_results_data(run_name: str, stage: "StageConfig") -> tuple[str, dict]:
     """Load optimised indicator parameters for any stage and merge with base YAML.
 
     Reads the optimised values from the results YAML for this run/stage,
@@ -18,8 +28,7 @@ def load_results_data(run_name: str, stage: StageConfig) -> tuple[str, dict]:
     return: (indicator_name, merged_dict)
     """
     # 1. Build path to the results YAML for this stage
-    results_filename = f"the_{stage.name.lower()}.yaml"
-    results_path = load_paths()["OUTPUT_DIR"] / run_name / stage.name / results_filename
+    results_path = results_yaml_path(run_name, stage)
 
     with open(results_path, "r") as f:
         result_data = yaml.safe_load(f)
@@ -33,8 +42,7 @@ def load_results_data(run_name: str, stage: StageConfig) -> tuple[str, dict]:
         indicator_dir = indicator_dir / stage.indi_dir
     base_yaml_path = indicator_dir / f"{indicator_name}.yaml"
 
-    with open(base_yaml_path, "r") as f:
-        base = yaml.safe_load(f)
+    base = get_indicator_catalog().document(base_yaml_path)
 
     base_data = base[indicator_name]
 
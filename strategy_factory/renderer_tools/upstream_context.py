@@ -0,0 +1,69 @@
+import copy
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from strategy_factory.utils.load_all_pipeline_stages import load_all_pipeline_stages
+
+from .load_results_data import load_results_data, results_yaml_path
+
+if TYPE_CHECKING:
+    from strategy_factory.stage_execution.stage_config import StageConfig
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamContext:
+    """ Per-run memo of the optimised upstream stages a renderer embeds in its EA.
+
+    Each upstream stage is loaded (the_<stage>.yaml merged into its base indicator YAML) on first use and served from
+    memory afterwards, so rendering N candidates of a stage loads every upstream stage once instead of N times. An entry
+    is revalidated with a stat() of its the_<stage>.yaml on each access and reloaded only if that file changed.
+
+    Thread-safe. Served data are deep copies, so renderers may modify them freely.
+
+    param project_config: Project configuration object (pipeline and run_name)
+    """
+
+    def __init__(self, project_config):
+        self.project_config = project_config
+        self._lock = threading.Lock()
+        self._stages: dict[str, "StageConfig"] | None = None
+        self._result_paths: dict[str, Path] = {}
+        self._results: dict[str, tuple[tuple[int, int], str, dict]] = {}  # stage -> ((mtime_ns, size), name, data)
+
+    def stage(self, stage_name: str) -> "StageConfig":
+        """ Return a StageConfig of the project's pipeline, whose STAGES are imported once.
+
+        raises ValueError: If the pipeline has no stage with this name
+        """
+        with self._lock:
+            if self._stages is None:
+                self._stages = {s.name: s for s in load_all_pipeline_stages(self.project_config.pipeline)}
+        if stage_name not in self._stages:
+            raise ValueError(f"Invalid stage name: '{stage_name}'")
+        return self._stages[stage_name]
+
+    def results(self, stage_name: str) -> tuple[str, dict]:
+        """ Return the optimised indicator of an upstream stage.
+
+        param stage_name: Name of the upstream stage (e.g. "Trigger")
+        return: (indicator_name, merged_dict), as returned by `load_results_data`
+        raises: FileNotFoundError if the stage has no results YAML yet
+        """
+        stage = self.stage(stage_name)
+        if stage_name not in self._result_paths:
+            self._result_paths[stage_name] = results_yaml_path(self.project_config.run_name, stage)
+        stat = self._result_paths[stage_name].stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._results.get(stage_name)
+            if cached is None or cached[0] != key:
+                name, data = load_results_data(self.project_config.run_name, stage)
+                cached = (key, name, data)
+                self._results[stage_name] = cached
+                logger.debug(f"Loaded upstream stage {stage_name}: {name}")
+
+        return cached[1], copy.deepcopy(cached[2])
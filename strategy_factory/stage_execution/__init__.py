@@ -1,2 +1,6 @@
 from .stage_runner import StageRunner
 from .stage_config import get_stage_config, StageConfig
+from .terminal_pool import TerminalInstance, TerminalPool
+from .job_scheduler import JobScheduler
+from .run_journal import RunJournal
+from .resource_monitor import ResourceSampler
@@ -1,14 +1,22 @@
 import logging
+from pathlib import Path
+
 from strategy_factory.utils.pathing import load_paths
 
 logger = logging.getLogger(__name__)
 
 
-def delete_mt5_test_cache():
-    """Deletes all files in the MetaTrader 5 Tester\\cache directory and all .xml files in the MT5 root directory."""
-    paths = load_paths()
-    test_cache_dir = paths["MT5_TEST_CACHE"]
-    mt5_root = paths["MT5_ROOT"]
+def delete_mt5_test_cache(mt5_root: Path = None):
+    """Deletes all files in the MetaTrader 5 Tester\\cache directory and all .xml files in the MT5 root directory.
+
+    param mt5_root: Optional terminal data folder to clean (e.g. a pool instance). Defaults to the main MT5_ROOT.
+    """
+    if mt5_root is None:
+        paths = load_paths()
+        test_cache_dir = paths["MT5_TEST_CACHE"]
+        mt5_root = paths["MT5_ROOT"]
+    else:
+        test_cache_dir = mt5_root / "Tester" / "cache"
 
     # Delete all files in the test cache directory
     deleted_cache = 0
@@ -1,41 +1,222 @@
+import asyncio
 import logging
-from subprocess import run, CalledProcessError
+from concurrent.futures import CancelledError
+from dataclasses import dataclass, field
+from subprocess import CalledProcessError
 from time import perf_counter
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 import psutil
-import sys
 
-from strategy_factory.utils import load_paths
+from strategy_factory.utils import annotate, load_paths, span, traced
+from .resource_monitor import ResourceSampler
 
 logger = logging.getLogger(__name__)
 
+# Seconds a terminal gets to exit after terminate() before it is killed outright
+KILL_GRACE_SECONDS = 10.0
 
-def run_ea(ini_file: Path):
+
+class EATimeoutError(TimeoutError):
+    """Raised when an MT5 run exceeds its wall-clock timeout and was killed."""
+
+
+@dataclass
+class RunHandle:
+    """ Handle to a running MT5 terminal started by `run_ea_async`.
+
+    param ini_file: Path to the .ini configuration file being run
+    param command: Full command line used to start the terminal
+    param process: The asyncio subprocess running the terminal
+    param timeout: Wall-clock timeout in seconds, or None for no limit
+    param sampler: Resource sampler of the run (set by `run_ea` when sampling), also for a run that failed
+    """
+    ini_file: Path
+    command: list[str]
+    process: asyncio.subprocess.Process
+    timeout: Optional[float] = None
+    started: float = field(default_factory=perf_counter)
+    cancelled: bool = False
+    sampler: Optional[ResourceSampler] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    async def wait(self) -> int:
+        """ Wait for the terminal to exit, killing its process tree if the timeout expires.
+
+        return: The terminal's return code (always 0)
+        raises EATimeoutError: If the run exceeded its timeout
+        raises asyncio.CancelledError: If the run was cancelled via `cancel()` or the awaiting task was cancelled
+        raises CalledProcessError: If the terminal exited with a non-zero return code
+        """
+        try:
+            return_code = await asyncio.wait_for(self.process.wait(), timeout=self.timeout)
+
+        except asyncio.TimeoutError:
+            logger.error(f"MT5 timed out ({self.ini_file.name}) after {self.elapsed:.2f}s; killing process tree")
+            await self.kill()
+            raise EATimeoutError(f"MT5 run {self.ini_file.name} exceeded {self.timeout}s timeout")
+
+        except asyncio.CancelledError:
+            await self.kill()
+            raise
+
+        if self.cancelled:
+            raise asyncio.CancelledError(f"MT5 run {self.ini_file.name} was cancelled")
+
+        if return_code != 0:
+            logger.error(f"MT5 failed ({self.ini_file.name}) after {self.elapsed:.2f}s with return code {return_code}")
+            raise CalledProcessError(return_code, self.command)
+
+        logger.info(f"MT5 ran successfully ({self.ini_file.name}) in {self.elapsed:.2f}s")
+        return return_code
+
+    async def cancel(self) -> None:
+        """ Cancel the run by killing the terminal and its tester agents. """
+        self.cancelled = True
+        logger.warning(f"Cancelling MT5 run ({self.ini_file.name})")
+        await self.kill()
+
+    def cancel_from_thread(self) -> None:
+        """ Cancel the run from outside its event loop (e.g. another thread), blocking until the process tree is gone.
+
+        The awaiting `wait()` then raises asyncio.CancelledError.
+        """
+        self.cancelled = True
+        logger.warning(f"Cancelling MT5 run ({self.ini_file.name})")
+        kill_process_tree(self.pid)
+
+    async def kill(self) -> None:
+        """ Terminate the terminal process tree without blocking the event loop. """
+        if self.process.returncode is None:
+            await asyncio.to_thread(kill_process_tree, self.pid)
+            await self.process.wait()
+
+
+async def run_ea_async(ini_file: Path, terminal_exe: Path = None, portable: bool = False,
+                       timeout: Optional[float] = None) -> RunHandle:
+    """ Start a MetaTrader 5 instance for an .ini file and return immediately with a handle to the run.
+
+    Await `handle.wait()` for completion; several handles can be awaited together with `wait_all`.
+
+    param ini_file: Path to the .ini configuration file to run
+    param terminal_exe: Optional terminal executable (e.g. a pool instance). Defaults to MT5_TERM_EXE.
+    param portable: If True, launch the terminal with /portable so it uses its install folder as data folder
+    param timeout: Wall-clock timeout in seconds for the run, or None for no limit
+    return: RunHandle for the started terminal
+    raises RuntimeError: If the terminal is already running outside the pipeline
+    """
+    mt5_terminal = str(terminal_exe or load_paths()["MT5_TERM_EXE"])
+
+    if is_mt5_running(mt5_terminal):
+        raise RuntimeError(f"MetaTrader 5 terminal is already running: {mt5_terminal}")
+
+    return await _start_terminal(ini_file, mt5_terminal, portable, timeout)
+
+
+async def _start_terminal(ini_file: Path, mt5_terminal: str, portable: bool, timeout: Optional[float]) -> RunHandle:
+    """ Spawn the terminal process for an .ini file and wrap it in a RunHandle. """
+    command = [mt5_terminal, "/portable"] if portable else [mt5_terminal]
+    command.append(f"/config:{ini_file}")
+
+    logger.info(f"Running MT5 with INI: {ini_file}")
+    process = await asyncio.create_subprocess_exec(*command)
+    return RunHandle(ini_file=ini_file, command=command, process=process, timeout=timeout)
+
+
+async def wait_all(handles: Iterable[RunHandle]) -> list:
+    """ Await several runs at once.
+
+    param handles: RunHandles returned by `run_ea_async`
+    return: One entry per handle, either its return code or the exception it raised
+    """
+    return await asyncio.gather(*(handle.wait() for handle in handles), return_exceptions=True)
+
+
+@traced("run_ea")
+def run_ea(ini_file: Path, terminal_exe: Path = None, portable: bool = False, timeout: Optional[float] = None,
+           sample_interval: Optional[float] = None,
+           on_start: Optional[Callable[[RunHandle], None]] = None) -> Optional[ResourceSampler]:
     """ Run a MetaTrader 5 instance using a specified .ini configuration file.
 
     param ini_file: Path to the .ini configuration file to run
+    param terminal_exe: Optional terminal executable (e.g. a pool instance). Defaults to MT5_TERM_EXE.
+    param portable: If True, launch the terminal with /portable so it uses its install folder as data folder
+    param timeout: Wall-clock timeout in seconds, or None for no limit. On expiry the process tree is killed and
+                   EATimeoutError is raised.
+    param sample_interval: If set, sample CPU, memory, disk I/O and agent count of the terminal process tree every
+                           this many seconds. The summary is added to the run's "optimise" trace span.
+    param on_start: Called with the RunHandle once the terminal has started, e.g. to cancel the run from another thread
+                    through `RunHandle.cancel_from_thread`
+    return: The ResourceSampler with the samples of the run, or None if sampling is disabled. For a run that raised,
+            it stays reachable through the handle passed to `on_start`.
+    raises RuntimeError: If the terminal is already running outside the pipeline
+    raises CancelledError: (concurrent.futures) If the run was cancelled
     """
-    start = perf_counter()
-    paths = load_paths()
-    mt5_terminal = str(paths["MT5_TERM_EXE"])
+    mt5_terminal = str(terminal_exe or load_paths()["MT5_TERM_EXE"])
 
     if not ini_file:
         logger.warning(f"No .ini files {ini_file} found")
         return
 
     if is_mt5_running(mt5_terminal):
-        logger.error("MetaTrader 5 terminal is already running! Please close it before starting the automated pipeline.")
-        sys.exit(1)  # Exit with error code
+        raise RuntimeError(f"MetaTrader 5 terminal is already running: {mt5_terminal}. "
+                           f"Please close it before starting the automated pipeline.")
+
+    async def _run():
+        with span("terminal_start"):
+            handle = await _start_terminal(ini_file, mt5_terminal, portable, timeout)
+        if on_start is not None:
+            on_start(handle)
+        with span("optimise", ini=ini_file.name):
+            sampler = ResourceSampler(handle.pid, sample_interval).start() if sample_interval else None
+            handle.sampler = sampler
+            try:
+                await handle.wait()
+            finally:
+                if sampler is not None:
+                    sampler.stop()
+                    annotate(**sampler.summary())
+        return sampler
 
     try:
-        logger.info(f"Running MT5 with INI: {ini_file}")
-        run([mt5_terminal, f'/config:{ini_file}'], check=True)
-        logger.info(f"MT5 ran successfully ({ini_file.name}) in {perf_counter() - start:.2f}s")
-
-    except CalledProcessError as e:
-        logger.error(f"MT5 failed ({ini_file.name}) after {perf_counter() - start:.2f}s "
-                     f"with return code {e.returncode}")
-        raise
+        return asyncio.run(_run())
+    except asyncio.CancelledError as e:
+        # asyncio's CancelledError is a BaseException: re-raised as the executor's, so it fails the job future
+        raise CancelledError(str(e)) from e
+
+
+def kill_process_tree(pid: int, grace: float = KILL_GRACE_SECONDS) -> None:
+    """ Terminate a process and all of its children, killing any that survive the grace period.
+
+    param pid: Process id of the tree root (the terminal)
+    param grace: Seconds to wait after terminate() before kill()
+    """
+    try:
+        parent = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return
+
+    procs = parent.children(recursive=True) + [parent]
+    for proc in procs:
+        try:
+            proc.terminate()
+        except psutil.NoSuchProcess:
+            pass
+
+    _, alive = psutil.wait_procs(procs, timeout=grace)
+    for proc in alive:
+        try:
+            logger.warning(f"Killing unresponsive process {proc.pid}")
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
 
 
 def is_mt5_running(mt5_path: str) -> bool:
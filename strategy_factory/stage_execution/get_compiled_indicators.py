@@ -1,17 +1,24 @@
 import logging
 from pathlib import Path
 
+from strategy_factory.gen_expert_advisor.batch_compiler import CompileReport
+
 logger = logging.getLogger(__name__)
 
 
-def get_compiled_indicators(expert_dir: Path) -> list[str]:
+def get_compiled_indicators(expert_dir: Path, compile_report: CompileReport = None) -> list[str]:
     """ Scan a directory for compiled EAs and report missing .ex5 files.
 
     param expert_dir: Directory containing .mq5/.ex5 files
+    param compile_report: Optional result of the batch compile of this directory. If given, it is used instead of
+                          scanning, and the MetaEditor logs of failed EAs are included in the debug report.
     return: List of names of compiled indicators (present as both .mq5 and .ex5)
     """
     _logger = logging.getLogger(__name__)
 
+    if compile_report is not None:
+        return _from_compile_report(expert_dir, compile_report)
+
     # List to store indicator names that are fully compiled (both .mq5 and .ex5 present)
     compiled_indicators = []
 
@@ -51,3 +58,23 @@ def get_compiled_indicators(expert_dir: Path) -> list[str]:
 
     # Return only the names of indicators that are present and compiled
     return compiled_indicators
+
+
+def _from_compile_report(expert_dir: Path, compile_report: CompileReport) -> list[str]:
+    """ Return the compiled indicators recorded in a CompileReport and write the failures to a debug report. """
+    compiled_indicators = [name for name in compile_report.compiled if (expert_dir / f"{name}.ex5").exists()]
+
+    if compile_report.failed:
+        for result in compile_report.failed:
+            logger.warning(f"MQ5 exists but EX5 missing for: {result.name}")
+
+        report_path = expert_dir / "00_un_compiled.txt"
+        compile_report.write_failure_report(report_path)
+        logger.info(f"Wrote un-compiled list to: {report_path}")
+
+    if not compiled_indicators:
+        logger.info("No compiled indicators (.ex5) found.")
+    else:
+        logger.info(f"Found {len(compiled_indicators)} compiled indicators.")
+
+    return compiled_indicators
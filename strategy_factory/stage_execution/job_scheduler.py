@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .terminal_pool import TerminalPool
+
+logger = logging.getLogger(__name__)
+
+PENDING, READY, RUNNING, DONE, FAILED, SKIPPED, CANCELLED = (
+    "pending", "ready", "running", "done", "failed", "skipped", "cancelled")
+FINISHED_STATES = {DONE, FAILED, SKIPPED, CANCELLED}
+
+# Wakes the dispatch loop without a finished job (used by cancel())
+_WAKE = object()
+
+
+@dataclass(eq=False)
+class Job:
+    """ A unit of terminal work in the stage DAG.
+
+    When a job runs, the results of its dependencies are appended to `args` in the order of `depends_on`, and the
+    terminal it was dispatched to is passed as `terminal=`.
+
+    param job_id: Unique id (e.g. 'aroon:IS')
+    param fn: Callable to run on a terminal
+    param args: Positional arguments for `fn`
+    param kwargs: Keyword arguments for `fn`
+    param depends_on: Ids of jobs that must finish successfully first
+    param priority: Higher runs first among ready jobs
+    param group: Jobs sharing a group (e.g. an indicator) complete a single group future together
+    """
+    job_id: str
+    fn: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    depends_on: tuple[str, ...] = ()
+    priority: int = 0
+    group: str = None
+    state: str = PENDING
+    result: Any = None
+    error: BaseException | None = None
+
+
+class JobScheduler:
+    """ Run a DAG of tester jobs on a TerminalPool, keeping every terminal busy until the graph drains.
+
+    At most one job per terminal is in flight. Whenever a terminal frees up, the highest-priority ready job is
+    dispatched to it, so a dependent job (e.g. an OOS backtest) starts as soon as its parent finishes instead of
+    queueing behind all remaining independent jobs. A job whose dependency failed, was cancelled or returned None is
+    skipped.
+
+    param pool: Terminal pool the jobs are dispatched to
+    """
+
+    def __init__(self, pool: TerminalPool):
+        self.pool = pool
+        self.jobs: dict[str, Job] = {}
+        self._dependents: dict[str, list[Job]] = {}
+        self._groups: dict[str, list[Job]] = {}
+        self._ready: list[tuple[int, int, Job]] = []
+        self._order = itertools.count()
+        self._finished: queue.Queue = queue.Queue()
+        self._group_futures: dict[str, Future] = {}
+        self._in_flight = 0
+        self._cancelled = False
+        self._thread: threading.Thread | None = None
+
+    def add(self, job_id: str, fn: Callable, *args, depends_on: tuple[str, ...] = (), priority: int = 0,
+            group: str = None, **kwargs) -> Job:
+        """ Add a job to the graph. Dependencies must already have been added, which keeps the graph acyclic.
+
+        param job_id: Unique id of the job
+        param fn: Callable to run; receives `*args, *dependency_results, terminal=..., **kwargs`
+        param depends_on: Ids of the jobs this one waits for
+        param priority: Higher runs first among ready jobs
+        param group: Optional group name. Defaults to the job id.
+        return: The added Job
+        """
+        if self._thread is not None:
+            raise RuntimeError("Cannot add jobs after the scheduler has started.")
+        if job_id in self.jobs:
+            raise ValueError(f"Duplicate job id: {job_id}")
+        missing = [dep for dep in depends_on if dep not in self.jobs]
+        if missing:
+            raise ValueError(f"Job {job_id} depends on unknown job(s): {', '.join(missing)}")
+
+        job = Job(job_id=job_id, fn=fn, args=args, kwargs=kwargs, depends_on=tuple(depends_on), priority=priority,
+                  group=group or job_id)
+        self.jobs[job_id] = job
+        self._groups.setdefault(job.group, []).append(job)
+        for dep in job.depends_on:
+            self._dependents.setdefault(dep, []).append(job)
+        return job
+
+    def start(self) -> dict[str, Future]:
+        """ Start dispatching jobs on a background thread and return immediately.
+
+        return: Dict of group name -> Future. A group's future resolves to {job_id: result} once all of its jobs have
+                finished, or raises the first error of the group.
+        """
+        if self._thread is not None:
+            raise RuntimeError("JobScheduler can only be started once.")
+
+        self._group_futures = {group: Future() for group in self._groups}
+        for job in self.jobs.values():
+            if not job.depends_on:
+                self._make_ready(job)
+
+        self._thread = threading.Thread(target=self._dispatch_loop, name="job-scheduler", daemon=True)
+        self._thread.start()
+        return dict(self._group_futures)
+
+    def run(self) -> dict[str, Job]:
+        """ Run the whole graph and block until it drains.
+
+        return: Dict of job id -> Job with its final state, result and error
+        """
+        self.start()
+        self.join()
+        return self.jobs
+
+    def join(self, timeout: float = None) -> None:
+        """ Block until the dispatch thread has finished. """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def cancel(self) -> None:
+        """ Stop dispatching. Jobs that have not started are cancelled; running jobs finish (or hit their timeout). """
+        self._cancelled = True
+        self._finished.put(_WAKE)
+
+    def _make_ready(self, job: Job) -> None:
+        job.state = READY
+        heapq.heappush(self._ready, (-job.priority, next(self._order), job))
+
+    def _dispatch_loop(self) -> None:
+        """ Dispatch ready jobs to free terminals and release dependents as jobs finish. """
+        try:
+            self._drain()
+        except Exception as e:
+            logger.exception(f"Job scheduler stopped unexpectedly: {e}")
+            for future in self._group_futures.values():
+                if not future.done():
+                    future.set_exception(e)
+
+    def _drain(self) -> None:
+        capacity = len(self.pool)
+
+        while True:
+            if self._cancelled:
+                self._cancel_pending()
+
+            while not self._cancelled and self._ready and self._in_flight < capacity:
+                _, _, job = heapq.heappop(self._ready)
+                self._dispatch(job)
+
+            if self._in_flight == 0:
+                break
+
+            item = self._finished.get()
+            if item is not _WAKE:
+                self._on_finished(*item)
+
+        self._cancel_pending()
+
+    def _dispatch(self, job: Job) -> None:
+        dep_results = tuple(self.jobs[dep].result for dep in job.depends_on)
+
+        job.state = RUNNING
+        self._in_flight += 1
+        logger.debug(f"Dispatching job {job.job_id}")
+
+        future = self.pool.submit(job.fn, *job.args, *dep_results, **job.kwargs)
+        future.add_done_callback(lambda f, j=job: self._finished.put((j, f)))
+
+    def _on_finished(self, job: Job, future: Future) -> None:
+        self._in_flight -= 1
+
+        if future.cancelled():
+            job.state = CANCELLED
+        elif future.exception() is not None:
+            job.state, job.error = FAILED, future.exception()
+            logger.error(f"Job {job.job_id} failed: {job.error}")
+        else:
+            job.state, job.result = DONE, future.result()
+
+        for dependent in self._dependents.get(job.job_id, []):
+            if dependent.state != PENDING:
+                continue
+
+            deps = [self.jobs[dep] for dep in dependent.depends_on]
+            if any(dep.state in (FAILED, CANCELLED, SKIPPED) or (dep.state == DONE and dep.result is None)
+                   for dep in deps):
+                self._skip(dependent)
+            elif all(dep.state == DONE for dep in deps):
+                self._make_ready(dependent)
+
+        self._resolve_group(job.group)
+
+    def _skip(self, job: Job) -> None:
+        """ Skip a job and, transitively, everything that depends on it. """
+        job.state = SKIPPED
+        logger.info(f"Skipping job {job.job_id}: a dependency did not produce a result")
+        for dependent in self._dependents.get(job.job_id, []):
+            if dependent.state == PENDING:
+                self._skip(dependent)
+        self._resolve_group(job.group)
+
+    def _cancel_pending(self) -> None:
+        for job in self.jobs.values():
+            if job.state in (PENDING, READY):
+                job.state = CANCELLED
+        self._ready.clear()
+        for group in self._group_futures:
+            self._resolve_group(group)
+
+    def _resolve_group(self, group: str) -> None:
+        """ Complete a group's future once all of its jobs have finished. """
+        future = self._group_futures[group]
+        members = self._groups[group]
+        if future.done() or any(job.state not in FINISHED_STATES for job in members):
+            return
+
+        errors = [job.error for job in members if job.state == FAILED]
+        if errors:
+            future.set_exception(errors[0])
+        elif any(job.state == CANCELLED for job in members):
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        else:
+            future.set_result({job.job_id: job.result for job in members})
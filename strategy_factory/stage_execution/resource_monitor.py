@@ -0,0 +1,142 @@
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from time import perf_counter
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between samples of a running terminal
+SAMPLE_INTERVAL = 5.0
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class ResourceSample:
+    """ Resource usage of a terminal process tree (terminal plus its tester agents) at one point of a run.
+
+    param t: Seconds since the sampler started
+    param cpu_percent: CPU use of the whole tree since the previous sample (100 = one core fully busy)
+    param rss_mb: Resident memory of the whole tree in MB
+    param read_mb: MB read from disk by the tree so far
+    param write_mb: MB written to disk by the tree so far
+    param agents: Number of child processes (tester agents) of the terminal
+    """
+    t: float
+    cpu_percent: float
+    rss_mb: float
+    read_mb: float
+    write_mb: float
+    agents: int
+
+
+class ResourceSampler:
+    """ Background thread that samples the CPU, memory, disk I/O and agent count of a process tree at a fixed interval.
+
+    I/O is counted per process and summed over every process seen, so tester agents that exit mid-run still count.
+
+    param pid: Process id of the tree root (the terminal)
+    param interval: Seconds between samples
+    """
+
+    def __init__(self, pid: int, interval: float = SAMPLE_INTERVAL):
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[ResourceSample] = []
+        self._procs: dict[int, psutil.Process] = {}
+        self._io: dict[int, tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"resource-sampler-{pid}", daemon=True)
+        self._started = perf_counter()
+
+    def start(self) -> "ResourceSampler":
+        self._started = perf_counter()
+        self._sample()  # Primes the per-process CPU counters
+        self._thread.start()
+        return self
+
+    def stop(self) -> list[ResourceSample]:
+        """ Stop sampling and return the samples taken. """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return self.samples
+
+    def __enter__(self) -> "ResourceSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def summary(self) -> dict:
+        """ Summarise the samples: mean/peak CPU (in busy cores), peak RSS, total I/O and peak agent count.
+
+        return: Dict of summary fields, empty if nothing was sampled
+        """
+        samples = self.samples[1:] or self.samples  # The first sample only primes the CPU counters
+        if not samples:
+            return {}
+
+        cpu = [s.cpu_percent for s in samples]
+        return {
+            "samples": len(samples),
+            "cpu_cores_mean": round(sum(cpu) / len(cpu) / 100, 2),
+            "cpu_cores_max": round(max(cpu) / 100, 2),
+            "rss_mb_max": max(s.rss_mb for s in samples),
+            "read_mb": self.samples[-1].read_mb,
+            "write_mb": self.samples[-1].write_mb,
+            "agents_max": max(s.agents for s in samples),
+        }
+
+    def records(self) -> list[dict]:
+        """ Return the samples as JSON-serialisable dicts. """
+        return [asdict(sample) for sample in self.samples]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self._sample():
+                break
+
+    def _sample(self) -> bool:
+        """ Take one sample of the tree. Returns False once the root process has gone. """
+        try:
+            root = self._process(self.pid)
+            children = root.children(recursive=True)
+        except psutil.Error:
+            return False
+
+        cpu = rss = 0.0
+        for proc in [root] + children:
+            try:
+                proc = self._process(proc.pid)
+                with proc.oneshot():
+                    cpu += proc.cpu_percent(None)
+                    rss += proc.memory_info().rss
+                    self._io[proc.pid] = _io_bytes(proc, self._io.get(proc.pid, (0, 0)))
+            except psutil.Error:
+                continue
+
+        read = sum(io[0] for io in self._io.values())
+        write = sum(io[1] for io in self._io.values())
+        self.samples.append(ResourceSample(t=round(perf_counter() - self._started, 3), cpu_percent=round(cpu, 1),
+                                           rss_mb=round(rss / _MB, 1), read_mb=round(read / _MB, 2),
+                                           write_mb=round(write / _MB, 2), agents=len(children)))
+        return True
+
+    def _process(self, pid: int) -> psutil.Process:
+        """ Reuse one psutil.Process per pid, as cpu_percent() measures since that object's previous call. """
+        proc = self._procs.get(pid)
+        if proc is None:
+            proc = self._procs[pid] = psutil.Process(pid)
+        return proc
+
+
+def _io_bytes(proc: psutil.Process, last: tuple[int, int]) -> tuple[int, int]:
+    """ Cumulative (read, write) bytes of a process; keeps the last value where I/O counters are unavailable. """
+    try:
+        io = proc.io_counters()
+    except (AttributeError, psutil.AccessDenied):
+        return last
+    return io.read_bytes, io.write_bytes
@@ -0,0 +1,209 @@
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "journal.sqlite"
+
+# Steps of a stage/indicator/phase, in the order they are committed
+STEPS = ("rendered", "compiled", "ini_written", "terminal_started", "report_copied", "converted", "aggregated")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    step        TEXT NOT NULL,
+    fingerprint TEXT,
+    data        TEXT,
+    updated     TEXT NOT NULL,
+    PRIMARY KEY (stage, indicator, phase)
+);
+CREATE TABLE IF NOT EXISTS transitions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    step        TEXT NOT NULL,
+    fingerprint TEXT,
+    recorded    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resources (
+    stage       TEXT NOT NULL,
+    indicator   TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    terminal    TEXT,
+    summary     TEXT NOT NULL,
+    samples     TEXT NOT NULL,
+    recorded    TEXT NOT NULL,
+    PRIMARY KEY (stage, indicator, phase)
+);
+"""
+
+
+@dataclass
+class JournalEntry:
+    """ Last committed step of one stage/indicator/phase.
+
+    param step: Name of the step (see STEPS)
+    param fingerprint: Identifies the work the step belongs to (e.g. the result key of the .ini that was run)
+    param data: Optional JSON payload stored with the step (e.g. the optimised IS parameters)
+    """
+    stage: str
+    indicator: str
+    phase: str
+    step: str
+    fingerprint: str | None = None
+    data: dict | None = None
+
+    def reached(self, step: str) -> bool:
+        """ Return True if this entry is at or past the given step. """
+        return STEPS.index(self.step) >= STEPS.index(step)
+
+
+class RunJournal:
+    """ SQLite journal of the steps a project run has committed, used to resume a stage after a crash.
+
+    Each stage/indicator/phase (e.g. Trigger/aroon/IS) keeps its last committed step together with a fingerprint of
+    the work it belongs to. Every transition is written in its own transaction, so after a reboot the journal reflects
+    exactly the steps whose output is complete on disk. A full history of transitions is kept for inspection.
+
+    param run_dir: Project output directory (outputs/<run_name>)
+    """
+
+    def __init__(self, run_dir: Path):
+        run_dir.mkdir(parents=True, exist_ok=True)
+        self.path = run_dir / JOURNAL_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+
+    def record(self, stage: str, indicator: str, phase: str, step: str, fingerprint: str = None,
+               data: dict = None) -> None:
+        """ Commit a step. A new fingerprint restarts the phase at this step; None keeps the current fingerprint.
+
+        param stage: Stage name (e.g. 'Trigger')
+        param indicator: Indicator/EA name
+        param phase: Phase within the indicator (e.g. 'build', 'IS', 'OOS')
+        param step: One of STEPS
+        param fingerprint: Optional fingerprint of the work this step belongs to
+        param data: Optional JSON-serialisable payload. None keeps the stored payload if the fingerprint is unchanged.
+        """
+        if step not in STEPS:
+            raise ValueError(f"Unknown journal step: {step}")
+
+        now = datetime.now().isoformat(timespec="seconds")
+        payload = json.dumps(data, default=_to_builtin) if data is not None else None
+
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                """
+                INSERT INTO state (stage, indicator, phase, step, fingerprint, data, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (stage, indicator, phase) DO UPDATE SET
+                    step = excluded.step,
+                    data = CASE
+                        WHEN excluded.data IS NOT NULL THEN excluded.data
+                        WHEN excluded.fingerprint IS NULL OR excluded.fingerprint IS state.fingerprint THEN state.data
+                    END,
+                    fingerprint = COALESCE(excluded.fingerprint, state.fingerprint),
+                    updated = excluded.updated
+                """,
+                (stage, indicator, phase, step, fingerprint, payload, now),
+            )
+            self._conn.execute(
+                "INSERT INTO transitions (stage, indicator, phase, step, fingerprint, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (stage, indicator, phase, step, fingerprint, now),
+            )
+
+        logger.debug(f"Journal: {stage}/{indicator}/{phase} -> {step}")
+
+    def get(self, stage: str, indicator: str, phase: str, fingerprint: str = None) -> JournalEntry | None:
+        """ Return the last committed step of a phase.
+
+        param fingerprint: If given, entries recorded for different work are ignored
+        return: JournalEntry, or None if nothing (matching) was committed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT step, fingerprint, data FROM state WHERE stage = ? AND indicator = ? AND phase = ?",
+                (stage, indicator, phase),
+            ).fetchone()
+
+        if row is None or (fingerprint is not None and row[1] != fingerprint):
+            return None
+
+        return JournalEntry(stage=stage, indicator=indicator, phase=phase, step=row[0], fingerprint=row[1],
+                            data=json.loads(row[2]) if row[2] else None)
+
+    def has_step(self, stage: str, indicator: str, phase: str, step: str, fingerprint: str = None) -> bool:
+        """ Return True if the phase has committed the given step (or a later one) for the given fingerprint. """
+        entry = self.get(stage, indicator, phase, fingerprint)
+        return entry is not None and entry.reached(step)
+
+    def entries(self, stage: str = None) -> list[JournalEntry]:
+        """ Return the current state of every phase, optionally limited to one stage. """
+        query = "SELECT stage, indicator, phase, step, fingerprint, data FROM state"
+        params = ()
+        if stage:
+            query += " WHERE stage = ?"
+            params = (stage,)
+
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY stage, indicator, phase", params).fetchall()
+
+        return [JournalEntry(stage=r[0], indicator=r[1], phase=r[2], step=r[3], fingerprint=r[4],
+                             data=json.loads(r[5]) if r[5] else None) for r in rows]
+
+    def record_resources(self, stage: str, indicator: str, phase: str, summary: dict, samples: list[dict],
+                         terminal: str = None) -> None:
+        """ Store the resource samples of a phase's terminal run, replacing those of an earlier run.
+
+        param summary: Summary of the run (see ResourceSampler.summary)
+        param samples: The individual samples (see ResourceSampler.records)
+        param terminal: Id of the terminal the phase ran on
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resources (stage, indicator, phase, terminal, summary, samples, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (stage, indicator, phase, terminal, json.dumps(summary), json.dumps(samples), now),
+            )
+
+    def resources(self, stage: str = None) -> list[dict]:
+        """ Return the resource summary and samples of every sampled phase, optionally limited to one stage.
+
+        return: One dict per phase with stage, indicator, phase, terminal, the summary fields and a `samples` list
+        """
+        query = "SELECT stage, indicator, phase, terminal, summary, samples FROM resources"
+        params = ()
+        if stage:
+            query += " WHERE stage = ?"
+            params = (stage,)
+
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY stage, indicator, phase", params).fetchall()
+
+        return [{"stage": r[0], "indicator": r[1], "phase": r[2], "terminal": r[3], **json.loads(r[4]),
+                 "samples": json.loads(r[5])} for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _to_builtin(value):
+    """ JSON fallback for numpy scalars coming out of pandas. """
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import Callable, Union
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Template
+
+from strategy_factory.utils.template_env import load_template
 
 
 class StageConfig:
@@ -29,9 +31,8 @@ class StageConfig:
             pass
 
         else:
-            ea_template_path = Path(ea_template)
-            env = Environment(loader=FileSystemLoader(str(ea_template_path.parent)))
-            self.ea_template = env.get_template(ea_template_path.name)
+            # All stages share one environment (and its bytecode cache), see `get_template_env`
+            self.ea_template = load_template(Path(ea_template))
 
     def __repr__(self) -> str:
         return f"<StageConfig {self.name}>"
@@ -1,21 +1,53 @@
+from concurrent.futures import CancelledError, Future, as_completed
+from pathlib import Path
+
 from strategy_factory.gen_expert_advisor.generate_ea import GenerateEA
-from strategy_factory.gen_initilisation_file import create_ini
+from strategy_factory.gen_expert_advisor.batch_compiler import CompileReport
+from strategy_factory.gen_initilisation_file import create_ini, zoom_param_ranges
 from strategy_factory.post_processing import (
     extract_optimisation_result,
     OptimisationResult,
     update_combined_results,
+    summarise_in_sample,
     extract_top_parameters,
-    copy_mt5_report
+    copy_mt5_report,
+    convert_mt5_report,
+    convert_forward_report,
+    ResultsStore
+)
+from strategy_factory.utils import ProjectConfig, job_context, load_paths, span, start_trace
+from strategy_factory.utils.telemetry import TRACE_FILE
+from strategy_factory.utils.hashing import hash_file, hash_json
+from strategy_factory.utils.sample_table import load_sample_table
+
+from strategy_factory.post_processing.result_summary import ROUND_SUMMARY_TEMPLATE
+from strategy_factory.post_processing.tier_manifest import (
+    FINAL_TIER,
+    SCREEN_TIER,
+    load_tier_manifest,
+    promote_finalists,
+    write_tier_manifest
+)
+from strategy_factory.post_processing.result_cache import (
+    compute_result_key,
+    restore_cached_report,
+    store_cached_report
 )
-from strategy_factory.utils import ProjectConfig, load_paths
 
 from .stage_config import StageConfig
-from .ea_runner import run_ea
+from .ea_runner import RunHandle, run_ea
 from .clean_test_cache import delete_mt5_test_cache
 from .create_dir_structure import create_dir_structure
 from .get_compiled_indicators import get_compiled_indicators
+from .terminal_pool import TerminalInstance, TerminalPool
+from .job_scheduler import JobScheduler
+from .run_journal import JournalEntry, RunJournal
+from .successive_halving import HalvingRound, plan_rounds, select_survivors
 
 import logging
+import os
+import shutil
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +55,36 @@ logger = logging.getLogger(__name__)
 class StageRunner:
     """ Coordinates the full MT5 optimisation process for a single pipeline stage_config.
 
+    By default the whole stage runs inside the constructor. Pass auto_run=False to drive it yourself: `start()`
+    returns one Future per indicator without blocking, and `wait(futures)` aggregates the results as they finish.
+
     param project_config: Config object containing run parameters
     param stage_config: Stage object defining this optimisation phase
     param recompile_ea: If True, force EA regeneration from template
+    param auto_run: If True, prepare and run the whole stage during construction
     """
 
-    def __init__(self, project_config: ProjectConfig, stage_config: StageConfig, recompile_ea: bool = True):
+    def __init__(self, project_config: ProjectConfig, stage_config: StageConfig, recompile_ea: bool = True,
+                 auto_run: bool = True):
         """ Initialise the optimiser pipeline.
 
         param project_config: Config object containing run parameters
         param stage_config: Stage object for this pipeline step
         param recompile_ea: If True, force EA regeneration from template
+        param auto_run: If True, prepare and run the whole stage during construction
         """
         self.project_config = project_config
         self.stage_config = stage_config
         self.recompile_ea = recompile_ea
         self.paths = load_paths()
+        self._pool: TerminalPool | None = None
+        self._scheduler: JobScheduler | None = None
+        self.compile_report: CompileReport | None = None
+        self._cancelled = False
+        # Terminal runs in flight, by terminal id, so cancel() can kill them
+        self._running: dict[str, RunHandle] = {}
+        self._running_lock = threading.Lock()
+        self._rounds: list[HalvingRound] = []
 
         # Set up output folder structure for this stage
         self.output_base = create_dir_structure(self.project_config.run_name, self.stage_config.name)
@@ -46,13 +92,41 @@ class StageRunner:
         self.ea_output_dir = self.output_base / "experts"
         self.results_dir = self.output_base / "results"
 
+        # Journal of committed steps, shared by all stages of the project, used to resume after a crash
+        self.journal = RunJournal(self.output_base.parent)
+
+        # Indexed copy of the converted reports, read by the result aggregation
+        self.results_store = ResultsStore(self.results_dir)
+        # Set once shutdown() closed the journal and results store; a new run reopens them
+        self._released = False
+
+        # Timing spans of every phase (render, compile, ini, terminal, report copy/convert, aggregate) of the run
+        start_trace(self.output_base.parent / TRACE_FILE)
+
+        if auto_run:
+            self.prepare()
+            self.run_stage_optimisations()
+
+    def prepare(self):
+        """ Clean the MT5 environment and (re)generate the EAs for this stage_config. """
+        self._reopen()
+
         # Clean the MT5 environment (delete cache)
         delete_mt5_test_cache()
 
+        # Sync the results store once: the combined results are then only updated per finished indicator
+        self.results_store.sync()
+
         # Optionally (re)generate all EAs for this stage_config
         self.generate_experts()
 
-        self.run_stage_optimisations()
+    def start(self) -> dict[str, Future]:
+        """ Non-blocking entry point: prepare the stage and queue every indicator on the terminal pool.
+
+        return: Dict of indicator name -> Future for its IS/OOS optimisation. Pass it to `wait()` to aggregate.
+        """
+        self.prepare()
+        return self.submit_stage_optimisations()
 
     def generate_experts(self):
         """ Generate EA .mq5 files from template if recompile_ea is enabled. """
@@ -63,62 +137,370 @@ class StageRunner:
             logger.info(f"Generating EAs for stage_config: {self.stage_config.name}")
             run_name = self.project_config.run_name
 
-            # Generate individual Expert Advisor:
-            GenerateEA(self.project_config, self.stage_config, self.ea_output_dir).generate_all()
+            # Render all Expert Advisors, then compile them as one batch
+            self.compile_report = GenerateEA(self.project_config, self.stage_config, self.ea_output_dir).generate_all()
+            self._journal_compile_report()
 
         else:
             logger.info(f"Skipping EA generation for stage_config: {self.stage_config.name}")
 
+    def _journal_compile_report(self):
+        """ Commit the rendered/compiled steps of every EA in the latest compile report. """
+        if self.compile_report is None:
+            return
+
+        for result in self.compile_report.results:
+            fingerprint = hash_file(result.mq5_path)
+            self.journal.record(self.stage_config.name, result.name, "build", "rendered", fingerprint)
+            if result.success:
+                self.journal.record(self.stage_config.name, result.name, "build", "compiled")
+
     def run_stage_optimisations(self):
-        """ Run optimisation for all compiled indicators (EAs) in this stage_config. """
-        for indicator in get_compiled_indicators(self.ea_output_dir):
-            self.optimise_indicator(indicator)
+        """ Run optimisation for all compiled indicators (EAs) in this stage_config.
+
+        Each indicator contributes an IS job and a dependent OOS job to a JobScheduler on a TerminalPool. With several
+        terminals configured, OOS jobs interleave with other indicators' IS jobs so every terminal stays busy until the
+        stage drains. The combined results table is refreshed from the main thread as each indicator finishes.
+
+        If the stage is tiered (see OptSettings), all indicators are first screened on the cheap screen_model and
+        only the top final_top_k are re-run on final_model. With successive halving, all indicators are first
+        optimised IS on a small grid and only the best by IS result move on to geometrically larger grids.
+        """
+        with span("stage", stage=self.stage_config.name):
+            self.wait(self.submit_stage_optimisations())
+
+    def submit_stage_optimisations(self, indicators: list[str] = None, tier: str = None) -> dict[str, Future]:
+        """ Schedule IS/OOS optimisation of every compiled indicator on a terminal pool without waiting.
 
-            # ALWAYS update the combined results table
-            update_combined_results(results_dir=self.results_dir, stage_name=self.stage_config.name, print_summary=False)
+        For a successive-halving stage only the first (IS-only) round is scheduled; `wait()` runs the rest.
+
+        param indicators: Optional subset of indicators to schedule. Defaults to all compiled indicators.
+        param tier: Fidelity tier of the runs. Defaults to the screening tier for a tiered stage, else none.
+        return: Dict of indicator name -> Future that resolves once all of its scheduled jobs have finished
+        raises RuntimeError: If a terminal of the pool is already running outside the pipeline
+        """
+        self._reopen()
+        if self._pool is None:
+            pool = TerminalPool.from_paths()
+            pool.ensure_idle()
+            pool.clean_test_caches()
+            self._pool = pool
+
+        if indicators is None:
+            indicators = get_compiled_indicators(self.ea_output_dir, self.compile_report)
+
+        if tier is None and self._is_halving():
+            settings = self.project_config.opt_settings[self.stage_config.name]
+            self._rounds = plan_rounds(len(indicators), settings.halving_min_iterations, settings.max_iterations,
+                                       settings.halving_eta)
+            logger.info("Successive halving plan: " + ", ".join(
+                f"round {r.index}: {r.n_indicators} indicator(s) x {r.max_iterations} iterations" for r in self._rounds))
+            return self._submit_round(indicators, self._rounds[0])
+
+        if tier is None and self._is_tiered():
+            tier = SCREEN_TIER
+
+        return self._schedule(indicators, tier)
+
+    def _submit_round(self, indicators: list[str], halving_round: HalvingRound) -> dict[str, Future]:
+        """ Schedule one successive-halving round: IS only, except for the final round which also runs OOS. """
+        if halving_round.final:
+            return self._schedule(indicators, max_iterations=halving_round.max_iterations)
+        return self._schedule(indicators, halving_round.tier, max_iterations=halving_round.max_iterations,
+                              with_oos=False)
+
+    def _schedule(self, indicators: list[str], tier: str = None, max_iterations: int = None,
+                  with_oos: bool = True) -> dict[str, Future]:
+        """ Add the IS (and dependent OOS) jobs of the given indicators to a new JobScheduler and start it. """
+        self._scheduler = JobScheduler(self._pool)
+        for indicator in indicators:
+            self._scheduler.add(f"{indicator}:IS", self.run_in_sample, indicator, group=indicator, tier=tier,
+                                max_iterations=max_iterations)
+
+            # In forward mode the IS launch also produces the OOS report, so there is no separate OOS job
+            if not with_oos or self._forward_mode():
+                continue
+
+            # OOS jobs get priority so an indicator is finished (and aggregated) as soon as its IS result is in
+            self._scheduler.add(f"{indicator}:OOS", self.run_out_of_sample, indicator, group=indicator, tier=tier,
+                                depends_on=(f"{indicator}:IS",), priority=1)
+
+        return self._scheduler.start()
+
+    def wait(self, futures: dict[str, Future]):
+        """ Block until the given indicator futures finish, updating the combined results as each one completes.
+
+        For a tiered stage, the finalists of the screening tier are then re-run at final fidelity before returning.
+
+        param futures: Dict of indicator name -> Future, as returned by `start()` / `submit_stage_optimisations()`
+        """
+        try:
+            if self._rounds:
+                self._run_halving_rounds(futures)
+            else:
+                self._run_tiers(futures)
+        finally:
+            self.shutdown()
 
         # Finally, extract top-N performing parameter sets
         extract_top_parameters(results_dir=self.results_dir, top_n=5, sort_by="Res_OOS")
 
-    def optimise_indicator(self, indi_name: str):
-        """ Run IS and OOS tests for a single EA (indicator).
+    def _run_tiers(self, futures: dict[str, Future]):
+        """ Drain a single-tier stage, or the screening tier of a tiered stage followed by its final tier. """
+        tier = SCREEN_TIER if self._is_tiered() else None
+        combined = self._drain(futures, tier)
 
-        param indi_name: Base name of the EA/indicator
+        if tier and not self._cancelled:
+            finalists = self._promote_finalists(combined)
+            if finalists:
+                self._drain(self.submit_stage_optimisations(finalists, FINAL_TIER), FINAL_TIER)
+
+    def _run_halving_rounds(self, futures: dict[str, Future]):
+        """ Drive a successive-halving stage from its first round (already scheduled) to the final IS/OOS round.
+
+        After every IS-only round the round's IS reports are archived in results/rounds/round<r>/, the indicators are
+        ranked by IS result from there and the round table is written to 1_combined_results_round_<r>.csv. A
+        restarted stage resumes committed rounds from their archive.
         """
-        # --- In-sample pass ---
-        if self._has_is_results(indi_name):
+        survivors = list(futures)
+        for halving_round in self._rounds:
+            if halving_round.index > 0:
+                futures = self._submit_round(survivors, halving_round)
+
+            round_file = self.results_dir / ROUND_SUMMARY_TEMPLATE.format(round=halving_round.index)
+
+            if halving_round.final:
+                combined = self._drain(futures)
+                if combined is not None and not combined.empty:
+                    combined.assign(Iterations=halving_round.max_iterations).to_csv(round_file, index=False)
+                return
+
+            self._drain(futures, halving_round.tier, aggregate=False)
+            self._archive_round_reports(list(futures), halving_round)
+            table = summarise_in_sample(self.results_dir / "rounds" / halving_round.tier, survivors)
+            survivors = select_survivors(table, self._rounds[halving_round.index + 1].n_indicators)
+
+            table["Iterations"] = halving_round.max_iterations
+            table["Survived"] = table["Indicator"].isin(survivors)
+            table.to_csv(round_file, index=False)
+            logger.info(f"Halving round {halving_round.index} done: {len(survivors)} of {len(futures)} indicator(s) "
+                        f"continue ({', '.join(survivors)})")
+
+            if self._cancelled or not survivors:
+                return
+
+    def _archive_round_reports(self, indicators: list[str], halving_round: HalvingRound):
+        """ Move the IS reports of an IS-only round to results/rounds/round<r>/<indi>_IS.csv.
+
+        A report that is already archived was resumed from the journal on a restart; <indi>_IS.csv then belongs to a
+        later round and stays in place.
+        """
+        round_dir = self.results_dir / "rounds" / halving_round.tier
+        round_dir.mkdir(parents=True, exist_ok=True)
+        for indicator in indicators:
+            report = self.results_dir / f"{indicator}_IS.csv"
+            if report.exists() and not (round_dir / report.name).exists():
+                os.replace(report, round_dir / report.name)
+
+    def _round_report(self, report_csv: Path, phase: str) -> Path | None:
+        """ Return where a halving round's report is archived (see `_archive_round_reports`).
+
+        param report_csv: The run's report (<indi>_IS.csv)
+        param phase: Journal phase of the run (e.g. 'IS:round1')
+        return: Path of the archived report (results/rounds/round<r>/<indi>_IS.csv), or None if the phase is not an
+                IS-only halving round
+        """
+        tier = phase.partition(":")[2]
+        return self.results_dir / "rounds" / tier / report_csv.name if tier.startswith("round") else None
 
-            is_csv = self.results_dir / f"{indi_name}_IS.csv"
-            logger.info(f"Skipping in-sample optimisation for {indi_name}: found existing {is_csv}")
+    def _drain(self, futures: dict[str, Future], tier: str = None, aggregate: bool = True):
+        """ Wait for indicator futures, aggregating the combined results as each one completes.
 
-            try:
-                is_result = extract_optimisation_result(self.results_dir, indi_name)
-                logger.info(f"Extracted existing in-sample result for {indi_name}: {is_result.parameters}")
+        param aggregate: If False (IS-only rounds), only wait and log failures
 
+        return: The combined results table after the last indicator finished
+        """
+        combined = None
+        pending = {future: indicator for indicator, future in futures.items()}
+        for future in as_completed(pending):
+            indicator = pending[future]
+            try:
+                future.result()
+            except CancelledError:
+                logger.warning(f"Optimisation cancelled for {indicator}")
             except Exception as e:
-                logger.error(f"Failed to parse existing in-sample result for {indi_name}: {e}")
-                is_result = None
-        else:
-            is_result = self.run_in_sample(indi_name)
+                logger.error(f"Optimisation failed for {indicator}: {e}")
 
-        # --- Out-of-sample pass ---
-        if is_result:
+            if not aggregate:
+                continue
 
-            if self._has_oos_results(indi_name):
-                oos_csv = self.results_dir / f"{indi_name}_OOS.csv"
-                logger.info(f"Skipping out-of-sample optimisation for {indi_name}: found existing {oos_csv}")
+            oos_phase = self._phase("OOS", tier)
+            if tier == FINAL_TIER and self.journal.has_step(self.stage_config.name, indicator, oos_phase, "converted"):
+                self._mark_final(indicator)
 
-            else:
-                self.run_out_of_sample(indi_name, is_result)
+            # ALWAYS update the combined results table, merging in only the indicator that just finished
+            combined = update_combined_results(results_dir=self.results_dir, stage_name=self.stage_config.name,
+                                               print_summary=False, indicators=[indicator])
+            if self.journal.has_step(self.stage_config.name, indicator, oos_phase, "converted"):
+                self.journal.record(self.stage_config.name, indicator, oos_phase, "aggregated")
+
+        return combined
+
+    def _promote_finalists(self, combined) -> list[str]:
+        """ Promote the top-K screened indicators to the final tier (see `promote_finalists`).
+
+        return: Indicator names to re-run at final fidelity
+        """
+        settings = self.project_config.opt_settings[self.stage_config.name]
+        return promote_finalists(self.results_dir, combined, settings.screen_model, settings.final_model,
+                                 settings.final_top_k)
+
+    def _mark_final(self, indicator: str):
+        """ Record in the tier manifest that an indicator's results now come from the final tier. """
+        manifest = load_tier_manifest(self.results_dir) or {}
+        manifest.setdefault("tiers", {})[indicator] = FINAL_TIER
+        write_tier_manifest(self.results_dir, manifest)
+
+    def _forward_mode(self) -> bool:
+        """ True if IS and OOS come from one MT5 forward-testing launch (data_split: forward). """
+        return self.project_config.data_split == "forward"
+
+    def _is_tiered(self) -> bool:
+        settings = self.project_config.opt_settings.get(self.stage_config.name)
+        return bool(getattr(settings, "tiered", False)) and not self._is_halving()
+
+    def _zoom_settings(self) -> tuple[int, int]:
+        """ Return (zoom_rounds, zoom_top_n) of this stage; zoom_rounds is 0 unless zoom is enabled. """
+        settings = self.project_config.opt_settings.get(self.stage_config.name)
+        return int(getattr(settings, "zoom_rounds", 0) or 0), int(getattr(settings, "zoom_top_n", 5) or 5)
+
+    def _is_halving(self) -> bool:
+        settings = self.project_config.opt_settings.get(self.stage_config.name)
+        return bool(getattr(settings, "halving", False))
+
+    def _tier_model(self, tier: str = None) -> int | None:
+        """ Return the MT5 tick model for a tier, or None to use the stage default. """
+        settings = self.project_config.opt_settings.get(self.stage_config.name)
+        if tier == SCREEN_TIER:
+            return settings.screen_model
+        if tier == FINAL_TIER:
+            return settings.final_model
+        return None
+
+    @staticmethod
+    def _phase(phase: str, tier: str = None) -> str:
+        """ Journal phase name; final-tier and halving-round runs are journaled separately from the main runs. """
+        return f"{phase}:{tier}" if tier and tier != SCREEN_TIER else phase
+
+    def cancel(self):
+        """ Cancel the stage: jobs that have not started yet are dropped and running terminals are killed. """
+        with self._running_lock:
+            self._cancelled = True
+            running = list(self._running.values())
+
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        for handle in running:
+            handle.cancel_from_thread()
+
+    def _track_run(self, terminal_id: str, handle: RunHandle) -> None:
+        """ Register a started terminal run with `cancel()`, killing it at once if the stage was already cancelled. """
+        with self._running_lock:
+            self._running[terminal_id] = handle
+            cancelled = self._cancelled
+        if cancelled:
+            handle.cancel_from_thread()
+
+    def shutdown(self):
+        """ Release the terminal pool, the run journal and the results store once all submitted work has finished.
+
+        The runner can be started again afterwards: the pool, journal and store are reopened on the next run.
+        """
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler.join()
+            self._scheduler = None
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+        if not self._released:
+            self._released = True
+            self.journal.close()
+            self.results_store.close()
+
+    def _reopen(self):
+        """ Reopen the run journal and results store after a `shutdown()`. """
+        if self._released:
+            self.journal = RunJournal(self.output_base.parent)
+            self.results_store = ResultsStore(self.results_dir)
+            self._released = False
+
+    def optimise_indicator(self, indi_name: str, terminal: TerminalInstance = None):
+        """ Run IS and OOS tests for a single EA (indicator).
+
+        param indi_name: Base name of the EA/indicator
+        param terminal: Terminal to run the tests on. Defaults to the main terminal.
+        """
+        terminal = terminal or TerminalInstance.default()
+
+        # --- In-sample pass ---
+        # Finished work is skipped through the run journal and the result cache: an unchanged EA/.ini resumes from its
+        # last committed step without launching the terminal, while any config change produces a new key and a fresh run.
+        is_result = self.run_in_sample(indi_name, terminal)
 
-    def run_in_sample(self, indi_name: str) -> OptimisationResult | None:
+        # --- Out-of-sample pass ---
+        if is_result:
+            self.run_out_of_sample(indi_name, is_result, terminal)
+
+    def run_in_sample(self, indi_name: str, terminal: TerminalInstance = None, tier: str = None,
+                      max_iterations: int = None) -> OptimisationResult | None:
         """Run the in-sample (IS) optimisation pass.
 
+        With zoom_rounds set, the pass is repeated inside a box narrowed around the best passes of the previous one
+        (see `zoom_param_ranges`). Each round's report and .ini are kept in results/zoom/ and <indi>_IS.csv holds the
+        last round.
+
         param indi_name: Base name of the EA/indicator
+        param terminal: Terminal to run the test on. Defaults to the main terminal.
+        param tier: Fidelity tier ('screen' or 'final') or halving round ('round<r>'), None otherwise
+        param max_iterations: Optional grid budget override. Defaults to the stage's max_iterations.
         return: OptimisationResult object or None if failed
         """
-        logger.info(f"============== Starting in-sample optimisation for: {indi_name}   ==============")
+        with job_context(stage=self.stage_config.name, indicator=indi_name, phase=self._phase("IS", tier)):
+            logger.info(f"============== Starting in-sample optimisation for: {indi_name}   ==============")
+
+            zoom_rounds, zoom_top_n = self._zoom_settings()
+            ini_path, result = self._run_is_pass(indi_name, terminal, tier, max_iterations)
+
+            for zoom in range(1, zoom_rounds + 1):
+                if result is None or self._cancelled:
+                    break
+
+                prev_ini, prev_csv = self._archive_zoom_round(indi_name, ini_path, zoom - 1)
+                param_ranges = zoom_param_ranges(prev_ini, prev_csv, zoom_top_n)
+                if not param_ranges:
+                    logger.warning(f"[run_in_sample] No zoom box for {indi_name}; keeping round {zoom - 1}")
+                    break
+
+                logger.info(f"[run_in_sample] Zoom round {zoom}/{zoom_rounds} for {indi_name}: {param_ranges}")
+                ini_path, result = self._run_is_pass(indi_name, terminal, tier, max_iterations, param_ranges, zoom)
+
+            if ini_path and self._forward_mode():
+                self._convert_forward_report(indi_name, ini_path, tier)
+
+            return result
+
+    def _run_is_pass(self, indi_name: str, terminal: TerminalInstance = None, tier: str = None,
+                     max_iterations: int = None, param_ranges: dict = None,
+                     zoom: int = 0) -> tuple[Path | None, OptimisationResult | None]:
+        """ Write the IS .ini, run it and parse the best parameters.
 
+        param param_ranges: Optional narrowed input ranges of a zoom round
+        param zoom: Zoom round number, 0 for the initial pass
+        return: Tuple (ini_path, OptimisationResult), with None entries if the pass failed
+        """
         ini_path = create_ini(
             indi_name=indi_name,
             ea_output_dir=self.ea_output_dir,
@@ -126,62 +508,226 @@ class StageRunner:
             ini_files_dir=self.ini_dir,
             in_sample=True,
             stage_config=self.stage_config,
-            optimised_params=None
+            optimised_params=None,
+            model=self._tier_model(tier),
+            max_iterations=max_iterations,
+            param_ranges=param_ranges
         )
 
         if not ini_path:
             logger.warning(f"[run_in_sample] Skipping {indi_name}: missing YAML or EX5.")
-            return None
+            return None, None
 
         logger.info(f"[run_in_sample] INI file created: {ini_path}")
         logger.debug(f"[run_in_sample] Running MT5 EA for: {indi_name}")
 
-        run_ea(ini_path)
-        logger.debug(f"[run_in_sample] Copying MT5 report to: {self.results_dir}")
+        phase = self._phase("IS", tier)
+        if zoom:
+            phase = f"{phase}:zoom{zoom}"
+        entry = self._run_terminal(indi_name, ini_path, terminal, phase=phase)
 
-        copy_mt5_report(ini_path, self.results_dir)
+        # A resumed IS pass returns the parameters committed to the journal instead of re-parsing the CSV
+        if entry and entry.data and "parameters" in entry.data:
+            logger.info(f"[run_in_sample] Resumed optimised parameters for {indi_name} (IS) from journal")
+            return ini_path, OptimisationResult(indicator_name=indi_name, parameters=entry.data["parameters"])
 
         try:
             result = extract_optimisation_result(self.results_dir, indi_name)
             logger.info(f"[run_in_sample] Optimised parameters for {indi_name} (IS): {result.parameters}")
-            return result
+            self.journal.record(self.stage_config.name, indi_name, phase, "converted",
+                                data={"parameters": result.parameters})
+            return ini_path, result
 
         except Exception as e:
             logger.error(f"[run_in_sample] Failed to parse optimisation result for {indi_name} (IS): {e}")
-            return None
+            return None, None
+
+    def _archive_zoom_round(self, indi_name: str, ini_path: Path, zoom: int) -> tuple[Path, Path]:
+        """ Copy a zoom round's .ini and IS report to results/zoom/<indi>_IS_zoom<r>.*.
+
+        An existing archive is kept: on resume, the live .ini/CSV already belong to a later round.
 
-    def run_out_of_sample(self, indi_name: str, optimisation_result: OptimisationResult):
+        return: Tuple (archived ini, archived csv)
+        """
+        zoom_dir = self.results_dir / "zoom"
+        zoom_dir.mkdir(exist_ok=True)
+        archived_ini = zoom_dir / f"{indi_name}_IS_zoom{zoom}.ini"
+        archived_csv = zoom_dir / f"{indi_name}_IS_zoom{zoom}.csv"
+
+        if not archived_csv.exists() or not archived_ini.exists():
+            shutil.copy2(ini_path, archived_ini)
+            shutil.copy2(self.results_dir / f"{indi_name}_IS.csv", archived_csv)
+
+        return archived_ini, archived_csv
+
+    def run_out_of_sample(self, indi_name: str, optimisation_result: OptimisationResult,
+                          terminal: TerminalInstance = None, tier: str = None):
         """ Run the out-of-sample (OOS) optimisation pass.
 
         param indi_name: Base name of the EA/indicator
         param optimisation_result: OptimisationResult from IS phase
+        param terminal: Terminal to run the test on. Defaults to the main terminal.
+        param tier: Fidelity tier ('screen' or 'final') for a tiered stage, None otherwise
         """
-        logger.info(f"============== Starting out-of-sample Backtest for: {indi_name}  ==============")
+        with job_context(stage=self.stage_config.name, indicator=indi_name, phase=self._phase("OOS", tier)):
+            logger.info(f"============== Starting out-of-sample Backtest for: {indi_name}  ==============")
 
-        ini_path = create_ini(indi_name=indi_name, ea_output_dir=self.ea_output_dir, project_config=self.project_config,
-                              ini_files_dir=self.ini_dir, in_sample=False, stage_config=self.stage_config,
-                              optimised_params=optimisation_result.parameters)
+            ini_path = create_ini(indi_name=indi_name, ea_output_dir=self.ea_output_dir,
+                                  project_config=self.project_config, ini_files_dir=self.ini_dir, in_sample=False,
+                                  stage_config=self.stage_config, optimised_params=optimisation_result.parameters,
+                                  model=self._tier_model(tier))
 
-        if not ini_path:
-            logger.warning(f"Skipping OOS for {indi_name}: missing YAML or EX5.")
-            return
+            if not ini_path:
+                logger.warning(f"Skipping OOS for {indi_name}: missing YAML or EX5.")
+                return
 
-        run_ea(ini_path)
-        copy_mt5_report(ini_path, self.results_dir)
-        logger.info(f"Completed OOS test for {indi_name}")
+            self._run_terminal(indi_name, ini_path, terminal, phase=self._phase("OOS", tier))
+            logger.info(f"Completed OOS test for {indi_name}")
 
-    def _has_is_results(self, indi_name: str) -> bool:
-        """ Check if an in-sample results file already exists.
+    def _run_terminal(self, indi_name: str, ini_path: Path, terminal: TerminalInstance = None,
+                      phase: str = "IS") -> JournalEntry | None:
+        """ Run one tester job on a terminal and copy its report into this stage's results directory.
+
+        Every step is committed to the run journal under a fingerprint of the EA/.ini, so a restarted stage resumes
+        from the last committed step: a converted report is reused as is, and a copied but unconverted XML is only
+        converted.
+
+        param indi_name: Base name of the EA/indicator
+        param ini_path: Path to the .ini file to run
+        param terminal: Terminal to run the test on. Defaults to the main terminal.
+        param phase: Journal phase of the run ('IS' or 'OOS')
+        return: The journal entry if the phase was already converted before this call, otherwise None
+        """
+        stage = self.stage_config.name
+        report_csv = self.results_dir / f"{ini_path.stem}.csv"
+        report_xml = report_csv.with_suffix(".xml")
+        fingerprint = compute_result_key(ini_path, self.ea_output_dir / f"{indi_name}.mq5",
+                                         self.project_config.whitelist)
+
+        entry = self.journal.get(stage, indi_name, phase, fingerprint)
+        # A finished halving round's report may already have been archived after the round
+        archived = self._round_report(report_csv, phase)
+        if entry and entry.reached("converted") and (report_csv.exists() or (archived and archived.exists())):
+            logger.info(f"Resuming {ini_path.name}: report already converted in a previous run")
+            return entry
+
+        if entry and entry.step == "report_copied" and report_xml.exists():
+            logger.info(f"Resuming {ini_path.name}: converting report copied in a previous run")
+            self._convert_report(indi_name, report_xml, phase, fingerprint)
+            return None
+
+        if not self.project_config.use_result_cache and self._has_results(indi_name, phase, report_csv):
+            logger.info(f"Skipping {ini_path.name}: found existing {report_csv.name}")
+            self.journal.record(stage, indi_name, phase, "converted", fingerprint)
+            return None
+
+        if archived:
+            archived.unlink(missing_ok=True)  # Replaced by this run's report when the round is archived
+        self.journal.record(stage, indi_name, phase, "ini_written", fingerprint)
+
+        if self.project_config.use_result_cache and restore_cached_report(fingerprint, report_csv):
+            logger.info(f"Skipping terminal launch for {ini_path.name}: identical run found in result cache")
+            self.journal.record(stage, indi_name, phase, "converted")
+            return None
+
+        terminal = terminal or TerminalInstance.default()
+        terminal.install_expert(self.ea_output_dir / f"{indi_name}.ex5")
+
+        logger.debug(f"[{terminal.terminal_id}] Running {ini_path.name}")
+        self.journal.record(stage, indi_name, phase, "terminal_started", data={"terminal": terminal.terminal_id})
+        started: list[RunHandle] = []
+
+        def on_start(handle: RunHandle):
+            started.append(handle)
+            self._track_run(terminal.terminal_id, handle)
+
+        try:
+            run_ea(ini_path, terminal_exe=terminal.terminal_exe, portable=terminal.portable,
+                   timeout=self._run_timeout(), sample_interval=self.project_config.resource_sample_seconds,
+                   on_start=on_start)
+        finally:
+            with self._running_lock:
+                self._running.pop(terminal.terminal_id, None)
+            # Samples of a timed-out, cancelled or failed run are kept too: they show what the terminal was doing
+            sampler = started[0].sampler if started else None
+            if sampler is not None:
+                self.journal.record_resources(stage, indi_name, phase, sampler.summary(), sampler.records(),
+                                              terminal=terminal.terminal_id)
+
+        logger.debug(f"[{terminal.terminal_id}] Copying MT5 report to: {self.results_dir}")
+        report_xml = copy_mt5_report(ini_path, self.results_dir, mt5_root=terminal.root, convert=False)
+        self.journal.record(stage, indi_name, phase, "report_copied")
+
+        self._convert_report(indi_name, report_xml, phase, fingerprint)
+        return None
+
+    def _has_results(self, indi_name: str, phase: str, report_csv: Path) -> bool:
+        """ Check if an IS/OOS report exists that the run journal has no record of, for this phase or a variant of it.
+
+        Such a report comes from a run before the journal (or with a deleted one) and is kept as is when the result
+        cache is disabled. Tier, zoom and halving runs are journaled as variants (e.g. 'IS:zoom1') and are excluded,
+        as their report overwrites an earlier one.
 
         param indi_name: Base name of the EA/indicator
-        return: True if IS results CSV exists, else False
+        param phase: Journal phase of the run
+        param report_csv: The phase's report CSV
+        return: True if the report can be reused
         """
-        return (self.results_dir / f"{indi_name}_IS.csv").exists()
+        if phase not in ("IS", "OOS") or not report_csv.exists():
+            return False
+        return not any(entry.indicator == indi_name and entry.phase.split(":")[0] == phase
+                       for entry in self.journal.entries(self.stage_config.name))
+
+    def _convert_report(self, indi_name: str, report_xml: Path, phase: str, fingerprint: str):
+        """ Convert a copied XML report to CSV, commit the step and store the CSV in the result cache. """
+        if not convert_mt5_report(report_xml, load_sample_table(self.ea_output_dir, indi_name)):
+            return
+
+        report_csv = report_xml.with_suffix(".csv")
+        self.results_store.ingest(report_csv)
+        self.journal.record(self.stage_config.name, indi_name, phase, "converted")
+
+        if self.project_config.use_result_cache:
+            store_cached_report(fingerprint, report_csv, run_name=self.project_config.run_name,
+                                stage=self.stage_config.name, indicator=indi_name)
 
-    def _has_oos_results(self, indi_name: str) -> bool:
-        """ Check if an out-of-sample results file already exists.
+    def _convert_forward_report(self, indi_name: str, ini_path: Path, tier: str = None):
+        """ Turn the forward report of an IS launch into <indi>_OOS.csv and commit it as the OOS phase.
 
         param indi_name: Base name of the EA/indicator
-        return: True if OOS results CSV exists, else False
+        param ini_path: Path to the IS .ini file (ForwardMode 4)
+        param tier: Fidelity tier of the run, if any
         """
-        return (self.results_dir / f"{indi_name}_OOS.csv").exists()
+        stage = self.stage_config.name
+        phase = self._phase("OOS", tier)
+        is_csv = self.results_dir / f"{ini_path.stem}.csv"
+        oos_csv = self.results_dir / f"{indi_name}_OOS.csv"
+        forward_xml = self.results_dir / f"{ini_path.stem}.forward.xml"
+
+        fingerprint = compute_result_key(ini_path, self.ea_output_dir / f"{indi_name}.mq5",
+                                         self.project_config.whitelist)
+        if self.journal.has_step(stage, indi_name, phase, "converted", fingerprint) and oos_csv.exists():
+            return
+
+        # The forward report is cached under its own key, derived from the IS run's key
+        cache_key = hash_json({"run": fingerprint, "report": "forward"})
+        if self.project_config.use_result_cache and restore_cached_report(cache_key, oos_csv):
+            self.journal.record(stage, indi_name, phase, "converted", fingerprint)
+            return
+
+        if not forward_xml.exists():
+            logger.warning(f"Forward report missing for {indi_name}: {forward_xml.name}")
+            return
+
+        if convert_forward_report(forward_xml, is_csv, oos_csv, load_sample_table(self.ea_output_dir, indi_name)):
+            self.results_store.ingest(oos_csv)
+            self.journal.record(stage, indi_name, phase, "converted", fingerprint)
+            if self.project_config.use_result_cache:
+                store_cached_report(cache_key, oos_csv, run_name=self.project_config.run_name, stage=stage,
+                                    indicator=indi_name)
+
+    def _run_timeout(self) -> float | None:
+        """ Return the per-run wall-clock timeout in seconds for this stage, or None if disabled. """
+        settings = self.project_config.opt_settings.get(self.stage_config.name)
+        minutes = getattr(settings, "timeout_minutes", 0)
+        return minutes * 60 if minutes else None
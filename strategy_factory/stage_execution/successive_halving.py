@@ -0,0 +1,62 @@
+import logging
+import math
+from dataclasses import dataclass
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HalvingRound:
+    """ One round of a successive-halving stage.
+
+    param index: Round number, starting at 0
+    param n_indicators: Number of indicators optimised in this round
+    param max_iterations: Grid budget per indicator (passed to scale_parameters via the .ini)
+    param final: True for the last round, which runs IS and OOS at the full budget
+    """
+    index: int
+    n_indicators: int
+    max_iterations: int
+    final: bool = False
+
+    @property
+    def tier(self) -> str:
+        """ Name used for this round's journal phases and archived reports. """
+        return f"round{self.index}"
+
+
+def plan_rounds(n_indicators: int, min_iterations: int, max_iterations: int, eta: float = 2) -> list[HalvingRound]:
+    """ Plan the rounds of a successive-halving stage.
+
+    Every round keeps the best 1/eta of the indicators and multiplies the grid budget by eta. The last round runs once
+    a single indicator is left or the budget reaches max_iterations, and always uses the full max_iterations.
+
+    param n_indicators: Number of indicators in the stage
+    param min_iterations: Grid budget of the first round
+    param max_iterations: Grid budget of the final round (the stage's max_iterations)
+    param eta: Reduction factor (> 1)
+    return: List of HalvingRound, the last one marked final
+    """
+    if eta <= 1:
+        raise ValueError(f"halving_eta must be greater than 1, got {eta}")
+
+    rounds = []
+    n, budget = n_indicators, float(min(min_iterations, max_iterations))
+    while True:
+        final = n <= 1 or budget >= max_iterations
+        rounds.append(HalvingRound(index=len(rounds), n_indicators=n,
+                                   max_iterations=int(max_iterations if final else budget), final=final))
+        if final:
+            return rounds
+
+        n = max(1, math.ceil(n / eta))
+        budget *= eta
+
+
+def select_survivors(round_table: pd.DataFrame, keep: int) -> list[str]:
+    """ Return the `keep` indicators with the best IS result of a round. """
+    if round_table.empty:
+        return []
+    return round_table.sort_values("Res_IS", ascending=False).head(keep)["Indicator"].tolist()
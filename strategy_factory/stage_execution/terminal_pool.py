@@ -0,0 +1,151 @@
+import logging
+import queue
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from strategy_factory.utils import job_context, load_paths
+
+from .clean_test_cache import delete_mt5_test_cache
+from .ea_runner import is_mt5_running
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_EXE_NAME = "terminal64.exe"
+
+
+@dataclass(frozen=True)
+class TerminalInstance:
+    """ A single MT5 terminal installation that tester jobs can be dispatched to.
+
+    param terminal_id: Short identifier used in logs (e.g. 'T0')
+    param root: Data folder of the terminal (holds MQL5/, Tester/ and the generated XML reports)
+    param terminal_exe: Path to the terminal64.exe of this installation
+    param portable: True if the terminal is launched with /portable (data folder == install folder)
+    """
+    terminal_id: str
+    root: Path
+    terminal_exe: Path
+    portable: bool = False
+
+    @classmethod
+    def default(cls) -> "TerminalInstance":
+        """ Return the main terminal configured by mt5_root / mt5_terminal_exe in local_paths.yaml. """
+        paths = load_paths()
+        return cls(terminal_id="main", root=paths["MT5_ROOT"], terminal_exe=paths["MT5_TERM_EXE"])
+
+    @classmethod
+    def from_portable_root(cls, terminal_id: str, root: Path) -> "TerminalInstance":
+        """ Build an instance for a portable installation folder containing terminal64.exe. """
+        return cls(terminal_id=terminal_id, root=root, terminal_exe=root / TERMINAL_EXE_NAME, portable=True)
+
+    @property
+    def experts_dir(self) -> Path:
+        return self.root / "MQL5" / "Experts"
+
+    @property
+    def test_cache_dir(self) -> Path:
+        return self.root / "Tester" / "cache"
+
+    def install_expert(self, ex5_path: Path) -> None:
+        """ Copy a compiled EA into this terminal's MQL5/Experts folder, mirroring its path under the main terminal.
+
+        The [Tester] Expert entry of an .ini file is relative to MQL5/Experts, so the same .ini can be run on any
+        instance as long as the .ex5 sits at the same relative location. Nothing is copied for the main terminal.
+
+        param ex5_path: Path to the compiled .ex5 under the main terminal's MQL5/Experts folder
+        """
+        main_experts_dir = load_paths()["MT5_EXPERT_DIR"]
+        if self.experts_dir == main_experts_dir:
+            return
+
+        target = self.experts_dir / ex5_path.relative_to(main_experts_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(ex5_path, target)
+        logger.debug(f"[{self.terminal_id}] Installed {ex5_path.name} to {target.parent}")
+
+
+class TerminalPool:
+    """ Dispatch tester jobs to a fixed set of MT5 terminals, one job per terminal at a time.
+
+    Jobs are queued on a thread pool sized to the number of terminals. Each job checks out whichever terminal is free,
+    receives it as the `terminal` keyword argument, and returns it to the pool when finished.
+
+    param instances: Terminal installations managed by the pool
+    """
+
+    def __init__(self, instances: list[TerminalInstance]):
+        if not instances:
+            raise ValueError("TerminalPool needs at least one terminal instance.")
+
+        self.instances = instances
+        self._free: queue.Queue[TerminalInstance] = queue.Queue()
+        for instance in instances:
+            self._free.put(instance)
+
+        self._executor = ThreadPoolExecutor(max_workers=len(instances), thread_name_prefix="mt5-terminal")
+        logger.info(f"Terminal pool started with {len(instances)} terminal(s): "
+                    f"{', '.join(i.terminal_id for i in instances)}")
+
+    @classmethod
+    def from_paths(cls) -> "TerminalPool":
+        """ Build a pool from `mt5_terminal_pool` in local_paths.yaml, falling back to the main terminal. """
+        pool_roots = load_paths()["MT5_TERMINAL_POOL"]
+        if not pool_roots:
+            return cls([TerminalInstance.default()])
+
+        return cls([TerminalInstance.from_portable_root(f"T{i}", Path(root)) for i, root in enumerate(pool_roots)])
+
+    def __len__(self) -> int:
+        return len(self.instances)
+
+    def __enter__(self) -> "TerminalPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=exc_type is None)
+
+    def ensure_idle(self) -> None:
+        """ Check that no terminal of the pool is already running outside the pipeline.
+
+        raises RuntimeError: If one is running
+        """
+        for instance in self.instances:
+            if is_mt5_running(str(instance.terminal_exe)):
+                raise RuntimeError(f"MetaTrader 5 terminal {instance.terminal_id} is already running "
+                                   f"({instance.terminal_exe}). "
+                                   f"Please close it before starting the automated pipeline.")
+
+    def clean_test_caches(self) -> None:
+        """ Clear the Tester cache and stale XML reports of every portable instance in the pool. """
+        for instance in self.instances:
+            if instance.portable:
+                delete_mt5_test_cache(instance.root)
+
+    @contextmanager
+    def acquire(self) -> Iterator[TerminalInstance]:
+        """ Check out a free terminal for the duration of the context, blocking until one is available. """
+        instance = self._free.get()
+        try:
+            yield instance
+        finally:
+            self._free.put(instance)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """ Queue a job; it runs on the next free terminal, which is passed to `fn` as `terminal=`.
+
+        param fn: Callable to run
+        return: Future resolving to the return value of `fn`
+        """
+        def _run_on_free_terminal():
+            with self.acquire() as terminal, job_context(terminal=terminal.terminal_id):
+                return fn(*args, terminal=terminal, **kwargs)
+
+        return self._executor.submit(_run_on_free_terminal)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ Stop accepting jobs and optionally wait for queued jobs to finish. """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
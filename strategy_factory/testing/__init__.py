@@ -0,0 +1 @@
+from .fake_mt5 import FakeMT5, FakeReportSettings, install_fake_mt5, use_fake_mt5
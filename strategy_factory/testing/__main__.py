@@ -0,0 +1,3 @@
+from .fake_mt5 import main
+
+main()
@@ -0,0 +1,349 @@
+""" Stand-ins for the MetaTrader 5 terminal and MetaEditor, so the pipeline runs end to end without MT5 (e.g. on CI).
+
+`install_fake_mt5` lays out a fake MT5 data folder, a strategy factory root, optional portable pool instances and a
+local_paths.yaml pointing at them. The installed "executables" are small Python launchers:
+
+- terminal64.exe honours `/config:<ini>` (and `/portable`): it reads the UTF-16 .ini, waits `latency` seconds and
+  writes a synthetic SpreadsheetML optimisation report `<Report>.xml` into its data folder, with one row per pass
+  over the inputs flagged `Y`. With a ForwardMode it also writes `<Report>.forward.xml`.
+- metaeditor64.exe honours `/compile:<file or folder>` and `/log`: every .mq5 becomes an .ex5 next to it, unless the
+  source contains COMPILE_ERROR_MARKER, and the log is written as UTF-16 like on Windows.
+
+Usage:
+    python -m strategy_factory.testing /tmp/fake_mt5 --rows 500 --latency 0.5 --pool 3
+    export STRATEGY_FACTORY_LOCAL_PATHS=/tmp/fake_mt5/local_paths.yaml
+
+This module is imported by the launchers on every fake run, so it only depends on the standard library.
+"""
+import argparse
+import configparser
+import itertools
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import time
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+SETTINGS_FILE = "fake_mt5.json"
+LOCAL_PATHS_FILE = "local_paths.yaml"
+TERMINAL_EXE_NAME = "terminal64.exe"
+META_EDITOR_EXE_NAME = "metaeditor64.exe"
+
+# A source containing this text fails to compile
+COMPILE_ERROR_MARKER = "FAKE_COMPILE_ERROR"
+
+RESULT_COLUMNS = ["Pass", "Result", "Profit", "Expected Payoff", "Profit Factor", "Recovery Factor", "Sharpe Ratio",
+                  "Custom", "Equity DD %", "Trades"]
+FORWARD_COLUMNS = ["Pass", "Forward Result", "Back Result", "Profit", "Expected Payoff", "Profit Factor",
+                   "Recovery Factor", "Sharpe Ratio", "Custom", "Equity DD %", "Trades"]
+
+_WORKBOOK_HEAD = ('<?xml version="1.0"?>\n<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" '
+                  'xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">\n')
+
+
+@dataclass
+class FakeReportSettings:
+    """ Shape and timing of the fake terminal's reports, stored as fake_mt5.json next to the launchers.
+
+    param rows: Passes per optimisation report (capped by the size of the optimised input grid)
+    param latency: Seconds each terminal run takes before writing its report
+    param pad_kb: Pad each report to at least this many KB with a second (ignored) worksheet
+    param compile_latency: Seconds MetaEditor takes per compiled file
+    param seed: Base seed; every report is seeded from it and the report name, so reruns write identical reports
+    """
+    rows: int = 50
+    latency: float = 0.0
+    pad_kb: int = 0
+    compile_latency: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "FakeReportSettings":
+        return cls(**json.loads(path.read_text(encoding="utf-8"))) if path.exists() else cls()
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(asdict(self), indent=2), encoding="utf-8")
+
+
+@dataclass
+class FakeMT5:
+    """ Paths of an installed fake MT5 (see `install_fake_mt5`). """
+    base_dir: Path
+    local_paths: Path
+    mt5_root: Path
+    terminal_exe: Path
+    meta_editor_exe: Path
+    pro_root: Path
+    pool: list[Path] = field(default_factory=list)
+
+    @property
+    def settings_path(self) -> Path:
+        return self.base_dir / SETTINGS_FILE
+
+    def configure(self, **settings) -> FakeReportSettings:
+        """ Change report settings (e.g. rows=1000, latency=0.2); the next fake run picks them up. """
+        current = FakeReportSettings.load(self.settings_path)
+        updated = FakeReportSettings(**{**asdict(current), **settings})
+        updated.save(self.settings_path)
+        return updated
+
+
+def install_fake_mt5(base_dir: Path, settings: FakeReportSettings = None, pool_size: int = 0,
+                     repo_root: Path = None) -> FakeMT5:
+    """ Create a fake MT5 install and a local_paths.yaml for it under base_dir.
+
+    The strategy factory root sits inside the fake MQL5/Experts folder like a real checkout, with links to the
+    repository's indicators and strategy_factory folders; outputs and caches are created in base_dir.
+
+    param base_dir: Folder to install into (created if missing)
+    param settings: Report settings, defaults to FakeReportSettings()
+    param pool_size: Number of portable terminal instances to create for a parallel pool
+    param repo_root: Repository to link indicators and pipelines from. Defaults to this checkout.
+    return: FakeMT5 with the installed paths
+    """
+    base_dir = Path(base_dir).resolve()
+    repo_root = Path(repo_root or Path(__file__).resolve().parents[2])
+    settings_path = base_dir / SETTINGS_FILE
+
+    mt5_root = base_dir / "mt5"
+    _make_data_folder(mt5_root)
+    (mt5_root / "MQL5" / "Include" / "MyLibs").mkdir(parents=True, exist_ok=True)
+
+    pro_root = mt5_root / "MQL5" / "Experts" / "mt5-strategy-factory"
+    pro_root.mkdir(parents=True, exist_ok=True)
+    for name in ("indicators", "strategy_factory"):
+        _link(pro_root / name, repo_root / name)
+
+    terminal_exe = _write_launcher(base_dir / TERMINAL_EXE_NAME, "terminal_main", repo_root, settings_path, mt5_root)
+    meta_editor_exe = _write_launcher(base_dir / META_EDITOR_EXE_NAME, "meta_editor_main", repo_root, settings_path)
+
+    pool = []
+    for i in range(pool_size):
+        root = base_dir / "pool" / f"t{i}"
+        _make_data_folder(root)
+        _write_launcher(root / TERMINAL_EXE_NAME, "terminal_main", repo_root, settings_path, root)
+        pool.append(root)
+
+    (settings or FakeReportSettings()).save(settings_path)
+
+    local_paths = base_dir / LOCAL_PATHS_FILE
+    local_paths.write_text(json.dumps({
+        "mt5_root": mt5_root.as_posix(),
+        "mt5_terminal_exe": terminal_exe.as_posix(),
+        "mt5_meta_editor_exe": meta_editor_exe.as_posix(),
+        "strategy_factory_root": pro_root.as_posix(),
+        "mt5_terminal_pool": [root.as_posix() for root in pool],
+    }, indent=2), encoding="utf-8")  # JSON is valid YAML
+
+    return FakeMT5(base_dir=base_dir, local_paths=local_paths, mt5_root=mt5_root, terminal_exe=terminal_exe,
+                   meta_editor_exe=meta_editor_exe, pro_root=pro_root, pool=pool)
+
+
+def use_fake_mt5(fake: FakeMT5) -> None:
+    """ Point the pipeline's path config (STRATEGY_FACTORY_LOCAL_PATHS) at a fake install. """
+    from strategy_factory.utils.pathing import LOCAL_PATHS_ENV
+
+    os.environ[LOCAL_PATHS_ENV] = str(fake.local_paths)
+
+
+def _make_data_folder(root: Path) -> None:
+    for folder in (root / "MQL5" / "Experts", root / "Tester" / "cache"):
+        folder.mkdir(parents=True, exist_ok=True)
+
+
+def _link(link: Path, target: Path) -> None:
+    """ Symlink a folder, copying it where symlinks are not permitted (e.g. Windows without developer mode). """
+    if link.exists() or link.is_symlink():
+        return
+    try:
+        link.symlink_to(target, target_is_directory=True)
+    except OSError:
+        shutil.copytree(target, link)
+
+
+def _write_launcher(path: Path, entry_point: str, repo_root: Path, settings_path: Path, mt5_root: Path = None) -> Path:
+    """ Write an executable Python script that runs one of this module's entry points. """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    root_arg = f", mt5_root={str(mt5_root)!r}" if mt5_root else ""
+    path.write_text(
+        f"#!{sys.executable}\n"
+        f"import sys\n"
+        f"sys.path.insert(0, {str(repo_root)!r})\n"
+        f"from strategy_factory.testing.fake_mt5 import {entry_point}\n"
+        f"sys.exit({entry_point}(sys.argv[1:], settings_path={str(settings_path)!r}{root_arg}))\n",
+        encoding="utf-8",
+    )
+    path.chmod(0o755)
+    return path
+
+
+def terminal_main(args: list[str], settings_path: str, mt5_root: str) -> int:
+    """ Fake terminal64.exe: run the optimisation of a `/config:<ini>` file and write its report(s).
+
+    param args: Command line arguments
+    param settings_path: Report settings file
+    param mt5_root: Data folder of a non-portable terminal; a `/portable` terminal uses its own folder
+    return: Process exit code
+    """
+    ini_arg = next((arg for arg in args if arg.startswith("/config:")), None)
+    if ini_arg is None:
+        print("fake terminal: no /config:<ini> given", file=sys.stderr)
+        return 1
+
+    settings = FakeReportSettings.load(Path(settings_path))
+    root = Path(sys.argv[0]).resolve().parent if "/portable" in args else Path(mt5_root)
+
+    ini = configparser.ConfigParser()
+    ini.optionxform = str
+    ini.read(ini_arg[len("/config:"):], encoding="utf-16")
+    tester = ini["Tester"]
+    report = tester["Report"]
+
+    time.sleep(settings.latency)
+    inputs = _optimised_inputs(ini["TesterInputs"] if ini.has_section("TesterInputs") else {})
+    passes = synthetic_passes(inputs, settings.rows, settings.seed + zlib.crc32(report.encode()))
+
+    write_report(root / f"{report}.xml", RESULT_COLUMNS + list(inputs), passes["back"], settings.pad_kb)
+    if tester.get("ForwardMode", "0") != "0":
+        write_report(root / f"{report}.forward.xml", FORWARD_COLUMNS + list(inputs), passes["forward"],
+                     settings.pad_kb)
+    return 0
+
+
+def meta_editor_main(args: list[str], settings_path: str) -> int:
+    """ Fake metaeditor64.exe: "compile" `/compile:<file or folder>` (relative to the working directory).
+
+    param args: Command line arguments
+    param settings_path: Settings file (for the compile latency)
+    return: Number of failed files, like MetaEditor's error count
+    """
+    settings = FakeReportSettings.load(Path(settings_path))
+    failed = 0
+    for arg in args:
+        if not arg.startswith("/compile:"):
+            continue
+        target = Path(arg[len("/compile:"):])
+        sources = sorted(target.glob("*.mq5")) if target.is_dir() else [target]
+        log = []
+        for source in sources:
+            time.sleep(settings.compile_latency)
+            text = source.read_text(encoding="utf-8", errors="replace") if source.exists() else None
+            if text is None or COMPILE_ERROR_MARKER in text:
+                failed += 1
+                log.append(f"{source.name} : error 1: {'file not found' if text is None else 'fake compile error'}")
+                log.append("Result: 1 errors, 0 warnings")
+                continue
+            source.with_suffix(".ex5").write_bytes(b"EX5\x00" + zlib.compress(text.encode("utf-8")))
+            log.append(f"{source.name} : information: compiling")
+            log.append("Result: 0 errors, 0 warnings")
+
+        if "/log" in args:
+            target.with_suffix(".log").write_text("\n".join(log) + "\n", encoding="utf-16")
+    return failed
+
+
+def _optimised_inputs(tester_inputs) -> dict[str, list]:
+    """ Return the value grid of each input flagged `Y` (value||start||step||stop||Y). """
+    grids = {}
+    for name, spec in tester_inputs.items():
+        parts = [part.strip() for part in spec.split("||")]
+        if len(parts) != 5 or parts[4] != "Y":
+            continue
+        try:
+            start, step, stop = float(parts[1]), float(parts[2]), float(parts[3])
+        except ValueError:
+            grids[name] = [parts[0]]
+            continue
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1 if step > 0 and stop >= start else 1
+        grids[name] = [_number(start + i * step) for i in range(count)]
+    return grids
+
+
+def synthetic_passes(inputs: dict[str, list], rows: int, seed: int) -> dict[str, list[list]]:
+    """ Build `rows` distinct passes (capped by the input grid), sorted by Result like an MT5 export. """
+    rng = random.Random(seed)
+    grid_size = math.prod(len(values) for values in inputs.values())
+    if grid_size <= rows:
+        combos = list(itertools.product(*inputs.values()))
+    else:
+        combos = {tuple(rng.choice(values) for values in inputs.values()) for _ in range(rows * 2)}
+        combos = sorted(combos, key=str)[:rows]
+
+    back, forward = [], []
+    for number, combo in enumerate(combos):
+        metrics = _metrics(rng)
+        forward_metrics = _metrics(rng)
+        back.append([number, *metrics, *combo])
+        forward.append([number, forward_metrics[0], metrics[0], *forward_metrics[1:], *combo])
+
+    back.sort(key=lambda row: row[1], reverse=True)
+    forward.sort(key=lambda row: row[1], reverse=True)
+    return {"back": back, "forward": forward}
+
+
+def _metrics(rng: random.Random) -> list:
+    """ Result, Profit, Expected Payoff, Profit Factor, Recovery Factor, Sharpe Ratio, Custom, Equity DD %, Trades. """
+    trades = rng.randint(20, 400)
+    profit = round(rng.gauss(500, 1500), 2)
+    return [round(rng.uniform(0, 100), 4), profit, round(profit / trades, 2), round(rng.uniform(0.6, 2.4), 2),
+            round(rng.uniform(-1, 5), 2), round(rng.uniform(-1, 3), 2), round(rng.uniform(0, 10), 4),
+            round(rng.uniform(1, 40), 2), trades]
+
+
+def write_report(path: Path, header: list[str], rows: list[list], pad_kb: int = 0) -> Path:
+    """ Write a SpreadsheetML workbook like MT5's optimisation export: a header row, one row per pass and an
+    optional filler worksheet that the converter ignores.
+    """
+    def row(values) -> str:
+        cells = "".join(f'<Cell><Data ss:Type="{"Number" if isinstance(v, (int, float)) else "String"}">'
+                        f'{escape(str(v))}</Data></Cell>' for v in values)
+        return f"<Row>{cells}</Row>\n"
+
+    header_cells = "".join(f'<Cell><Data ss:Type="String">{escape(h)}</Data></Cell>' for h in header)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_WORKBOOK_HEAD)
+        f.write('<Worksheet ss:Name="Tester Optimizator Results"><Table>\n')
+        f.write(f"<Row>{header_cells}</Row>\n")
+        for values in rows:
+            f.write(row(values))
+        f.write("</Table></Worksheet>\n")
+
+        remaining = pad_kb * 1024 - f.tell()
+        if remaining > 0:
+            filler = row(["Padding", "x" * 200])
+            f.write('<Worksheet ss:Name="Padding"><Table>\n')
+            f.write(filler * (remaining // len(filler) + 1))
+            f.write("</Table></Worksheet>\n")
+        f.write("</Workbook>\n")
+    return path
+
+
+def _number(value: float):
+    return int(value) if float(value).is_integer() else round(value, 10)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Install a fake MT5 terminal and MetaEditor for tests and benchmarks.")
+    parser.add_argument("base_dir", type=Path, help="Folder to install into")
+    parser.add_argument("--rows", type=int, default=FakeReportSettings.rows, help="Passes per report")
+    parser.add_argument("--latency", type=float, default=FakeReportSettings.latency, help="Seconds per terminal run")
+    parser.add_argument("--pad-kb", type=int, default=FakeReportSettings.pad_kb, help="Minimum report size in KB")
+    parser.add_argument("--pool", type=int, default=0, help="Number of portable pool instances")
+    args = parser.parse_args(argv)
+
+    fake = install_fake_mt5(args.base_dir, FakeReportSettings(rows=args.rows, latency=args.latency,
+                                                              pad_kb=args.pad_kb), pool_size=args.pool)
+    print(f"Fake MT5 installed in {fake.base_dir}. To use it:")
+    print(f"    export STRATEGY_FACTORY_LOCAL_PATHS={fake.local_paths}")
+
+
+if __name__ == "__main__":
+    main()
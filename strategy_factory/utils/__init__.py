@@ -2,4 +2,8 @@ from .pathing import load_paths
 from .project_config import check_and_validate_config, load_config_from_yaml, ProjectConfig
 from .whitelist_loader import load_whitelist
 from .load_all_pipeline_stages import load_all_pipeline_stages
-from .init_logger import initialise_logging, initialise_pycharm_clickable_logging
+from .init_logger import initialise_logging, initialise_pycharm_clickable_logging, shutdown_logging
+from .log_context import job_context
+from .telemetry import annotate, span, start_trace, stop_trace, traced
+from .indicator_catalog import IndicatorCatalog, get_indicator_catalog
+from .template_env import get_template_env, load_template
@@ -0,0 +1,59 @@
+import hashlib
+import json
+from pathlib import Path
+
+# Read files in 1 MiB blocks when hashing
+_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: Path, digest=None) -> str:
+    """ Return the SHA-256 hex digest of a file's contents.
+
+    param path: File to hash
+    param digest: Optional hashlib object to feed instead of creating a new one
+    return: Hex digest string
+    """
+    digest = digest or hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_json(data) -> str:
+    """ Return the SHA-256 hex digest of a JSON-serialisable object, independent of dict key order.
+
+    param data: Object made of dicts, lists, strings and numbers
+    return: Hex digest string
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def tree_signature(root: Path) -> tuple:
+    """ Return a cheap signature of a directory tree from file paths, sizes and modification times.
+
+    param root: Directory to scan
+    return: Hashable tuple that changes whenever a file is added, removed or modified
+    """
+    if not root.exists():
+        return ()
+    entries = []
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        stat = path.stat()
+        entries.append((path.relative_to(root).as_posix(), stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+
+def hash_tree(root: Path) -> str:
+    """ Return the SHA-256 hex digest of every file (relative path and contents) under a directory.
+
+    param root: Directory to hash. A missing directory hashes like an empty one.
+    return: Hex digest string
+    """
+    digest = hashlib.sha256()
+    if root.exists():
+        for path in sorted(p for p in root.rglob("*") if p.is_file()):
+            digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+            hash_file(path, digest)
+    return digest.hexdigest()
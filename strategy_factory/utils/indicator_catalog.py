@@ -0,0 +1,189 @@
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+import yaml
+
+from .pathing import load_paths
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "indicator_index.json"
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+class IndicatorCatalog:
+    """ In-memory catalogue of parsed indicator YAML files, backed by an on-disk index.
+
+    Every YAML file is parsed once and served from memory afterwards. An entry is revalidated with a stat() on each
+    access: a changed mtime/size re-hashes the file, and only a changed SHA-256 re-parses it. A directory is rescanned
+    only when its own mtime changes (a file was added, removed or renamed). The parsed documents are persisted to the
+    index file, so a new process starts without re-parsing unchanged files. A document that JSON cannot reproduce
+    exactly (e.g. int keys or dates) is persisted without its contents and parsed again after a restart.
+
+    The index is written once per directory lookup (`names`/`find`) and by `save()`, not per parsed file; the
+    process-wide catalogue is also saved at exit.
+
+    All methods are thread-safe. Served documents are deep copies, so callers may modify them freely.
+
+    param index_path: Optional JSON index file (e.g. cache/indicator_index.json). None keeps the catalogue in memory.
+    """
+
+    def __init__(self, index_path: Path = None):
+        self.index_path = index_path
+        self._lock = threading.RLock()
+        self._files: dict[str, dict] = {}  # path -> {mtime_ns, size, sha256, document}
+        self._dirs: dict[str, dict] = {}  # directory -> {mtime_ns, names: {lowercase top-level key: path}}
+        self._load_index()
+
+    def document(self, yaml_path: Path) -> dict:
+        """ Return the parsed YAML document of an indicator file.
+
+        param yaml_path: Path to the indicator YAML
+        return: Deep copy of the parsed document ({indicator_name: data})
+        raises: FileNotFoundError if the file does not exist
+        """
+        with self._lock:
+            entry = self._entry(Path(yaml_path))
+        return copy.deepcopy(entry["document"])
+
+    def save(self) -> None:
+        """ Write the index file if any entry changed since it was last written. """
+        with self._lock:
+            self._save_index()
+
+    def find(self, indicators_dir: Path, indicator: str) -> Path:
+        """ Return the YAML file whose top-level key matches an indicator name (case-insensitive).
+
+        param indicators_dir: Directory containing indicator YAML files
+        param indicator: Name of the indicator
+        return: Path to the matching YAML file
+        raises: FileNotFoundError if not found
+        """
+        path = self.names(indicators_dir).get(indicator.lower())
+        if path is None:
+            raise FileNotFoundError(f"No YAML found for indicator '{indicator}' in {indicators_dir}")
+        return path
+
+    def names(self, indicators_dir: Path) -> dict[str, Path]:
+        """ Return {lowercase indicator name: YAML path} for every indicator YAML in a directory. """
+        directory = Path(indicators_dir)
+        with self._lock:
+            scanned = self._dirs.get(str(directory))
+            if scanned is None or scanned["mtime_ns"] != directory.stat().st_mtime_ns or self._edited(scanned):
+                scanned = self._scan(directory)
+            self._save_index()
+            return {name: Path(path) for name, path in scanned["names"].items()}
+
+    def _edited(self, scanned: dict) -> bool:
+        """ True if a scanned file's contents changed: an edit can rename an indicator without touching the directory. """
+        for path in scanned["names"].values():
+            before = self._files.get(path, {}).get("sha256")
+            try:
+                if self._entry(Path(path))["sha256"] != before:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan(self, directory: Path) -> dict:
+        """ Index every YAML file of a directory. Files that fail to parse are skipped with a warning. """
+        names = {}
+        for yaml_path in sorted(directory.glob("*.yaml")):
+            try:
+                document = self._entry(yaml_path)["document"]
+            except (OSError, yaml.YAMLError) as e:
+                logger.warning(f"Skipping unreadable indicator YAML {yaml_path.name}: {e}")
+                continue
+            if isinstance(document, dict) and document:
+                names.setdefault(str(next(iter(document))).lower(), str(yaml_path))
+
+        scanned = {"mtime_ns": directory.stat().st_mtime_ns, "names": names}
+        self._dirs[str(directory)] = scanned
+        self._changed = True
+        return scanned
+
+    def _entry(self, yaml_path: Path) -> dict:
+        """ Return the index entry of a file, re-hashing/re-parsing it if it changed. Call with the lock held.
+
+        An entry loaded from the index without its document (see `_save_index`) is parsed again on first use.
+        """
+        key = str(yaml_path)
+        stat = yaml_path.stat()
+        entry = self._files.get(key)
+        parsed = entry is not None and "document" in entry
+        if parsed and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+
+        raw = yaml_path.read_bytes()
+        sha256 = hashlib.sha256(raw).hexdigest()
+        if parsed and entry["sha256"] == sha256:
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            document = yaml.safe_load(raw)
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256, "document": document,
+                     "portable": _round_trips(document)}
+            self._files[key] = entry
+            logger.debug(f"Indexed indicator YAML: {yaml_path.name}")
+
+        self._changed = True
+        return entry
+
+    def _load_index(self):
+        self._changed = False
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            self._files = index.get("files", {})
+            for entry in self._files.values():
+                if not entry.get("portable"):
+                    entry.pop("document", None)
+            self._dirs = index.get("dirs", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable indicator index {self.index_path}: {e}")
+
+    def _save_index(self):
+        """ Persist the index if anything changed. Call with the lock held.
+
+        Documents that do not round-trip through JSON are left out, so a restart never serves an altered copy.
+        """
+        if not self.index_path or not self._changed:
+            return
+        self._changed = False
+        files = {key: entry if entry.get("portable") else {k: v for k, v in entry.items() if k != "document"}
+                 for key, entry in self._files.items()}
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump({"files": files, "dirs": self._dirs}, f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write indicator index {self.index_path}: {e}")
+
+
+def get_indicator_catalog() -> IndicatorCatalog:
+    """ Return the process-wide catalogue, indexed in CACHE_DIR/indicator_index.json. """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = IndicatorCatalog(load_paths()["CACHE_DIR"] / INDEX_FILE)
+            atexit.register(_catalog.save)
+        return _catalog
+
+
+def _round_trips(document) -> bool:
+    """ True if JSON reproduces a parsed YAML document exactly (no int keys, dates, NaN, ...). """
+    try:
+        return json.loads(json.dumps(document)) == document
+    except (TypeError, ValueError):
+        return False
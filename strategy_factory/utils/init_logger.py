@@ -1,7 +1,15 @@
+import atexit
+import json
+import queue
 import sys
 import logging
+import logging.handlers
 from pathlib import Path
 
+from .log_context import JOB_FIELDS, JobContextFilter
+
+_listener: logging.handlers.QueueListener | None = None
+
 
 def initialise_pycharm_clickable_logging(level=logging.INFO):
     """Configure logging so PyCharm console makes log lines clickable.
@@ -10,36 +18,125 @@ def initialise_pycharm_clickable_logging(level=logging.INFO):
     logging.basicConfig(level=level, format='File "%(pathname)s", line %(lineno)d, in %(funcName)s: %(message)s')
 
 
-def initialise_logging(fmt_key="simple", date_key="default", log_file: Path = None, level: int = logging.INFO):
+def initialise_logging(fmt_key="simple", date_key="default", log_file: Path = None, level: int = logging.INFO,
+                       use_queue: bool = False, max_bytes: int = 0, backup_count: int = 5):
     """ Initialise the logging configuration.
 
+    With use_queue, the root logger only puts records on a queue and a background QueueListener writes them to the
+    console and file, so logging never blocks a terminal or report-parsing thread and lines are not interleaved.
+
+    Every record carries the job fields of `job_context` (stage, indicator, phase, terminal). The "json" format writes
+    one JSON object per line, including the job fields that are set.
+
     param log_file: Optional path for log file output
     param level: Logging level
-    param fmt_key: One of: ("simple", "name", "traceback", "process_thread", "module_func", "pipe")
+    param fmt_key: One of: ("simple", "name", "traceback", "process_thread", "module_func", "pipe", "json", "job", ...)
     param date_key: One of: ("default", "uk", "time_only", "12hr", "short")
+    param use_queue: If True, write the log from a background thread fed through a queue
+    param max_bytes: Rotate the log file when it reaches this size (0 = never rotate)
+    param backup_count: Number of rotated log files to keep
     """
-    log_format = get_log_format(fmt_key)
+    global _listener
     date_format = get_date_fmt(date_key)
-    formatter = logging.Formatter(log_format, datefmt=date_format)
+    if fmt_key == "json":
+        formatter = JsonFormatter(datefmt=date_format)
+    else:
+        formatter = logging.Formatter(get_log_format(fmt_key), datefmt=date_format)
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
-    # Remove old handlers
+    # Remove old handlers (and stop the listener of a previous queue setup, flushing its records)
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    shutdown_logging()
 
     # Console handler
+    handlers = []
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler
     if log_file:
         log_file = Path(log_file)
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        if max_bytes:
+            file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                                backupCount=backup_count, encoding="utf-8")
+        else:
+            file_handler = logging.FileHandler(log_file, encoding="utf-8")
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if not use_queue:
+        for handler in handlers:
+            handler.addFilter(JobContextFilter())
+            root_logger.addHandler(handler)
+        return
+
+    # The job context belongs to the emitting thread, so it is added before the record is queued
+    queue_handler = _ContextQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(JobContextFilter())
+    root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """ Stop the queue listener (if any), writing out the records still queued. Called at exit. """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """ QueueHandler that keeps the message and traceback as separate fields, so the listener's formatter (e.g. JSON)
+    still sees them. The stock handler merges the traceback into the message. """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXCEPTION_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """ Format records as one JSON object per line: time, level, logger, file, line and msg, plus the job fields that
+    are set and the traceback (exc) if any. """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        for key in JOB_FIELDS:
+            value = getattr(record, key, "")
+            if value:
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
 
 def get_date_fmt(date_key: str) -> str:
@@ -90,10 +187,15 @@ def get_log_format(fmt_key: str) -> str:
         # Example: my_script.py:42: INFO: Started main loop
         "short_click": "%(filename)s:%(lineno)d: %(levelname)s: %(message)s",
 
-        # json: Structured log, ready for ingestion into ELK, Splunk, etc
-        # Example: {"time": "2025-06-07 22:15:00", "level": "INFO", "logger": "my_module", "file": "my_script.py", "line": 42, "msg": "Started main loop"}
+        # json: Structured log, ready for ingestion into ELK, Splunk, etc. Formatted by JsonFormatter (a real JSON
+        # encoder); this template is only a fallback for plain Formatters and does not escape the message.
+        # Example: {"time": "2025-06-07 22:15:00", "level": "INFO", "logger": "my_module", "file": "my_script.py", "line": 42, "msg": "Started main loop", "stage": "Trigger", "indicator": "macd"}
         "json": '{"time": "%(asctime)s", "level": "%(levelname)s", "logger": "%(name)s", "file": "%(filename)s", "line": %(lineno)d, "msg": "%(message)s"}',
 
+        # job: Adds the job context (see job_context)—useful with several terminals running at once
+        # Example: 2025-06-07 22:15:00 [INFO] [Trigger/macd/IS@t0] Started main loop
+        "job": "%(asctime)s [%(levelname)s] [%(stage)s/%(indicator)s/%(phase)s@%(terminal)s] %(message)s",
+
         # minimal: Just level and message—great for very terse console logs
         # Example: INFO:Started main loop
         "minimal": "%(levelname)s:%(message)s",
@@ -0,0 +1,49 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+# Per-job fields added to every log record (empty outside a job)
+JOB_FIELDS = ("stage", "indicator", "phase", "terminal")
+
+_job: ContextVar[dict] = ContextVar("log_job_context", default={})
+
+
+@contextmanager
+def job_context(**fields) -> Iterator[None]:
+    """ Tag every log record emitted inside the context (in this thread or task) with job fields.
+
+    Nested contexts add to the outer fields, e.g. the terminal pool sets `terminal` and the stage runner sets `stage`,
+    `indicator` and `phase` within it. Fields left as None are not set.
+
+    param fields: Any of JOB_FIELDS (stage, indicator, phase, terminal)
+    """
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown log context field(s): {', '.join(sorted(unknown))}")
+
+    token = _job.set({**_job.get(), **{key: value for key, value in fields.items() if value is not None}})
+    try:
+        yield
+    finally:
+        _job.reset(token)
+
+
+def current_job() -> dict:
+    """ Return the job fields of the current context. """
+    return dict(_job.get())
+
+
+class JobContextFilter(logging.Filter):
+    """ Add the JOB_FIELDS of the current job context to each record ("" when unset), so any format can use them.
+
+    Attach it to a handler that runs in the thread emitting the record (the QueueHandler in queue mode), as that is the
+    thread the context belongs to.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        job = _job.get()
+        for key in JOB_FIELDS:
+            if not hasattr(record, key):
+                setattr(record, key, job.get(key, ""))
+        return True
@@ -1,11 +1,23 @@
+import functools
+import os
 from pathlib import Path
 import yaml
 
+# Environment variable pointing to an alternative local_paths.yaml (e.g. the fake MT5 install used by tests and CI)
+LOCAL_PATHS_ENV = "STRATEGY_FACTORY_LOCAL_PATHS"
 
-def _load_private_paths() -> dict:
-    """Load private MT5 paths from a local YAML config file, and validate them."""
-    config_path = Path(__file__).parent.parent.parent / "config" / "local_paths.yaml"
 
+def local_paths_file() -> Path:
+    """Return the private path config: $STRATEGY_FACTORY_LOCAL_PATHS if set, otherwise config/local_paths.yaml."""
+    override = os.environ.get(LOCAL_PATHS_ENV)
+    if override:
+        return Path(override)
+    return Path(__file__).parent.parent.parent / "config" / "local_paths.yaml"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_private_paths(config_path: Path) -> dict:
+    """Load private MT5 paths from a local YAML config file, and validate them."""
     if not config_path.exists():
         raise FileNotFoundError(f"Missing config file: {config_path}.")
 
@@ -15,39 +27,45 @@ def _load_private_paths() -> dict:
     # Detect if the user left the template placeholders unchanged
     if "YOUR_USERNAME" in config["mt5_root"] or "YOUR_TERMINAL_ID" in config["mt5_root"]:
         raise ValueError(
-            "It looks like you're still using placeholder values in 'config/local_paths.yaml'.\n "
-            "Please update the file with your actual MT5 installation paths."
+            f"It looks like you're still using placeholder values in '{config_path}'.\n "
+            "Please update the file with your actual MT5 installation paths, or point "
+            f"{LOCAL_PATHS_ENV} to another paths file."
         )
 
     return config
 
 
-# Load private path configuration
-_private_paths = _load_private_paths()
-mt5_root = Path(_private_paths["mt5_root"])
-mt5_terminal_exe = Path(_private_paths["mt5_terminal_exe"])
-mt5_meta_editor_exe = Path(_private_paths["mt5_meta_editor_exe"])
-pro_root = Path(_private_paths["strategy_factory_root"])
-
-
 def load_paths() -> dict:
-    """Return a dictionary of key project paths based on private path config."""
+    """Return a dictionary of key project paths based on private path config.
+
+    The config file is read on first use (and cached), so LOCAL_PATHS_ENV can be set any time before that.
+    """
+    private_paths = _load_private_paths(local_paths_file())
+    mt5_root = Path(private_paths["mt5_root"])
+    pro_root = Path(private_paths["strategy_factory_root"])
 
     # Derived paths
     mt5_test_cache = mt5_root / "Tester" / "cache"
     mt5_experts_dir = mt5_root / "MQL5" / "Experts"
+    mt5_include_dir = mt5_root / "MQL5" / "Include"
     indicator_dir = pro_root / "indicators"
     output_dir = pro_root / "outputs"
     pipelines_dir = pro_root / "strategy_factory" / "pipelines"
+    cache_dir = pro_root / "cache"
 
     return {
         "MT5_ROOT": mt5_root,
-        "MT5_TERM_EXE": mt5_terminal_exe,
+        "MT5_TERM_EXE": Path(private_paths["mt5_terminal_exe"]),
         "MT5_EXPERT_DIR": mt5_experts_dir,
-        "MT5_META_EDITOR_EXE": mt5_meta_editor_exe,
+        "MT5_INCLUDE_DIR": mt5_include_dir,
+        "MT5_META_EDITOR_EXE": Path(private_paths["mt5_meta_editor_exe"]),
         "PRO_ROOT": pro_root,
         "MT5_TEST_CACHE": mt5_test_cache,
         "INDICATOR_DIR": indicator_dir,
         "OUTPUT_DIR": output_dir,
         "PIPELINE_DIR": pipelines_dir,
+        "MT5_TERMINAL_POOL": [Path(p) for p in (private_paths.get("mt5_terminal_pool") or [])],
+        "CACHE_DIR": cache_dir,
+        "RESULT_CACHE_DIR": cache_dir / "results",
+        "EA_CACHE_DIR": cache_dir / "experts",
     }
@@ -20,6 +20,20 @@ class OptSettings:
     min_trade: int
     max_iterations: int
     max_iterations_per_param: bool = False
+    timeout_minutes: float = 0  # Wall-clock limit per MT5 run; 0 disables the timeout
+    model: int = 1  # MT5 tick model (0=every tick, 1=1-minute OHLC, 2=open prices only, 4=real ticks)
+    tiered: bool = False  # Screen all indicators on screen_model, then re-run the top final_top_k on final_model
+    screen_model: int = 2
+    final_model: int = 1
+    final_top_k: int = 5
+    halving: bool = False  # Successive halving: small grids for all indicators, larger grids for the best by IS
+    halving_min_iterations: int = 10  # Grid budget of the first round
+    halving_eta: float = 2  # Keep 1/eta of the indicators per round and grow the grid budget eta-fold
+    zoom_rounds: int = 0  # Re-optimise IS this many times, each inside a box narrowed around the best passes
+    zoom_top_n: int = 5  # Number of best IS passes that define the next zoom box
+    sampling: str = ""  # 'lhs', 'halton' or 'sobol': optimise inp_sample_idx over a sample table instead of a grid
+    sample_size: int = 0  # Rows in the sample table; 0 uses max_iterations
+    sample_seed: int = 0
 
 
 @dataclass
@@ -36,10 +50,13 @@ class ProjectConfig:
     currency: str = "USD"
     leverage: int = 100
     data_split: str = "none"
+    forward_date: str = ""  # Start of the MT5 forward period when data_split is 'forward' (YYYY.MM.DD)
     risk: float = 0.0
     sl: float = 0.0
     tp: float = 0.0
     opt_settings: dict = field(default_factory=dict)
+    use_result_cache: bool = True
+    resource_sample_seconds: float = 5  # Sample CPU/RAM/IO of each MT5 run this often; 0 disables
 
 
 def load_config_from_yaml(config_path: Path) -> ProjectConfig:
@@ -139,10 +156,22 @@ def validate_config(config: dict):
             f"Invalid period: {config['period']}. Must be one of: {', '.join(allowed_periods)}"
         )
 
-    allowed_splits = {"none", "year", "month"}
+    allowed_splits = {"none", "year", "month", "forward"}
     if config["data_split"] not in allowed_splits:
         raise ValueError(
-            "data_split must be one of: none, year, month"
+            "data_split must be one of: none, year, month, forward"
         )
 
+    # --- Forward testing: the terminal splits IS/OOS at forward_date ---
+    if config["data_split"] == "forward":
+        forward_date = config.get("forward_date")
+        try:
+            forward = datetime.strptime(forward_date or "", "%Y.%m.%d")
+        except ValueError:
+            raise ValueError("data_split 'forward' requires forward_date in YYYY.MM.DD format")
+
+        if not (datetime.strptime(config["start_date"], "%Y.%m.%d") < forward
+                < datetime.strptime(config["end_date"], "%Y.%m.%d")):
+            raise ValueError("forward_date must lie between start_date and end_date")
+
     logger.info("Configuration validated successfully.")
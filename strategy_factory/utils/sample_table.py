@@ -0,0 +1,190 @@
+import importlib.util
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_IDX_INPUT = "inp_sample_idx"
+SAMPLES_SUFFIX = "_samples.csv"
+SAMPLING_METHODS = ("lhs", "halton", "sobol")
+
+# Each attempt grows the design by this factor until enough unique rows pass the constraints
+_OVERSAMPLE_FACTORS = (1, 2, 4, 8, 16, 32)
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71)
+
+
+def sample_inputs(indi_data: dict) -> dict:
+    """ Return the inputs of an indicator that a sample table covers: optimised numeric inputs with a min/max range.
+
+    param indi_data: Parsed indicator YAML data
+    return: Dict of {input_name: input definition}, indicator inputs first, then logic inputs
+    """
+    inputs = {**(indi_data.get("indicator_inputs") or {}), **(indi_data.get("logic_inputs") or {})}
+    return {
+        name: param for name, param in inputs.items()
+        if param.get("optimise", True) and "min" in param and "max" in param
+        and isinstance(param.get("default"), (int, float))
+    }
+
+
+def build_sample_table(inputs: dict, n_samples: int, method: str = "lhs", seed: int = 0,
+                       constraints: list[str] = None) -> pd.DataFrame:
+    """ Build a space-filling table of parameter tuples.
+
+    A design of points in the unit cube (Latin hypercube, Halton or Sobol) is scaled onto each input's min/max range
+    and snapped to its YAML step. Duplicate tuples and tuples failing any constraint are dropped; the design is grown
+    until n_samples rows are left or the grid is exhausted.
+
+    param inputs: Dict of {input_name: {default, min, max, step, type}} (see `sample_inputs`)
+    param n_samples: Number of rows wanted
+    param method: 'lhs', 'halton' or 'sobol' (Sobol needs scipy; falls back to Halton without it)
+    param seed: Seed of the Latin hypercube / Sobol scrambling
+    param constraints: Boolean expressions over input names, e.g. ['InpFastEMA < InpSlowEMA'] (see `DataFrame.eval`)
+    return: DataFrame with one column per input; the row position is the sample index
+    raises: ValueError for an unknown method
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method '{method}', expected one of {SAMPLING_METHODS}")
+
+    names = list(inputs)
+    table = pd.DataFrame(columns=names)
+    if not names or n_samples <= 0:
+        return table
+
+    if method == "sobol" and importlib.util.find_spec("scipy") is None:
+        logger.warning("scipy is not installed; using a Halton design instead of Sobol")
+        method = "halton"
+
+    for factor in _OVERSAMPLE_FACTORS:
+        unit = _unit_design(method, n_samples * factor, len(names), seed)
+        table = pd.DataFrame({name: _snap(unit[:, j], inputs[name]) for j, name in enumerate(names)})
+        table = table.drop_duplicates()
+        for expr in constraints or []:
+            table = table[table.eval(expr).astype(bool)]
+        if len(table) >= n_samples:
+            break
+
+    if len(table) < n_samples:
+        logger.info(f"Sample table has {len(table)} of {n_samples} rows: the constrained grid is exhausted")
+
+    return table.head(n_samples).reset_index(drop=True)
+
+
+def build_grid_table(inputs: dict, max_iterations: int, seed: int = 0, constraints: list[str] = None) -> pd.DataFrame:
+    """ Build a table of every combination of the scaled grid, with `scale: log` inputs spread geometrically.
+
+    MT5 can only walk linear grids, so an indicator with log-spaced inputs is optimised over this table through
+    inp_sample_idx. The rows are shuffled, so the first rows of a smaller budget (e.g. a halving round) are an even
+    subset of the grid.
+
+    param inputs: Dict of {input_name: {default, min, max, step, type, scale}} (see `sample_inputs`)
+    param max_iterations: Pass budget the grid is scaled to (see `ParameterSpace.solve_steps`)
+    param seed: Seed of the row shuffle
+    param constraints: Boolean expressions over input names that every row must satisfy
+    return: DataFrame with one column per input; the row position is the sample index
+    """
+    # Imported here: gen_initilisation_file imports this module through the .ini generator
+    from strategy_factory.gen_initilisation_file.parameter_space import ParameterSpace
+
+    space = ParameterSpace.from_inputs(inputs).solve_steps(max_iterations)
+    grid = space.grid()
+    table = pd.DataFrame({name: grid[:, j].round().astype(int) if space.is_int[j] else grid[:, j].round(8)
+                          for j, name in enumerate(space.names)})
+    for expr in constraints or []:
+        table = table[table.eval(expr).astype(bool)]
+    return table.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def stage_sample_table(project_config, stage_name: str, indi_data: dict) -> pd.DataFrame | None:
+    """ Build the sample table of an indicator if sampling is enabled for the stage or it has log-spaced inputs.
+
+    Without a sampling method, an indicator with a `scale: log` input gets a table of its grid (see `build_grid_table`).
+
+    param project_config: Project configuration object
+    param stage_name: Stage whose opt_settings hold sampling/sample_size/sample_seed
+    param indi_data: Parsed indicator YAML data (its 'constraints' list filters the table)
+    return: DataFrame of parameter tuples, or None if the stage uses the regular min/step/max grid
+    """
+    settings = project_config.opt_settings.get(stage_name)
+    method = getattr(settings, "sampling", "") or ""
+    inputs = sample_inputs(indi_data)
+    if not inputs:
+        return None
+
+    if not method:
+        if not any(param.get("scale") == "log" for param in inputs.values()):
+            return None
+        return build_grid_table(inputs, settings.max_iterations, getattr(settings, "sample_seed", 0),
+                                indi_data.get("constraints"))
+
+    n_samples = getattr(settings, "sample_size", 0) or settings.max_iterations
+    return build_sample_table(inputs, n_samples, method.lower(), getattr(settings, "sample_seed", 0),
+                              indi_data.get("constraints"))
+
+
+def load_sample_table(ea_output_dir: Path, indi_name: str) -> pd.DataFrame | None:
+    """ Load the sample table written next to an EA's .mq5, or None if the EA uses the regular grid. """
+    path = ea_output_dir / f"{indi_name}{SAMPLES_SUFFIX}"
+    if not path.exists():
+        return None
+    return pd.read_csv(path, index_col=SAMPLE_IDX_INPUT)
+
+
+def write_sample_table(table: pd.DataFrame | None, ea_output_dir: Path, indi_name: str) -> None:
+    """ Write an EA's sample table next to its .mq5, or remove a stale one if the EA uses the regular grid. """
+    path = ea_output_dir / f"{indi_name}{SAMPLES_SUFFIX}"
+    if table is None:
+        path.unlink(missing_ok=True)
+        return
+    table.to_csv(path, index_label=SAMPLE_IDX_INPUT)
+
+
+def _unit_design(method: str, n: int, dims: int, seed: int) -> np.ndarray:
+    """ Return an (n, dims) array of points in [0, 1). """
+    if method == "sobol":
+        from scipy.stats import qmc
+        m = int(np.ceil(np.log2(max(n, 2))))
+        return qmc.Sobol(d=dims, scramble=True, seed=seed).random_base2(m)[:n]
+
+    if method == "halton":
+        return _halton(n, dims)
+
+    rng = np.random.default_rng(seed)
+    strata = np.array([rng.permutation(n) for _ in range(dims)]).T
+    return (strata + rng.random((n, dims))) / n
+
+
+def _halton(n: int, dims: int) -> np.ndarray:
+    """ Halton sequence (radical inverse in the first `dims` primes), skipping the all-zero first point. """
+    if dims > len(_PRIMES):
+        raise ValueError(f"Halton design supports at most {len(_PRIMES)} inputs, got {dims}")
+
+    points = np.zeros((n, dims))
+    for j, base in enumerate(_PRIMES[:dims]):
+        index = np.arange(1, n + 1)
+        fraction = 1.0
+        while index.any():
+            fraction /= base
+            points[:, j] += fraction * (index % base)
+            index //= base
+    return points
+
+
+def _snap(unit: np.ndarray, param: dict) -> np.ndarray:
+    """ Scale unit-interval values onto an input's min/max range (geometrically for `scale: log`), on its step grid. """
+    lo, hi = float(param["min"]), float(param["max"])
+    step = float(param.get("step", 1)) or (hi - lo) or 1.0
+    n_steps = int(np.floor((hi - lo) / step + 1e-9))
+    if param.get("scale") == "log" and lo > 0:
+        # Spread log axes geometrically, then snap onto the step grid
+        raw = np.exp(np.log(lo) + unit * (np.log(hi) - np.log(lo)))
+        values = np.clip(lo + np.round((raw - lo) / step) * step, lo, hi)
+    else:
+        values = np.clip(lo + np.floor(unit * (n_steps + 1)) * step, lo, hi)
+
+    if param.get("type") == "int" or isinstance(param.get("default"), int):
+        return values.round().astype(int)
+    return values.round(8)
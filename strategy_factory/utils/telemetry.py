@@ -0,0 +1,126 @@
+import atexit
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .log_context import current_job
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE = "trace.jsonl"
+
+_tracer = None
+_tracer_lock = threading.Lock()
+_span_ids = itertools.count(1)
+_current: ContextVar[tuple[int, dict] | None] = ContextVar("trace_span", default=None)
+
+
+class Tracer:
+    """ Append-only JSONL writer of finished spans, one JSON object per line. Thread-safe.
+
+    param path: Trace file (e.g. outputs/<run>/trace.jsonl), appended to if it exists
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def start_trace(path: Path) -> Tracer:
+    """ Send the spans of this process to a trace file. A no-op if that file is already the active trace.
+
+    param path: Trace file, e.g. outputs/<run>/trace.jsonl
+    return: The active Tracer
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None or _tracer.path != Path(path):
+            if _tracer is not None:
+                _tracer.close()
+            _tracer = Tracer(path)
+            logger.debug(f"Tracing spans to {_tracer.path}")
+        return _tracer
+
+
+def stop_trace() -> None:
+    """ Close the active trace file (if any). Called at exit. """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is not None:
+            _tracer.close()
+            _tracer = None
+
+
+atexit.register(stop_trace)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[dict]:
+    """ Time a block as a named span (e.g. "compile", "optimise") and write it to the active trace.
+
+    The span records its wall-clock start (ts, epoch seconds), duration (dur, seconds), status ("ok" or the exception
+    type), process, thread, parent span and the job fields of `job_context` (stage, indicator, phase, terminal).
+    Without an active trace it only runs the block.
+
+    param name: Span (phase) name
+    param attrs: Extra JSON-serialisable fields; the yielded dict may be updated inside the block
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield attrs
+        return
+
+    span_id = next(_span_ids)
+    parent = _current.get()
+    token = _current.set((span_id, attrs))
+    started, start = time.time(), time.perf_counter()
+    status = "ok"
+    try:
+        yield attrs
+    except BaseException as e:
+        status = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current.reset(token)
+        tracer.write({"name": name, "id": span_id, "parent": parent[0] if parent else None,
+                      "ts": round(started, 6), "dur": round(duration, 6), "status": status, "pid": os.getpid(),
+                      "thread": threading.current_thread().name, **current_job(), **attrs})
+
+
+def traced(name: str) -> Callable:
+    """ Decorator: run every call of the function inside `span(name)`. """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def annotate(**attrs) -> None:
+    """ Add fields to the innermost open span of this thread/task (ignored without an active trace). """
+    current = _current.get()
+    if current is not None:
+        current[1].update(attrs)
@@ -0,0 +1,56 @@
+import logging
+import threading
+from pathlib import Path
+
+from jinja2 import BaseLoader, Environment, FileSystemBytecodeCache, Template, TemplateNotFound
+
+from .pathing import load_paths
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_CACHE_DIR = "templates"
+
+_env = None
+_env_lock = threading.Lock()
+
+
+class _AbsolutePathLoader(BaseLoader):
+    """ Load templates by their absolute path, so the templates of every pipeline share one environment. """
+
+    def get_source(self, environment: Environment, template: str):
+        path = Path(template)
+        if not path.is_file():
+            raise TemplateNotFound(template)
+
+        mtime = path.stat().st_mtime_ns
+        return path.read_text(encoding="utf-8"), str(path), lambda: path.stat().st_mtime_ns == mtime
+
+
+def get_template_env() -> Environment:
+    """ Return the process-wide Jinja2 environment shared by all pipeline templates.
+
+    Compiled templates are kept in memory (and reloaded when the file changes), and their bytecode is cached in
+    CACHE_DIR/templates, so a new process skips the template compilation too.
+    """
+    global _env
+    with _env_lock:
+        if _env is None:
+            cache_dir = load_paths()["CACHE_DIR"] / TEMPLATE_CACHE_DIR
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+            except OSError as e:
+                logger.warning(f"Template bytecode cache disabled, cannot create {cache_dir}: {e}")
+                bytecode_cache = None
+            _env = Environment(loader=_AbsolutePathLoader(), bytecode_cache=bytecode_cache, auto_reload=True)
+        return _env
+
+
+def load_template(template_path: Path | str) -> Template:
+    """ Return the compiled template of a file from the shared environment.
+
+    param template_path: Path to the .j2 template
+    return: Compiled Jinja2 Template
+    raises: TemplateNotFound if the file does not exist
+    """
+    return get_template_env().get_template(str(Path(template_path).resolve()))
@@ -0,0 +1,149 @@
+""" Summarise a run's span trace (outputs/<run>/trace.jsonl) and export it for chrome://tracing or Perfetto.
+
+Usage:
+    python -m strategy_factory.utils.trace_report outputs/<run>/trace.jsonl [--chrome trace.json] [--stage Trigger]
+"""
+import argparse
+import json
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# Span fields that are not passed to the Chrome trace as args
+_EVENT_FIELDS = {"name", "ts", "dur", "pid", "thread"}
+
+
+def load_trace(trace_path: Path) -> pd.DataFrame:
+    """ Load the spans of a JSONL trace. A line that is not valid JSON (e.g. cut off by a crash) is skipped.
+
+    param trace_path: Trace file written by `telemetry.span`
+    return: DataFrame with one row per span
+    """
+    records = []
+    with open(trace_path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping invalid trace line {number} of {trace_path}")
+    spans = pd.DataFrame(records)
+    for column in ("stage", "indicator", "phase", "terminal"):
+        if column not in spans.columns:
+            spans[column] = None
+    return spans
+
+
+def phase_summary(spans: pd.DataFrame) -> pd.DataFrame:
+    """ Duration statistics per span name (phase): count, total, mean, percentiles and max, in seconds.
+
+    param spans: Spans as returned by `load_trace`
+    return: DataFrame indexed by span name, sorted by total time
+    """
+    return _summarise(spans, ["name"])
+
+
+def indicator_summary(spans: pd.DataFrame) -> pd.DataFrame:
+    """ Duration statistics per indicator and span name, in seconds. Spans without an indicator are left out.
+
+    param spans: Spans as returned by `load_trace`
+    return: DataFrame indexed by (indicator, name), sorted by indicator then total time
+    """
+    table = _summarise(spans[spans["indicator"].notna()], ["indicator", "name"])
+    return table.sort_values(["indicator", "total"], ascending=[True, False]) if not table.empty else table
+
+
+def resource_summary(spans: pd.DataFrame) -> pd.DataFrame:
+    """ Resource use of every sampled terminal run: busy cores (mean/max), peak RSS, disk I/O and peak agent count.
+
+    param spans: Spans as returned by `load_trace`
+    return: DataFrame indexed by (stage, indicator, phase), empty if no run was sampled
+    """
+    if "cpu_cores_mean" not in spans.columns:
+        return pd.DataFrame()
+    runs = spans[(spans["name"] == "optimise") & spans["cpu_cores_mean"].notna()]
+    columns = ["dur", "cpu_cores_mean", "cpu_cores_max", "rss_mb_max", "read_mb", "write_mb", "agents_max"]
+    return runs.set_index(["stage", "indicator", "phase"])[columns].sort_index()
+
+
+def _summarise(spans: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    if spans.empty:
+        return pd.DataFrame()
+    grouped = spans.groupby(keys)["dur"]
+    table = grouped.agg(count="count", total="sum", mean="mean")
+    for q in PERCENTILES:
+        table[f"p{round(q * 100)}"] = grouped.quantile(q)
+    table["max"] = grouped.max()
+    return table.sort_values("total", ascending=False).round(3)
+
+
+def export_chrome_trace(spans: pd.DataFrame, output_path: Path) -> Path:
+    """ Write spans in the Chrome trace event format (open in chrome://tracing or ui.perfetto.dev).
+
+    Every span is a complete ("X") event on its thread, with its job fields and attributes as args.
+
+    param spans: Spans as returned by `load_trace`
+    param output_path: Output .json file
+    return: The output path
+    """
+    threads = {}
+    events = []
+    for record in spans.to_dict(orient="records"):
+        # Fields a span did not set are NaN in the frame, which is not valid JSON
+        record = {k: v for k, v in record.items() if v is not None and not (isinstance(v, float) and v != v)}
+        thread_key = (record.get("pid"), record.get("thread"))
+        tid = threads.setdefault(thread_key, len(threads) + 1)
+        events.append({
+            "name": record["name"],
+            "cat": record.get("stage") or "run",
+            "ph": "X",
+            "ts": round(record["ts"] * 1e6),
+            "dur": round(record["dur"] * 1e6),
+            "pid": record.get("pid"),
+            "tid": tid,
+            "args": {k: v for k, v in record.items() if k not in _EVENT_FIELDS},
+        })
+
+    for (pid, thread), tid in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+
+    output_path = Path(output_path)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str, allow_nan=False)
+    return output_path
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Summarise a run's span trace (trace.jsonl).")
+    parser.add_argument("trace", type=Path, help="Trace file, e.g. outputs/<run>/trace.jsonl")
+    parser.add_argument("--stage", help="Only spans of this stage")
+    parser.add_argument("--chrome", type=Path, help="Also write a Chrome trace (.json) to this path")
+    args = parser.parse_args(argv)
+
+    spans = load_trace(args.trace)
+    if args.stage:
+        spans = spans[spans["stage"] == args.stage]
+    if spans.empty:
+        print("No spans found.")
+        return
+
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(f"Per phase (seconds), {len(spans)} spans:")
+        print(phase_summary(spans).to_string())
+        print("\nPer indicator (seconds):")
+        print(indicator_summary(spans).to_string())
+        resources = resource_summary(spans)
+        if not resources.empty:
+            print("\nTerminal resources per run (cores, MB):")
+            print(resources.to_string())
+
+    if args.chrome:
+        print(f"\nChrome trace written to {export_chrome_trace(spans, args.chrome)}")
+
+
+if __name__ == "__main__":
+    main()
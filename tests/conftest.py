@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+from strategy_factory.testing import install_fake_mt5, use_fake_mt5
+from strategy_factory.utils.pathing import LOCAL_PATHS_ENV
+
+# Run the suite against a throwaway fake MT5 install, unless a paths file is given explicitly
+if LOCAL_PATHS_ENV not in os.environ:
+    _fake_mt5_dir = tempfile.TemporaryDirectory(prefix="fake_mt5_")
+    use_fake_mt5(install_fake_mt5(_fake_mt5_dir.name))
@@ -0,0 +1,84 @@
+import stat
+import sys
+import time
+
+from strategy_factory.gen_expert_advisor.batch_compiler import compile_batch, compile_directory
+from strategy_factory.stage_execution.get_compiled_indicators import get_compiled_indicators
+
+# Minimal MetaEditor stand-in: compiles /compile:<file or folder> relative to the working directory, writes an .ex5
+# next to each source and fails sources containing "FAIL"
+STUB_EDITOR = f"""#!{sys.executable}
+import sys
+from pathlib import Path
+
+for arg in sys.argv[1:]:
+    if arg.startswith("/compile:"):
+        target = Path.cwd() / arg[len("/compile:"):]
+        for src in ([target] if target.suffix == ".mq5" else sorted(target.glob("*.mq5"))):
+            if "FAIL" in src.read_text():
+                print(f"{{src.name}}: error 1")
+            else:
+                src.with_suffix(".ex5").write_bytes(b"EX5")
+"""
+
+
+def _make_editor(tmp_path):
+    editor = tmp_path / "metaeditor64.exe"
+    editor.write_text(STUB_EDITOR)
+    editor.chmod(editor.stat().st_mode | stat.S_IEXEC)
+    return editor
+
+
+def _make_experts(tmp_path):
+    expert_dir = tmp_path / "MQL5" / "Experts" / "stage"
+    expert_dir.mkdir(parents=True)
+    for name in ("aroon", "macd", "vidya"):
+        (expert_dir / f"{name}.mq5").write_text(f"// {name}")
+    (expert_dir / "broken.mq5").write_text("FAIL")
+    return expert_dir
+
+
+def test_compile_batch_collects_per_file_results(tmp_path):
+    editor = _make_editor(tmp_path)
+    expert_dir = _make_experts(tmp_path)
+
+    report = compile_directory(expert_dir, max_workers=3, editor_path=editor, use_cache=False)
+
+    assert sorted(report.compiled) == ["aroon", "macd", "vidya"]
+    assert [r.name for r in report.failed] == ["broken"]
+    assert "broken.mq5: error 1" in report.failed[0].log
+    assert get_compiled_indicators(expert_dir, report) == report.compiled
+    assert "broken" in (expert_dir / "00_un_compiled.txt").read_text()
+
+
+def test_single_launch_matches_pool(tmp_path):
+    editor = _make_editor(tmp_path)
+    expert_dir = _make_experts(tmp_path)
+    mq5_paths = sorted(expert_dir.glob("*.mq5"))
+
+    report = compile_batch(mq5_paths, editor_path=editor, use_cache=False, single_launch=True)
+
+    assert [r.name for r in report.results] == [p.stem for p in mq5_paths]
+    assert sorted(report.compiled) == ["aroon", "macd", "vidya"]
+    assert [r.name for r in report.failed] == ["broken"]
+
+
+def test_streamed_sources_compile_while_later_ones_are_produced(tmp_path):
+    editor = _make_editor(tmp_path)
+    expert_dir = _make_experts(tmp_path)
+    first, *rest = sorted(expert_dir.glob("*.mq5"))
+
+    def stream():
+        yield first
+        # The first source is already queued on the MetaEditor pool
+        for _ in range(500):
+            if first.with_suffix(".ex5").exists():
+                break
+            time.sleep(0.01)
+        assert first.with_suffix(".ex5").exists()
+        yield from rest
+
+    report = compile_batch(stream(), max_workers=2, editor_path=editor, use_cache=False)
+
+    assert [r.name for r in report.results] == [first.stem] + [p.stem for p in rest]
+    assert sorted(report.compiled) == ["aroon", "macd", "vidya"]
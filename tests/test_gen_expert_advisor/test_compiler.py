@@ -0,0 +1,47 @@
+import shutil
+
+import pytest
+
+from strategy_factory.gen_expert_advisor.compiler import compile_ea
+from strategy_factory.testing.fake_mt5 import COMPILE_ERROR_MARKER
+from strategy_factory.utils import load_paths
+
+
+@pytest.fixture
+def experts(tmp_path):
+    """ A folder of the fake terminal's MQL5/Experts, removed afterwards, and the include folder. """
+    paths = load_paths()
+    expert_dir = paths["MT5_EXPERT_DIR"] / f"test_compiler_{tmp_path.name}"
+    expert_dir.mkdir(parents=True)
+    added = []
+    yield expert_dir, paths["MT5_INCLUDE_DIR"], added
+    shutil.rmtree(expert_dir)
+    for path in added:
+        path.unlink()
+
+
+def test_compile_cache_hits_memoises_failures_and_follows_includes(tmp_path, experts):
+    expert_dir, include_dir, added = experts
+    good, bad = expert_dir / "good.mq5", expert_dir / "bad.mq5"
+    # The sources are unique to this test, so the shared compile cache starts cold for them
+    good.write_text(f"// {tmp_path}")
+    bad.write_text(f"// {tmp_path} {COMPILE_ERROR_MARKER}")
+
+    first, failed = compile_ea(good), compile_ea(bad)
+    assert first.success and not first.from_cache
+    assert not failed.success and not failed.from_cache
+
+    hit, memoised = compile_ea(good), compile_ea(bad)
+    assert hit.success and hit.from_cache and good.with_suffix(".ex5").exists()
+    assert not memoised.success and memoised.from_cache and "fake compile error" in memoised.log
+
+    # A changed MyLibs file is part of the compile key: both sources compile again
+    added.append(include_dir / "MyLibs" / f"{tmp_path.name}.mqh")
+    added[-1].write_text("// helper")
+    assert not compile_ea(good).from_cache and not compile_ea(bad).from_cache
+
+    # Any other include only invalidates memoised failures
+    assert compile_ea(bad).from_cache
+    added.append(include_dir / f"{tmp_path.name}.mqh")
+    added[-1].write_text("// standard library update")
+    assert compile_ea(good).from_cache and not compile_ea(bad).from_cache
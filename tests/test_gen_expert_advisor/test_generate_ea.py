@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from jinja2 import Template
+
+from strategy_factory.stage_execution.stage_config import StageConfig
+from strategy_factory.gen_expert_advisor import generate_ea
+from strategy_factory.gen_expert_advisor.generate_ea import GenerateEA
+from strategy_factory.renderer_tools import build_sample_lines
+from strategy_factory.utils.sample_table import load_sample_table
+
+
+def test_written_sample_table_is_the_embedded_one(tmp_path, monkeypatch):
+    built = []
+
+    def random_table(project_config, stage_name, indi_data):
+        # Not reproducible: a second build would give a different table
+        built.append(pd.DataFrame({"InpPeriod": np.random.default_rng().integers(2, 200, 20)}))
+        return built[-1]
+
+    def render(project_config, stage_config, indi_name, indi_data, samples=None):
+        embedded.append(samples)
+        return "\n".join(build_sample_lines(samples))
+
+    embedded = []
+    monkeypatch.setattr(generate_ea, "stage_sample_table", random_table)
+    yaml_path = tmp_path / "rsi.yaml"
+    yaml_path.write_text("RSI:\n  indicator_inputs:\n    InpPeriod: {default: 14, type: int, min: 2, max: 200, step: 1}\n")
+    stage = StageConfig("Trigger", "trigger", str(tmp_path), Template(""), render)
+    generator = GenerateEA(SimpleNamespace(opt_settings={}), stage, tmp_path / "experts")
+
+    mq5_path = generator._generate_mq5(yaml_path)
+
+    assert len(built) == 1 and embedded == built
+    pd.testing.assert_series_equal(load_sample_table(tmp_path / "experts", "rsi")["InpPeriod"],
+                                   built[0]["InpPeriod"], check_names=False, check_index_type=False)
+    assert f"int sample_InpPeriod[] = {{{built[0]['InpPeriod'].iloc[0]}," in mq5_path.read_text()
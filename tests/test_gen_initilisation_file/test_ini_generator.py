@@ -1,4 +1,7 @@
-from strategy_factory.gen_initilisation_file.ini_generator import _build_tester_inputs, IniConfig
+from strategy_factory.gen_initilisation_file.ini_generator import _build_tester_inputs
+from strategy_factory.pipelines.trend_following.stages import STAGES
+from strategy_factory.stage_execution import get_stage_config
+from strategy_factory.utils.project_config import OptSettings, ProjectConfig
 
 
 def test_max_iterations_scaling_affects_step_size():
@@ -8,25 +11,25 @@ def test_max_iterations_scaling_affects_step_size():
             "min": 1,
             "max": 100,
             "step": 1,
-            "optimize": True
+            "optimise": True,
+            "type": "int"
         }
     }
 
-    config = IniConfig(
+    config = ProjectConfig(
         run_name="test",
         start_date="2023.01.01",
         end_date="2023.12.31",
         period="M5",
-        custom_criteria="0",
-        symbol_mode="0",
         data_split="none",
         risk=1.0,
         sl=10.0,
         tp=20.0,
-        max_iterations=10
+        opt_settings={"Trigger": OptSettings(opt_criterion=6, custom_criterion=0, min_trade=10, max_iterations=10)}
     )
 
-    tester_inputs = _build_tester_inputs(config, inputs, in_sample=True, optimized_parameters=None)
+    tester_inputs = _build_tester_inputs(config, inputs, in_sample=True, optimised_params=None,
+                                         stage_config=get_stage_config(STAGES, "Trigger"))
 
     assert "test_param" in tester_inputs, "Parameter was not included in tester_inputs"
 
@@ -0,0 +1,45 @@
+import numpy as np
+
+from strategy_factory.gen_initilisation_file.parameter_space import ParameterSpace
+
+MACD = {
+    "InpFastEMA": {"default": 12, "type": "int", "min": 1, "max": 200, "step": 1},
+    "InpSlowEMA": {"default": 26, "type": "int", "min": 1, "max": 300, "step": 1},
+    "InpSignalSMA": {"default": 9, "type": "int", "min": 1, "max": 300, "step": 1},
+    "InpAppliedPrice": {"default": "PRICE_CLOSE", "type": "int", "optimise": False},
+}
+
+
+def test_solved_grid_never_exceeds_the_budget():
+    space = ParameterSpace.from_inputs(MACD)
+    assert space.names == ("InpFastEMA", "InpSlowEMA", "InpSignalSMA")
+    assert space.pass_count() == 200 * 300 * 300
+
+    for budget in (7, 100, 1000, 12345):
+        solved = space.solve_steps(budget)
+        assert solved.pass_count() <= budget
+        assert solved.pass_count() > budget / 2
+
+    per_param = space.solve_steps(10, per_param=True)
+    assert per_param.counts().tolist() == [10, 10, 10]
+
+
+def test_tester_inputs_and_log_axes():
+    inputs = {
+        "period": {"default": 14, "type": "int", "min": 2, "max": 200, "step": 1, "scale": "log"},
+        "level": {"default": 0.5, "min": 0.0, "max": 1.0, "step": 0.25},
+    }
+    space = ParameterSpace.from_inputs(inputs)
+
+    linear = ParameterSpace.from_inputs({"level": inputs["level"]})
+    assert linear.tester_inputs() == {"level": "0.5||0.0||0.25||1.0||Y"}
+    assert space.values("level").tolist() == [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    period = space.solve_steps(5, per_param=True).values("period")
+    assert len(period) == 5
+    assert np.all(np.diff(np.log(period)) > 0.9)
+
+    # The grid holds every combination, with the log axis spread geometrically
+    grid = space.solve_steps(5, per_param=True).grid()
+    assert grid.shape == (25, 2)
+    assert sorted(set(grid[:, 0])) == period.tolist()
@@ -0,0 +1,61 @@
+import configparser
+
+import pandas as pd
+
+from strategy_factory.gen_initilisation_file.ini_generator import _build_tester_inputs
+from strategy_factory.gen_initilisation_file.zoom_ranges import zoom_param_ranges
+from strategy_factory.pipelines.trend_following.stages import STAGES
+from strategy_factory.stage_execution import get_stage_config
+from strategy_factory.utils.project_config import OptSettings, ProjectConfig
+
+
+def test_zoom_box_spans_top_passes_padded_by_one_step(tmp_path):
+    cfg = configparser.ConfigParser()
+    cfg.optionxform = str
+    cfg["TesterInputs"] = {
+        "inp_force_opt": "1||1||1||2||N",
+        "InpFast": "12||1||50||300||Y",
+        "InpSlow": "26||1||50||300||Y",
+        "InpPrice": "3||0||0||1||N",
+    }
+    ini_path = tmp_path / "macd_IS.ini"
+    with open(ini_path, "w", encoding="utf-16") as f:
+        cfg.write(f)
+
+    csv_path = tmp_path / "macd_IS.csv"
+    pd.DataFrame({
+        "Pass": [0, 1, 2, 3],
+        "Result": [1.0, 9.0, 8.0, 2.0],
+        "InpFast": [251, 101, 151, 1],
+        "InpSlow": [1, 1, 51, 301],
+    }).to_csv(csv_path, index=False)
+
+    ranges = zoom_param_ranges(ini_path, csv_path, top_n=2)
+
+    assert ranges == {"InpFast": {"min": 51.0, "max": 201.0}, "InpSlow": {"min": 1.0, "max": 101.0},
+                      "InpPrice": {"min": 3.0, "max": 3.0}}
+
+
+def test_collapsed_axis_stays_pinned_in_the_next_round(tmp_path):
+    inputs = {
+        "InpFast": {"default": 12, "type": "int", "min": 1, "max": 300, "step": 1},
+        "InpPrice": {"default": 0, "type": "int", "min": 0, "max": 6, "step": 1},
+    }
+    config = ProjectConfig(opt_settings={"Trigger": OptSettings(opt_criterion=6, custom_criterion=0, min_trade=10,
+                                                                max_iterations=40)})
+    stage = get_stage_config(STAGES, "Trigger")
+    cfg = configparser.ConfigParser()
+    cfg.optionxform = str
+    cfg["TesterInputs"] = {"InpFast": "12||1||50||300||Y", "InpPrice": "3||0||0||1||N"}
+    ini_path = tmp_path / "rsi_IS.ini"
+    with open(ini_path, "w", encoding="utf-16") as f:
+        cfg.write(f)
+    csv_path = tmp_path / "rsi_IS.csv"
+    pd.DataFrame({"Pass": [0], "Result": [1.0], "InpFast": [101], "InpPrice": [3]}).to_csv(csv_path, index=False)
+
+    ranges = zoom_param_ranges(ini_path, csv_path)
+    tester_inputs = _build_tester_inputs(config, inputs, in_sample=True, optimised_params=None, stage_config=stage,
+                                         param_ranges=ranges)
+
+    assert tester_inputs["InpPrice"].split("||")[::4] == ["3", "N"]
+    assert tester_inputs["InpFast"].endswith("||Y")
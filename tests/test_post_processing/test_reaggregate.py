@@ -0,0 +1,39 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from strategy_factory.post_processing.reaggregate import reaggregate_stage
+from strategy_factory.post_processing.result_summary import SUMMARY_FILE
+
+
+def _reports(results_dir, results: dict):
+    for name, result in results.items():
+        for phase, value in (("IS", result), ("OOS", result - 1)):
+            pd.DataFrame({"Pass": [0, 1], "Result": [value - 2, value], "Profit Factor": [1.2, 1.5],
+                          "Trades": [80, 100], "InpPeriod": [10, 14]}).to_csv(results_dir / f"{name}_{phase}.csv",
+                                                                                index=False)
+
+
+def test_reports_are_parsed_and_summarised_in_worker_processes(tmp_path):
+    serial_dir, parallel_dir = (tmp_path / run / "Trigger" / "results" for run in ("serial", "parallel"))
+    results = {"macd": 9.0, "rsi": 7.0, "adx": 5.0, "cci": 11.0}
+    for results_dir in (serial_dir, parallel_dir):
+        results_dir.mkdir(parents=True)
+        _reports(results_dir, results)
+    (parallel_dir / "ema_IS.csv").write_text("")  # Unreadable in a worker: skipped, not fatal
+
+    expected = reaggregate_stage(serial_dir)
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        combined = reaggregate_stage(parallel_dir, executor)
+        summary = (parallel_dir / SUMMARY_FILE).read_text()
+
+        # Only the rewritten report is parsed and summarised again
+        _reports(parallel_dir, {"rsi": 13.0})
+        updated = reaggregate_stage(parallel_dir, executor)
+
+    pd.testing.assert_frame_equal(combined, expected)
+    assert summary == (serial_dir / SUMMARY_FILE).read_text()
+    assert (parallel_dir / "1_top_parameter_sets.csv").exists()
+    assert updated["Indicator"].tolist() == ["rsi", "cci", "macd", "adx"]
+    assert updated.loc[0, "Res_IS"] == 13.0
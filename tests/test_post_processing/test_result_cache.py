@@ -0,0 +1,64 @@
+import configparser
+import os
+
+from strategy_factory.post_processing.result_cache import (
+    compute_result_key, restore_cached_report, store_cached_report)
+from strategy_factory.utils import load_paths
+
+
+def _write_ini(path, report: str, period: str = "5||2||2||20||Y"):
+    ini = configparser.ConfigParser()
+    ini.optionxform = str
+    ini["Tester"] = {"Expert": f"stage\\{report}.ex5", "Report": report, "Model": "2"}
+    ini["TesterInputs"] = {"InpPeriod": period}
+    with open(path, "w", encoding="utf-16") as f:
+        ini.write(f)
+    return path
+
+
+def test_result_key_covers_everything_that_changes_the_report(tmp_path):
+    mq5 = tmp_path / "macd.mq5"
+    mq5.write_text("// macd")
+    terminal = tmp_path / "terminal64.exe"
+    terminal.write_text("build 4000")
+
+    def key(ini, whitelist=("EURUSD",)):
+        return compute_result_key(ini, mq5, list(whitelist), terminal_exe=terminal)
+
+    base = key(_write_ini(tmp_path / "macd_IS.ini", "macd_IS"))
+    # File names are run-specific and do not change the outcome
+    assert key(_write_ini(tmp_path / "copy.ini", "other_report")) == base
+
+    changed = [key(_write_ini(tmp_path / "period.ini", "macd_IS", "5||2||4||20||Y")),
+               key(tmp_path / "macd_IS.ini", whitelist=("GBPUSD",))]
+    mq5.write_text("// macd v2")
+    changed.append(key(tmp_path / "macd_IS.ini"))
+
+    library = load_paths()["MT5_INCLUDE_DIR"] / "MyLibs" / "result_key_test.mqh"
+    library.write_text("// helper")
+    try:
+        changed.append(key(tmp_path / "macd_IS.ini"))
+    finally:
+        library.unlink()
+
+    terminal.write_text("build 4100")
+    os.utime(terminal, ns=(0, 0))
+    changed.append(key(tmp_path / "macd_IS.ini"))
+    assert len({base, *changed}) == 1 + len(changed)
+
+
+def test_reports_are_stored_and_restored_by_key(tmp_path):
+    cache_dir = tmp_path / "cache"
+    report = tmp_path / "run" / "macd_IS.csv"
+    report.parent.mkdir()
+    report.write_text("Pass,Result\n0,9.0\n")
+
+    assert not restore_cached_report("ab12", tmp_path / "restored.csv", cache_dir)
+    store_cached_report("ab12", report, cache_dir, run_name="run")
+    assert (cache_dir / "ab" / "ab12.json").exists()
+
+    restored = tmp_path / "other" / "results" / "macd_IS.csv"
+    assert restore_cached_report("ab12", restored, cache_dir)
+    assert restored.read_text() == report.read_text()
+    assert not restore_cached_report("cd34", restored, cache_dir)
+    assert not list(restored.parent.glob("*.tmp"))
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from strategy_factory.post_processing import result_summary
+from strategy_factory.post_processing.result_summary import collect_results
+from strategy_factory.post_processing import results_store
+from strategy_factory.post_processing.results_store import ResultsStore
+
+
+def _report(path, results, periods, trades=100):
+    pd.DataFrame({
+        "Pass": range(len(results)),
+        "Result": results,
+        "Profit Factor": [1.5] * len(results),
+        "Trades": [trades] * len(results),
+        "InpPeriod": periods,
+    }).to_csv(path, index=False)
+
+
+def test_store_follows_report_csvs(tmp_path):
+    results_dir = tmp_path / "run" / "Trigger" / "results"
+    results_dir.mkdir(parents=True)
+    _report(results_dir / "macd_IS.csv", [5.0, 9.0, "-nan(ind)"], [12, 26, 40])
+    _report(results_dir / "macd_OOS.csv", [4.0], [26])
+    _report(results_dir / "rsi_IS.csv", [7.0, 11.0], [14, 21])
+
+    store = ResultsStore(results_dir)
+    assert store.path == tmp_path / "run" / "results.sqlite"
+
+    best = store.best("macd", "IS", n=2)
+    assert best.columns.tolist() == ["Pass", "Result", "Profit Factor", "Trades", "InpPeriod"]
+    assert best["InpPeriod"].tolist() == [26, 12]
+    assert store.top("IS", n=2)[["Indicator", "Result"]].values.tolist() == [["rsi", 11.0], ["macd", 9.0]]
+
+    combined, failed = collect_results(results_dir)
+    assert combined["Indicator"].tolist() == ["macd"] and failed == ["rsi"]
+    assert combined.loc[0, "Res_IS"] == 9.0 and combined.loc[0, "Res_OOS"] == 4.0
+
+    # A rewritten report is reloaded, a removed one is dropped
+    _report(results_dir / "rsi_IS.csv", [3.0], [50])
+    os.utime(results_dir / "rsi_IS.csv", ns=(0, 0))
+    (results_dir / "macd_OOS.csv").unlink()
+    assert store.best_per_indicator("IS")[["Indicator", "Result"]].values.tolist() == [["macd", 9.0], ["rsi", 3.0]]
+    assert store.indicators("OOS") == []
+
+    # Instances share the file's connection, which the last one to close evicts
+    with ResultsStore(results_dir) as other:
+        assert other.indicators("IS") == ["macd", "rsi"]
+    assert store.path in results_store._connections
+    store.close()
+    assert store.path not in results_store._connections
+
+
+def test_combined_results_only_resummarise_changed_reports(tmp_path, monkeypatch):
+    results_dir = tmp_path / "run" / "Trigger" / "results"
+    results_dir.mkdir(parents=True)
+    for name, result in (("macd", 9.0), ("rsi", 7.0)):
+        _report(results_dir / f"{name}_IS.csv", [result], [14])
+        _report(results_dir / f"{name}_OOS.csv", [result - 1], [14])
+
+    combined, failed = collect_results(results_dir)
+    assert combined["Indicator"].tolist() == ["macd", "rsi"] and failed == []
+
+    built = []
+    original = result_summary.build_combined_row
+    monkeypatch.setattr(result_summary, "build_combined_row",
+                        lambda name, *dfs: built.append(name) or original(name, *dfs))
+
+    # A new indicator is merged into the existing summary without rebuilding the others
+    _report(results_dir / "adx_IS.csv", [20.0], [10])
+    _report(results_dir / "adx_OOS.csv", [18.0], [10])
+    combined, _ = collect_results(results_dir, ["adx"])
+    assert built == ["adx"]
+    assert combined["Indicator"].tolist() == ["adx", "macd", "rsi"]
+
+    # A touched but unchanged report is not summarised again, a rewritten one is
+    os.utime(results_dir / "macd_IS.csv", ns=(0, 0))
+    _report(results_dir / "rsi_OOS.csv", [1.0], [14])
+    combined, _ = collect_results(results_dir)
+    assert built == ["adx", "rsi"]
+    assert combined.set_index("Indicator").loc["rsi", "Res_OOS"] == 1.0
+
+
+def test_safe_floats_zeroes_invalid_values():
+    values = ["1.5", " 2 ", "", "nan", "inf", "-inf", "-nan(ind)", "abc", None, 3, 4.25, float("nan")]
+    assert result_summary.safe_floats(values).tolist() == [1.5, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 3.0, 4.25, 0.0]
+
+
+def test_sync_parses_reports_in_executor(tmp_path):
+    results_dir = tmp_path / "run" / "Trigger" / "results"
+    results_dir.mkdir(parents=True)
+    for i in range(4):
+        _report(results_dir / f"indi{i}_IS.csv", [float(i), 2.0 * i], [10, 20])
+    (results_dir / "bad_IS.csv").write_text("")
+
+    store = ResultsStore(results_dir)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        store.sync(executor=executor)
+    assert store.best_per_indicator("IS")["Result"].tolist() == [0.0, 2.0, 4.0, 6.0]
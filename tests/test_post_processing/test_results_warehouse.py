@@ -0,0 +1,51 @@
+import shutil
+
+import pandas as pd
+
+from strategy_factory.post_processing.result_summary import update_combined_results
+from strategy_factory.post_processing.results_warehouse import ResultsWarehouse
+
+
+def _project(output_dir, run_name, symbol, results):
+    """ Write a project with a config.yaml and a Trigger stage with one IS/OOS report pair per indicator. """
+    run_dir = output_dir / run_name
+    results_dir = run_dir / "Trigger" / "results"
+    results_dir.mkdir(parents=True)
+    (run_dir / "config.yaml").write_text(f"run_name: {run_name}\nmain_chart_symbol: {symbol}\nperiod: D1\n")
+    for indicator, (res_is, res_oos) in results.items():
+        for phase, result in (("IS", res_is), ("OOS", res_oos)):
+            pd.DataFrame({"Pass": [0, 1], "Result": [result, result / 2], "Profit Factor": [result / 10, 1.0],
+                          "Trades": [120, 80], "InpPeriod": [14, 21]}).to_csv(
+                results_dir / f"{indicator}_{phase}.csv", index=False)
+    update_combined_results(results_dir)
+    return results_dir
+
+
+def test_warehouse_ingests_and_follows_projects(tmp_path):
+    _project(tmp_path, "Athena", "EURUSD", {"macd": (12.0, 10.0), "rsi": (8.0, 6.0)})
+    _project(tmp_path, "Zeus", "EURUSD", {"macd": (16.0, 14.0)})
+    _project(tmp_path, "Odin", "GBPUSD", {"rsi": (30.0, 30.0)})
+
+    warehouse = ResultsWarehouse(output_dir=tmp_path)
+    warehouse.refresh()
+
+    best = warehouse.best_indicators("Trigger", "PF_OOS", symbol="EURUSD", period="D1", since="2000-01-01")
+    assert best["indicator"].tolist() == ["macd", "rsi"]
+    assert best["projects"].tolist() == [2, 1]
+    assert best["mean"].tolist() == [1.2, 0.6]
+
+    passes = warehouse.passes("Athena", "Trigger", "macd", "IS", n=1)
+    assert passes[["Result", "InpPeriod"]].values.tolist() == [[12.0, 14]]
+
+    # Removed projects are dropped, re-run stages are reloaded
+    shutil.rmtree(tmp_path / "Zeus")
+    _project(tmp_path / "rerun", "Athena", "EURUSD", {"macd": (2.0, 1.0)})
+    shutil.rmtree(tmp_path / "Athena")
+    shutil.move(tmp_path / "rerun" / "Athena", tmp_path / "Athena")
+    shutil.rmtree(tmp_path / "rerun")
+    warehouse.refresh()
+
+    assert warehouse.combined_results("Trigger", symbol="EURUSD")["Res_OOS"].tolist() == [1.0]
+    assert warehouse.query("SELECT DISTINCT run_name FROM passes ORDER BY run_name")["run_name"].tolist() == \
+        ["Athena", "Odin"]
+    warehouse.close()
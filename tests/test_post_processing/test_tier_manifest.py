@@ -0,0 +1,40 @@
+import pandas as pd
+
+from strategy_factory.post_processing.result_summary import update_combined_results
+from strategy_factory.post_processing.tier_manifest import (
+    FINAL_TIER, load_tier_manifest, promote_finalists, write_tier_manifest)
+
+
+def _reports(results_dir, results: dict):
+    for name, result in results.items():
+        for phase, value in (("IS", result), ("OOS", result - 1)):
+            pd.DataFrame({"Pass": [0], "Result": [value], "Profit Factor": [1.5], "Trades": [100],
+                          "InpPeriod": [14]}).to_csv(results_dir / f"{name}_{phase}.csv", index=False)
+
+
+def test_finalists_are_promoted_and_tagged_in_combined_results(tmp_path):
+    results_dir = tmp_path / "run" / "Trigger" / "results"
+    results_dir.mkdir(parents=True)
+    _reports(results_dir, {"macd": 9.0, "rsi": 7.0, "adx": 5.0})
+    combined = update_combined_results(results_dir)
+
+    assert promote_finalists(results_dir, combined, screen_model=2, final_model=1, top_k=2) == ["macd", "rsi"]
+    assert sorted(p.name for p in (results_dir / "screen").iterdir()) == [
+        "macd_IS.csv", "macd_OOS.csv", "rsi_IS.csv", "rsi_OOS.csv"]
+
+    # Resumed with the same config and screening result: the manifest's finalists are kept
+    manifest = load_tier_manifest(results_dir)
+    write_tier_manifest(results_dir, {**manifest, "finalists": ["rsi", "macd"]})
+    assert promote_finalists(results_dir, combined, screen_model=2, final_model=1, top_k=2) == ["rsi", "macd"]
+
+    # A changed top_k or set of screened indicators selects the finalists again
+    assert promote_finalists(results_dir, combined, screen_model=2, final_model=1, top_k=1) == ["macd"]
+    _reports(results_dir, {"cci": 11.0})
+    combined = update_combined_results(results_dir)
+    assert promote_finalists(results_dir, combined, screen_model=2, final_model=1, top_k=1) == ["cci"]
+    assert load_tier_manifest(results_dir)["screened"] == ["adx", "cci", "macd", "rsi"]
+
+    manifest = load_tier_manifest(results_dir)
+    write_tier_manifest(results_dir, {**manifest, "tiers": {"cci": FINAL_TIER}})
+    tiers = update_combined_results(results_dir).set_index("Indicator")["Tier"]
+    assert tiers.to_dict() == {"cci": "final", "macd": "screen", "rsi": "screen", "adx": "screen"}
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from strategy_factory.post_processing.xml_to_csv import read_xml_report, write_forward_xml_to_csv, write_xml_to_csv
+from strategy_factory.testing.fake_mt5 import FORWARD_COLUMNS, write_report
+
+REPORT = """<?xml version="1.0"?>
+<Workbook xmlns="urn:schemas-microsoft-com:office:spreadsheet" xmlns:ss="urn:schemas-microsoft-com:office:spreadsheet">
+<Worksheet ss:Name="Tester Optimizator Results"><Table>
+<Row><Cell><Data ss:Type="String">Pass</Data></Cell><Cell><Data ss:Type="String">Result</Data></Cell>
+<Cell><Data ss:Type="String">Comment</Data></Cell><Cell><Data ss:Type="String">InpPeriod</Data></Cell></Row>
+<Row><Cell><Data ss:Type="Number">7</Data></Cell><Cell><Data ss:Type="Number">12.50</Data></Cell>
+<Cell><Data ss:Type="String">007</Data></Cell><Cell><Data ss:Type="Number">21</Data></Cell></Row>
+<Row><Cell><Data ss:Type="Number">3</Data></Cell><Cell><Data ss:Type="Number">-1.5E+01</Data></Cell>
+<Cell ss:Index="4"><Data ss:Type="Number">14</Data></Cell></Row>
+</Table></Worksheet>
+<Worksheet ss:Name="Other"><Table><Row><Cell><Data ss:Type="String">ignored</Data></Cell></Row></Table></Worksheet>
+</Workbook>
+"""
+
+
+def test_first_table_is_streamed_with_typed_cells(tmp_path):
+    xml_path = tmp_path / "macd_IS.xml"
+    xml_path.write_text(REPORT)
+
+    report = read_xml_report(xml_path)
+    assert report.columns.tolist() == ["Pass", "Result", "Comment", "InpPeriod"]
+    assert report["Pass"].tolist() == [7, 3] and report["Pass"].dtype.kind == "i"
+    assert report["Result"].tolist() == [12.5, -15.0]
+    assert report["Comment"].tolist() == ["007", ""]
+    assert report["InpPeriod"].tolist() == [21, 14]
+
+    csv_path = tmp_path / "out" / "macd_IS.csv"
+    write_xml_to_csv(xml_path, csv_path)
+    df = pd.read_csv(csv_path, dtype={"Comment": str})
+    assert df["Pass"].tolist() == [7, 3]
+    assert df["Comment"].tolist()[0] == "007"
+    assert df["InpPeriod"].tolist() == [21, 14]
+
+
+def test_streamed_csv_has_numeric_columns(tmp_path):
+    xml_path = tmp_path / "macd_IS.xml"
+    xml_path.write_text(REPORT.replace(">12.50<", ">1\u00a0234,50<").replace(">-1.5E+01<", ">-nan(ind)<"),
+                        encoding="utf-8")
+
+    csv_path = tmp_path / "macd_IS.csv"
+    write_xml_to_csv(xml_path, csv_path)
+    assert csv_path.read_text().splitlines()[1:] == ["7,1234.5,007,21", "3,,,14"]
+
+    df = pd.read_csv(csv_path)
+    assert df["Pass"].dtype.kind == "i" and df["InpPeriod"].dtype.kind == "i"
+    assert df["Result"].dtype.kind == "f" and df["Result"].iloc[0] == 1234.5 and pd.isna(df["Result"].iloc[1])
+    pd.testing.assert_frame_equal(df.drop(columns="Comment"), read_xml_report(xml_path).drop(columns="Comment"))
+
+
+def test_forward_report_uses_best_is_pass(tmp_path):
+    # IS report in pass order, not sorted by Result: the best pass is 2
+    is_csv = tmp_path / "macd_IS.csv"
+    is_report = pd.DataFrame({"Pass": [0, 1, 2], "Result": [5.0, 1.0, 9.0], "InpPeriod": [10, 20, 30]})
+    is_report.to_csv(is_csv, index=False)
+    metrics = [0.0] * (len(FORWARD_COLUMNS) - 3)
+    forward_xml = write_report(tmp_path / "macd_IS.forward.xml", FORWARD_COLUMNS + ["InpPeriod"],
+                               [[0, 50.0, 5.0, *metrics, 10], [1, 60.0, 1.0, *metrics, 20], [2, 70.0, 9.0, *metrics, 30]])
+
+    oos_csv = tmp_path / "macd_OOS.csv"
+    assert write_forward_xml_to_csv(forward_xml, is_csv, oos_csv)
+    oos = pd.read_csv(oos_csv)
+    assert oos["Pass"].tolist() == [2] and oos["Result"].tolist() == [70.0] and oos["InpPeriod"].tolist() == [30]
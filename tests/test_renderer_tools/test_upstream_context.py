@@ -0,0 +1,40 @@
+import importlib
+import os
+from types import SimpleNamespace
+
+import yaml
+
+from strategy_factory.renderer_tools.upstream_context import UpstreamContext
+from strategy_factory.utils.indicator_catalog import IndicatorCatalog
+
+# The package re-exports the function under the module's name
+results_module = importlib.import_module("strategy_factory.renderer_tools.load_results_data")
+
+
+def test_upstream_stage_loaded_once_until_results_yaml_changes(tmp_path, monkeypatch):
+    indi_dir = tmp_path / "indicators" / "trend_following" / "trigger_conf_exit"
+    indi_dir.mkdir(parents=True)
+    (indi_dir / "rsi.yaml").write_text(yaml.safe_dump({"rsi": {"inputs": {"InpPeriod": {"default": 14}}}}))
+    results = tmp_path / "outputs" / "demo" / "Trigger" / "the_trigger.yaml"
+    results.parent.mkdir(parents=True)
+    results.write_text(yaml.safe_dump({"rsi": {"InpPeriod": 21}}))
+
+    paths = {"OUTPUT_DIR": tmp_path / "outputs", "INDICATOR_DIR": tmp_path / "indicators"}
+    monkeypatch.setattr(results_module, "load_paths", lambda: paths)
+    monkeypatch.setattr(results_module, "get_indicator_catalog", lambda: IndicatorCatalog())
+    loads = []
+    load = results_module.load_results_data
+    monkeypatch.setattr("strategy_factory.renderer_tools.upstream_context.load_results_data",
+                        lambda run, stage: loads.append(stage.name) or load(run, stage))
+
+    upstream = UpstreamContext(SimpleNamespace(pipeline="trend_following", run_name="demo"))
+    for _ in range(4):
+        name, data = upstream.results("Trigger")
+        assert (name, data["inputs"]["InpPeriod"]["default"]) == ("rsi", 21)
+        data["inputs"].clear()  # Served data are copies
+    assert loads == ["Trigger"]
+
+    results.write_text(yaml.safe_dump({"rsi": {"InpPeriod": 30}}))
+    os.utime(results, ns=(0, 0))
+    assert upstream.results("Trigger")[1]["inputs"]["InpPeriod"]["default"] == 30
+    assert loads == ["Trigger", "Trigger"]
@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import threading
+from concurrent.futures import CancelledError
+from subprocess import CalledProcessError
+
+import psutil
+import pytest
+
+from strategy_factory.stage_execution.ea_runner import (
+    EATimeoutError, kill_process_tree, run_ea, run_ea_async, wait_all)
+
+
+@pytest.fixture
+def sleeper(tmp_path):
+    """ A stand-in terminal that ignores its arguments and hangs, with a child process like a tester agent. """
+    exe = tmp_path / "terminal64"
+    exe.write_text(f"#!{sys.executable}\n"
+                   f"import subprocess, sys, time\n"
+                   f"subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+                   f"time.sleep(60)\n")
+    exe.chmod(0o755)
+    return exe
+
+
+def _tree(pid: int) -> list[psutil.Process]:
+    parent = psutil.Process(pid)
+    return [parent] + parent.children(recursive=True)
+
+
+def _alive(proc: psutil.Process) -> bool:
+    try:
+        return proc.status() != psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return False
+
+
+def test_run_ea_is_cancelled_from_another_thread(tmp_path, sleeper):
+    killed = []
+
+    def cancel(handle):
+        killed.extend(_tree(handle.pid))
+        handle.cancel_from_thread()
+
+    with pytest.raises(CancelledError):
+        run_ea(tmp_path / "macd_IS.ini", terminal_exe=sleeper,
+               on_start=lambda handle: threading.Timer(1.0, cancel, (handle,)).start())
+
+    assert len(killed) == 2 and not any(_alive(proc) for proc in killed)
+
+
+def test_timeout_cancel_and_kill_take_down_the_process_tree(tmp_path, sleeper):
+    async def scenario():
+        timed_out, cancelled, abandoned, failed = [
+            await run_ea_async(tmp_path / f"{name}.ini", terminal_exe=sleeper, timeout=timeout)
+            for name, timeout in (("timed_out", 1.0), ("cancelled", None), ("abandoned", None), ("failed", None))]
+        await asyncio.sleep(0.5)  # Let the stand-ins start their child processes
+        trees = [_tree(handle.pid) for handle in (timed_out, cancelled, abandoned, failed)]
+
+        waiting = asyncio.ensure_future(wait_all([timed_out, cancelled, failed]))
+        await cancelled.cancel()
+        await asyncio.to_thread(kill_process_tree, failed.pid)
+
+        # Cancelling the task awaiting a run kills the run's process tree
+        abandoning = asyncio.ensure_future(abandoned.wait())
+        await asyncio.sleep(0)
+        abandoning.cancel()
+        return await waiting + await asyncio.gather(abandoning, return_exceptions=True), trees
+
+    (timeout_error, cancel_error, exit_error, abandon_error), trees = asyncio.run(scenario())
+
+    assert isinstance(timeout_error, EATimeoutError) and isinstance(exit_error, CalledProcessError)
+    assert isinstance(cancel_error, asyncio.CancelledError) and isinstance(abandon_error, asyncio.CancelledError)
+    assert all(len(tree) == 2 for tree in trees)
+    assert not any(_alive(proc) for tree in trees for proc in tree)
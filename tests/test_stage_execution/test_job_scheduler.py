@@ -0,0 +1,51 @@
+import threading
+import time
+
+from strategy_factory.stage_execution.job_scheduler import JobScheduler, DONE, SKIPPED
+from strategy_factory.stage_execution.terminal_pool import TerminalInstance, TerminalPool
+
+
+def _pool(tmp_path, size):
+    return TerminalPool([TerminalInstance(f"T{i}", tmp_path / f"t{i}", tmp_path / f"t{i}" / "terminal64.exe")
+                         for i in range(size)])
+
+
+def test_oos_jobs_interleave_with_other_indicators(tmp_path):
+    started = []
+    lock = threading.Lock()
+
+    def run_is(indi, terminal):
+        with lock:
+            started.append(f"{indi}:IS")
+        time.sleep(0.05)
+        return f"{indi}-params"
+
+    def run_oos(indi, is_result, terminal):
+        with lock:
+            started.append(f"{indi}:OOS")
+        assert is_result == f"{indi}-params"
+        time.sleep(0.05)
+
+    with _pool(tmp_path, 2) as pool:
+        scheduler = JobScheduler(pool)
+        for indi in ("a", "b", "c", "d"):
+            scheduler.add(f"{indi}:IS", run_is, indi, group=indi)
+            scheduler.add(f"{indi}:OOS", run_oos, indi, group=indi, depends_on=(f"{indi}:IS",), priority=1)
+        futures = scheduler.start()
+        results = {indi: future.result(timeout=5) for indi, future in futures.items()}
+
+    assert results["a"] == {"a:IS": "a-params", "a:OOS": None}
+    # With two terminals, a/b's OOS jobs run before c/d's IS jobs instead of queueing behind them
+    assert started.index("a:OOS") < started.index("c:IS")
+    assert started.index("b:OOS") < started.index("d:IS")
+
+
+def test_dependents_of_empty_result_are_skipped(tmp_path):
+    with _pool(tmp_path, 1) as pool:
+        scheduler = JobScheduler(pool)
+        scheduler.add("x:IS", lambda terminal: None, group="x")
+        scheduler.add("x:OOS", lambda result, terminal: result, group="x", depends_on=("x:IS",))
+        jobs = scheduler.run()
+
+    assert jobs["x:IS"].state == DONE
+    assert jobs["x:OOS"].state == SKIPPED
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from strategy_factory.stage_execution.resource_monitor import ResourceSampler
+from strategy_factory.stage_execution.run_journal import RunJournal
+
+# Parent process that starts one child ("agent") and burns CPU for a moment
+_TREE = ("import subprocess, sys, time\n"
+         "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(2)'])\n"
+         "end = time.time() + 0.6\nwhile time.time() < end: pass\nchild.kill()")
+
+
+def test_sampler_records_process_tree_and_journal_stores_samples(tmp_path):
+    process = subprocess.Popen([sys.executable, "-c", _TREE])
+    with ResourceSampler(process.pid, interval=0.05) as sampler:
+        process.wait()
+
+    summary = sampler.summary()
+    assert summary["samples"] >= 3
+    assert summary["agents_max"] == 1
+    assert summary["cpu_cores_max"] > 0 and summary["rss_mb_max"] > 0
+
+    journal = RunJournal(tmp_path)
+    journal.record_resources("Trigger", "macd", "IS", summary, sampler.records(), terminal="T0")
+    stored, = journal.resources("Trigger")
+    assert stored["terminal"] == "T0" and stored["agents_max"] == 1
+    assert len(stored["samples"]) == len(sampler.samples) and {"cpu_percent", "rss_mb"} <= set(stored["samples"][0])
@@ -0,0 +1,21 @@
+from strategy_factory.stage_execution.run_journal import RunJournal
+
+
+def test_journal_resumes_from_last_committed_step(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.record("Trigger", "aroon", "IS", "ini_written", "key-1")
+    journal.record("Trigger", "aroon", "IS", "terminal_started", data={"terminal": "T0"})
+    journal.record("Trigger", "aroon", "IS", "report_copied")
+    journal.close()
+
+    reopened = RunJournal(tmp_path)
+    entry = reopened.get("Trigger", "aroon", "IS", "key-1")
+    assert entry.step == "report_copied"
+    assert entry.data == {"terminal": "T0"}
+    assert reopened.has_step("Trigger", "aroon", "IS", "terminal_started", "key-1")
+    assert not reopened.has_step("Trigger", "aroon", "IS", "converted", "key-1")
+
+    # A different fingerprint (changed EA or .ini) does not match, and restarts the phase with fresh data
+    assert reopened.get("Trigger", "aroon", "IS", "key-2") is None
+    reopened.record("Trigger", "aroon", "IS", "ini_written", "key-2")
+    assert reopened.get("Trigger", "aroon", "IS").data is None
@@ -0,0 +1,96 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# stage_execution first: importing generate_ea on its own runs into the package's circular import
+from strategy_factory.stage_execution import StageRunner, get_stage_config, stage_runner
+from strategy_factory.stage_execution.ea_runner import EATimeoutError
+from strategy_factory.stage_execution.run_journal import RunJournal
+from strategy_factory.pipelines.trend_following.stages import STAGES
+from strategy_factory.utils import load_config_from_yaml
+
+PIPELINE_CONFIG = Path(__file__).parents[2] / "strategy_factory" / "pipelines" / "trend_following" / "config.yaml"
+
+
+def _project_config(tmp_path, run_name: str, **settings):
+    data = yaml.safe_load(PIPELINE_CONFIG.read_text(encoding="utf-8"))
+    data.update(run_name=run_name, whitelist_file="CHART_SYMBOL_ONLY", resource_sample_seconds=0, **settings)
+    config_path = tmp_path / f"{run_name}.yaml"
+    config_path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    return load_config_from_yaml(config_path)
+
+
+def _run_stage(project_config) -> StageRunner:
+    runner = StageRunner(project_config=project_config, stage_config=get_stage_config(STAGES, "Trigger"),
+                         auto_run=False)
+    runner.wait(runner.start())
+    return runner
+
+
+def test_rerun_without_result_cache_keeps_reports_the_journal_does_not_know(tmp_path, monkeypatch):
+    project_config = _project_config(tmp_path, "resume_without_cache", use_result_cache=False)
+    runner = _run_stage(project_config)
+    reports = sorted(runner.results_dir.glob("*_OOS.csv"))
+    assert reports
+
+    # A run from before the journal: the reports are reused without launching the terminal
+    runner.journal.path.unlink()
+    monkeypatch.setattr(stage_runner, "run_ea", lambda *args, **kwargs: pytest.fail("terminal launched"))
+    assert sorted(_run_stage(project_config).results_dir.glob("*_OOS.csv")) == reports
+
+
+def test_restarted_halving_stage_reuses_archived_rounds(tmp_path, monkeypatch):
+    data = yaml.safe_load(PIPELINE_CONFIG.read_text(encoding="utf-8"))
+    trigger = {**data["opt_settings"]["Trigger"], "halving": True, "halving_min_iterations": 10, "max_iterations": 40}
+    project_config = _project_config(tmp_path, "halving_restart", use_result_cache=False,
+                                     opt_settings={**data["opt_settings"], "Trigger": trigger})
+    runner = _run_stage(project_config)
+    rounds = sorted(runner.results_dir.glob("1_combined_results_round_*.csv"))
+    archived = sorted(runner.results_dir.glob("rounds/round*/*_IS.csv"))
+    assert len(rounds) > 1 and archived
+
+    # Every round is committed in the journal: the restart re-ranks them from the archive without a terminal launch
+    monkeypatch.setattr(stage_runner, "run_ea", lambda *args, **kwargs: pytest.fail("terminal launched"))
+    tables = [path.read_text() for path in rounds + archived]
+    _run_stage(project_config)
+    assert [path.read_text() for path in rounds + archived] == tables
+
+
+def test_shutdown_closes_the_journal_and_a_restart_reopens_it(tmp_path, monkeypatch):
+    runner = _run_stage(_project_config(tmp_path, "shutdown_closes_journal"))
+    with pytest.raises(sqlite3.ProgrammingError):
+        runner.journal.entries()
+
+    monkeypatch.setattr(stage_runner, "run_ea", lambda *args, **kwargs: pytest.fail("terminal launched"))
+    runner.wait(runner.start())
+    with pytest.raises(sqlite3.ProgrammingError):
+        runner.journal.entries()
+    journal = RunJournal(runner.journal.path.parent)
+    assert journal.entries("Trigger")
+    journal.close()
+
+
+def test_resource_samples_of_a_timed_out_run_are_journaled(tmp_path, monkeypatch):
+    hanging = tmp_path / "terminal64"
+    hanging.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n")
+    hanging.chmod(0o755)
+    run_ea = stage_runner.run_ea
+    monkeypatch.setattr(stage_runner, "run_ea", lambda ini_path, **kwargs: run_ea(
+        ini_path, **{**kwargs, "terminal_exe": hanging, "timeout": 1.0, "sample_interval": 0.2}))
+
+    runner = StageRunner(project_config=_project_config(tmp_path, "timed_out_resources", use_result_cache=False),
+                         stage_config=get_stage_config(STAGES, "Trigger"), auto_run=False)
+    runner.prepare()
+    indicator = sorted(runner.ea_output_dir.glob("*.ex5"))[0].stem
+    future = runner.submit_stage_optimisations([indicator])[indicator]
+    assert isinstance(future.exception(timeout=60), EATimeoutError)
+    runner.shutdown()
+
+    journal = RunJournal(runner.journal.path.parent)
+    (resources,) = journal.resources("Trigger")
+    journal.close()
+    assert resources["indicator"] == indicator and resources["phase"] == "IS"
+    assert resources["samples"] and resources["cpu_cores_max"] >= 0
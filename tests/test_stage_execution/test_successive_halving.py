@@ -0,0 +1,14 @@
+from strategy_factory.stage_execution.successive_halving import plan_rounds
+
+
+def test_plan_rounds_halves_indicators_and_doubles_budget():
+    rounds = plan_rounds(n_indicators=6, min_iterations=10, max_iterations=100, eta=2)
+
+    assert [(r.n_indicators, r.max_iterations) for r in rounds] == [(6, 10), (3, 20), (2, 40), (1, 100)]
+    assert [r.final for r in rounds] == [False, False, False, True]
+
+
+def test_plan_rounds_single_round_when_budget_already_full():
+    rounds = plan_rounds(n_indicators=8, min_iterations=200, max_iterations=100, eta=3)
+
+    assert len(rounds) == 1 and rounds[0].final and rounds[0].max_iterations == 100
@@ -0,0 +1,58 @@
+import configparser
+import threading
+import time
+from subprocess import CalledProcessError
+
+import pytest
+
+from strategy_factory.stage_execution.ea_runner import run_ea
+from strategy_factory.stage_execution.terminal_pool import TerminalInstance, TerminalPool
+from strategy_factory.testing import FakeReportSettings, install_fake_mt5
+
+
+def _write_ini(path, report: str | None):
+    ini = configparser.ConfigParser()
+    ini.optionxform = str
+    if report is not None:  # Without a [Tester] section the fake terminal fails
+        ini["Tester"] = {"Report": report}
+        ini["TesterInputs"] = {"InpPeriod": "5||2||2||20||Y"}
+    with open(path, "w", encoding="utf-16") as f:
+        ini.write(f)
+    return path
+
+
+def test_pool_leases_terminals_runs_in_parallel_and_recovers_from_failures(tmp_path):
+    fake = install_fake_mt5(tmp_path / "mt5", FakeReportSettings(rows=5, latency=1.0), pool_size=2)
+    pool = TerminalPool([TerminalInstance.from_portable_root(f"T{i}", root) for i, root in enumerate(fake.pool)])
+    leased, lock = [], threading.Lock()
+
+    def optimise(report, terminal):
+        with lock:
+            assert terminal not in leased, f"{terminal.terminal_id} leased twice"
+            leased.append(terminal)
+        try:
+            run_ea(_write_ini(tmp_path / f"{report or 'broken'}.ini", report), terminal_exe=terminal.terminal_exe,
+                   portable=True)
+            return terminal
+        finally:
+            with lock:
+                leased.remove(terminal)
+
+    with pool:
+        pool.ensure_idle()
+        started = time.perf_counter()
+        batch = [pool.submit(optimise, report) for report in ("macd_IS", "rsi_IS", "adx_IS", "cci_IS")]
+        ran_on = [future.result(timeout=60).terminal_id for future in batch]
+        elapsed = time.perf_counter() - started
+
+        with pytest.raises(CalledProcessError):
+            pool.submit(optimise, None).result(timeout=60)
+
+        # The failed run returned its terminal: two runs still get one terminal each
+        after_failure = [pool.submit(optimise, report) for report in ("ema_IS", "sma_IS")]
+        ran_on_after = {future.result(timeout=60).terminal_id for future in after_failure}
+
+    assert elapsed < 3.5  # Four 1s runs on two terminals, back to back they take over 4s
+    assert set(ran_on) == ran_on_after == {"T0", "T1"} and not leased
+    assert sorted(p.name for root in fake.pool for p in root.glob("*_IS.xml")) == [
+        "adx_IS.xml", "cci_IS.xml", "ema_IS.xml", "macd_IS.xml", "rsi_IS.xml", "sma_IS.xml"]
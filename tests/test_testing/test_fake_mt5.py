@@ -0,0 +1,43 @@
+import configparser
+import subprocess
+
+from strategy_factory.gen_expert_advisor.compiler import compile_ea
+from strategy_factory.post_processing.xml_to_csv import read_xml_report
+from strategy_factory.testing import FakeReportSettings, install_fake_mt5
+from strategy_factory.testing.fake_mt5 import COMPILE_ERROR_MARKER, FORWARD_COLUMNS, RESULT_COLUMNS
+
+
+def _write_ini(path, report: str):
+    ini = configparser.ConfigParser()
+    ini.optionxform = str
+    ini["Tester"] = {"Report": report, "ForwardMode": "4", "ForwardDate": "2019.01.01"}
+    ini["TesterInputs"] = {"inp_lot_mode": "2||0||0||2||N", "InpPeriod": "5||2||2||20||Y", "InpShift": "1||0||1||2||Y"}
+    with open(path, "w", encoding="utf-16") as f:
+        ini.write(f)
+    return path
+
+
+def test_fake_terminal_writes_reports_and_fake_editor_compiles(tmp_path):
+    fake = install_fake_mt5(tmp_path / "mt5", FakeReportSettings(rows=20), pool_size=1)
+    ini = _write_ini(tmp_path / "macd_IS.ini", "macd_IS")
+
+    subprocess.run([str(fake.pool[0] / "terminal64.exe"), "/portable", f"/config:{ini}"], check=True)
+
+    report = read_xml_report(fake.pool[0] / "macd_IS.xml")
+    assert list(report.columns) == RESULT_COLUMNS + ["InpPeriod", "InpShift"]
+    assert len(report) == 20 and not report.duplicated(["InpPeriod", "InpShift"]).any()
+    assert set(report["InpPeriod"].astype(int)) <= set(range(2, 21, 2))
+    assert list(read_xml_report(fake.pool[0] / "macd_IS.forward.xml").columns)[:len(FORWARD_COLUMNS)] == FORWARD_COLUMNS
+
+    # Fewer grid points than rows: one pass per grid point
+    fake.configure(rows=1000)
+    subprocess.run([str(fake.terminal_exe), f"/config:{ini}"], check=True)
+    assert len(read_xml_report(fake.mt5_root / "macd_IS.xml")) == 10 * 3
+
+    experts = fake.mt5_root / "MQL5" / "Experts" / "stage"
+    experts.mkdir()
+    (experts / "good.mq5").write_text("// good")
+    (experts / "bad.mq5").write_text(f"// {COMPILE_ERROR_MARKER}")
+    assert compile_ea(experts / "good.mq5", use_cache=False, editor_path=fake.meta_editor_exe).success
+    failed = compile_ea(experts / "bad.mq5", use_cache=False, editor_path=fake.meta_editor_exe)
+    assert not failed.success and "fake compile error" in failed.log
@@ -0,0 +1,61 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from strategy_factory.utils import indicator_catalog
+from strategy_factory.utils.indicator_catalog import IndicatorCatalog
+
+
+def _write(path, name, period):
+    path.write_text(yaml.safe_dump({name: {"indicator_inputs": {"InpPeriod": {"default": period}}}}))
+
+
+def test_catalog_parses_once_and_revalidates_on_change(tmp_path, monkeypatch):
+    parses = []
+    safe_load = yaml.safe_load
+    monkeypatch.setattr(indicator_catalog.yaml, "safe_load", lambda raw: parses.append(raw) or safe_load(raw))
+
+    indi_dir = tmp_path / "indicators"
+    indi_dir.mkdir()
+    _write(indi_dir / "rsi.yaml", "RSI", 14)
+    _write(indi_dir / "adx.yaml", "adx", 10)
+
+    catalog = IndicatorCatalog(tmp_path / "index.json")
+    assert catalog.find(indi_dir, "rsi") == indi_dir / "rsi.yaml"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        docs = list(pool.map(catalog.document, [indi_dir / "rsi.yaml"] * 32))
+    assert len(parses) == 2
+
+    # Served documents are copies
+    docs[0]["RSI"]["indicator_inputs"]["InpPeriod"]["default"] = 99
+    assert catalog.document(indi_dir / "rsi.yaml")["RSI"]["indicator_inputs"]["InpPeriod"]["default"] == 14
+
+    # A new process reuses the on-disk index, a touched but unchanged file is only re-hashed
+    os.utime(indi_dir / "adx.yaml", ns=(1, 1))
+    reopened = IndicatorCatalog(tmp_path / "index.json")
+    assert reopened.document(indi_dir / "adx.yaml")["adx"]["indicator_inputs"]["InpPeriod"]["default"] == 10
+    assert len(parses) == 2
+
+    _write(indi_dir / "adx.yaml", "adx", 20)
+    assert reopened.document(indi_dir / "adx.yaml")["adx"]["indicator_inputs"]["InpPeriod"]["default"] == 20
+    assert len(parses) == 3
+
+
+def test_index_is_written_once_per_scan_and_keeps_documents_json_cannot_reproduce(tmp_path, monkeypatch):
+    indi_dir = tmp_path / "indicators"
+    indi_dir.mkdir()
+    for i in range(5):
+        _write(indi_dir / f"indi{i}.yaml", f"indi{i}", i)
+    (indi_dir / "levels.yaml").write_text("levels:\n  buffers: {0: main, 1: signal}\n  since: 2020-01-01\n")
+
+    writes = []
+    save_index = IndicatorCatalog._save_index
+    monkeypatch.setattr(IndicatorCatalog, "_save_index", lambda self: writes.append(self._changed) or save_index(self))
+    catalog = IndicatorCatalog(tmp_path / "index.json")
+    assert len(catalog.names(indi_dir)) == 6
+    assert writes == [True]
+
+    fresh = catalog.document(indi_dir / "levels.yaml")
+    assert fresh["levels"]["buffers"] == {0: "main", 1: "signal"}
+    assert IndicatorCatalog(tmp_path / "index.json").document(indi_dir / "levels.yaml") == fresh
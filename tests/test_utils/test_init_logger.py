@@ -0,0 +1,35 @@
+import json
+import logging
+import threading
+
+from strategy_factory.utils import initialise_logging, job_context, shutdown_logging
+
+
+def test_queue_logging_writes_json_lines_with_job_context(tmp_path):
+    log_file = tmp_path / "run.log"
+    initialise_logging("json", log_file=log_file, use_queue=True, max_bytes=10_000, backup_count=1)
+    logger = logging.getLogger("test_init_logger")
+
+    def job(indicator: str):
+        with job_context(stage="Trigger", indicator=indicator, phase="IS"):
+            logger.info(f'Report "{indicator}"\nconverted')
+
+    with job_context(terminal="t0"):
+        threads = [threading.Thread(target=job, args=(name,)) for name in ("macd", "rsi")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        try:
+            raise ValueError("bad report")
+        except ValueError:
+            logger.exception("Conversion failed")
+
+    shutdown_logging()
+    logging.getLogger().handlers.clear()
+
+    entries = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    jobs = {entry["indicator"]: entry for entry in entries if "indicator" in entry}
+    assert jobs["rsi"]["msg"] == 'Report "rsi"\nconverted'
+    assert jobs["rsi"]["stage"] == "Trigger" and jobs["rsi"]["phase"] == "IS" and "terminal" not in jobs["rsi"]
+    assert entries[-1]["terminal"] == "t0" and "ValueError: bad report" in entries[-1]["exc"]
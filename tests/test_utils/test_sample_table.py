@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from strategy_factory.post_processing.sample_index import add_sample_columns
+from strategy_factory.utils.project_config import OptSettings
+from strategy_factory.utils.sample_table import build_sample_table, stage_sample_table
+
+
+INPUTS = {
+    "InpFastEMA": {"default": 12, "type": "int", "min": 1, "max": 200, "step": 1},
+    "InpSlowEMA": {"default": 26, "type": "int", "min": 1, "max": 300, "step": 1},
+}
+
+
+def test_sample_table_respects_constraints_and_steps():
+    for method in ("lhs", "halton"):
+        table = build_sample_table(INPUTS, 50, method, constraints=["InpFastEMA < InpSlowEMA"])
+
+        assert len(table) == 50
+        assert not table.duplicated().any()
+        assert (table["InpFastEMA"] < table["InpSlowEMA"]).all()
+        assert table["InpFastEMA"].between(1, 200).all()
+        assert pd.api.types.is_integer_dtype(table["InpFastEMA"])
+
+
+def test_report_index_maps_back_to_parameter_values():
+    table = build_sample_table(INPUTS, 10, "halton")
+    report = pd.DataFrame({"Pass": [0, 1], "Result": [2.0, 1.0], "inp_sample_idx": [7, 3]})
+
+    mapped = add_sample_columns(report, table)
+
+    assert list(mapped.columns) == ["Pass", "Result", "inp_sample_idx", "InpFastEMA", "InpSlowEMA"]
+    assert mapped["InpSlowEMA"].tolist() == [table.loc[7, "InpSlowEMA"], table.loc[3, "InpSlowEMA"]]
+
+
+def test_log_spaced_inputs_are_optimised_over_a_grid_table():
+    indi_data = {"indicator_inputs": {**INPUTS, "InpSlowEMA": {**INPUTS["InpSlowEMA"], "scale": "log"}},
+                 "constraints": ["InpFastEMA < InpSlowEMA"]}
+    settings = OptSettings(opt_criterion=6, custom_criterion=1, min_trade=100, max_iterations=100)
+    project_config = SimpleNamespace(opt_settings={"Trigger": settings})
+
+    table = stage_sample_table(project_config, "Trigger", indi_data)
+    slow = sorted(table["InpSlowEMA"].unique())
+    assert 0 < len(table) <= 100 and not table.duplicated().any()
+    assert (table["InpFastEMA"] < table["InpSlowEMA"]).all()
+    assert slow[-1] == 300 and slow[1] - slow[0] < slow[-1] - slow[-2]
+
+    # Without a log input the stage keeps the MT5 grid
+    assert stage_sample_table(project_config, "Trigger", {"indicator_inputs": INPUTS}) is None
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from strategy_factory.utils import annotate, job_context, span, start_trace, stop_trace, traced
+from strategy_factory.utils.trace_report import export_chrome_trace, indicator_summary, load_trace, phase_summary
+
+
+def test_spans_are_traced_summarised_and_exported(tmp_path):
+    trace_file = tmp_path / "trace.jsonl"
+    start_trace(trace_file)
+
+    @traced("compile")
+    def compile_ea():
+        annotate(cached=True)
+
+    try:
+        with job_context(stage="Trigger", indicator="macd", phase="IS"):
+            with span("run_ea", ini="macd.ini"):
+                compile_ea()
+        with span("aggregate"):
+            pass
+    finally:
+        stop_trace()
+    with open(trace_file, "a", encoding="utf-8") as f:
+        f.write('{"name": "cut off')
+
+    spans = load_trace(trace_file)
+    by_name = spans.set_index("name")
+    assert list(spans["name"]) == ["compile", "run_ea", "aggregate"]
+    assert by_name.loc["compile", "parent"] == by_name.loc["run_ea", "id"]
+    assert by_name.loc["compile", "cached"] and by_name.loc["run_ea", "ini"] == "macd.ini"
+    assert by_name.loc["compile", "indicator"] == "macd" and by_name.loc["compile", "phase"] == "IS"
+
+    phases = phase_summary(spans)
+    assert set(phases.index) == {"compile", "run_ea", "aggregate"}
+    assert {"count", "total", "p50", "p90", "p99", "max"} <= set(phases.columns)
+    assert list(indicator_summary(spans).index) == [("macd", "run_ea"), ("macd", "compile")]
+
+    # Strict parse: spans without a stage (e.g. "aggregate") must not leak NaN into the export
+    events = json.loads(export_chrome_trace(spans, tmp_path / "chrome.json").read_text(),
+                        parse_constant=lambda name: pytest.fail(f"{name} in Chrome trace"))["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert len(complete) == 3 and complete[0]["args"]["indicator"] == "macd" and complete[0]["cat"] == "Trigger"
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+    aggregate = next(event for event in complete if event["name"] == "aggregate")
+    assert aggregate["cat"] == "run" and "indicator" not in aggregate["args"]